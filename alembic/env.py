@@ -14,6 +14,7 @@ from src.models.news import News
 from src.models.source import Source
 from src.models.category import Category
 from src.models.cluster import NewsCluster, NewsClusterItem
+from src.models.gpt_usage import GptUsage
 # Импортируем все модели для автогенерации
 
 
@@ -0,0 +1,27 @@
+"""baseline schema from mysql-dump.sql
+
+Revision ID: 1a681d80a4b9
+Revises:
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a681d80a4b9'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Схема на этот момент создаётся из mysql-dump.sql (он же ставит alembic_version
+    # в эту ревизию) — миграция только даёт цепочке начало
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
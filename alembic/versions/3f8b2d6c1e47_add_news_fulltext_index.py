@@ -0,0 +1,36 @@
+"""add news fulltext index for search
+
+Revision ID: 3f8b2d6c1e47
+Revises: 7c2e4f1a9b3d
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b2d6c1e47'
+down_revision: Union[str, Sequence[str], None] = '7c2e4f1a9b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_COLUMNS = ['title_ru', 'title_kz', 'title_en', 'summary_ru', 'summary_kz', 'summary_en']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /news/search: MATCH ... AGAINST по всем языковым версиям заголовка и summary.
+    # ngram-парсер режет текст на n-граммы (ngram_token_size, по умолчанию 2) —
+    # поиск по части слова работает для русского/казахского без стемминга
+    op.create_index(
+        'ix_news_fulltext', 'news', SEARCH_COLUMNS,
+        mysql_prefix='FULLTEXT', mysql_with_parser='ngram',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_news_fulltext', table_name='news')
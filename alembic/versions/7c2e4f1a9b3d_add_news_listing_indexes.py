@@ -0,0 +1,66 @@
+"""add news listing and pending summary indexes
+
+Revision ID: 7c2e4f1a9b3d
+Revises: 1a681d80a4b9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4f1a9b3d'
+down_revision: Union[str, Sequence[str], None] = '1a681d80a4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # has_summary NOT NULL: фильтр "has_summary = 0" вместо "IS FALSE OR IS NULL"
+    # превращается в ref-доступ по индексу, а не в полный просмотр
+    op.execute("UPDATE news SET has_summary = 0 WHERE has_summary IS NULL")
+    op.alter_column(
+        'news', 'has_summary',
+        existing_type=mysql.TINYINT(display_width=1),
+        nullable=False,
+        server_default=sa.text('0'),
+    )
+
+    # Лента (get_paginated) и очередь суммаризации (get_pending_summaries / fetch_recent_news):
+    # равенство по has_summary + диапазон/сортировка по published_at
+    op.create_index('ix_news_has_summary_published_at', 'news', ['has_summary', 'published_at'])
+
+    # Лента с фильтром по источнику; заменяет одиночный ключ source_id (нужен FK —
+    # новый индекс начинается с source_id и подходит ему)
+    op.create_index(
+        'ix_news_source_summary_published_at', 'news',
+        ['source_id', 'has_summary', 'published_at'],
+    )
+    op.drop_index('source_id', table_name='news')
+
+    # Фильтр по категориям (News.categories.any(...)): поиск по category_id с news_id в ключе
+    op.create_index('ix_news_categories_category_news', 'news_categories', ['category_id', 'news_id'])
+    op.drop_index('category_id', table_name='news_categories')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # сначала возвращаем одиночные ключи — без них FK не даст удалить составные индексы
+    op.create_index('category_id', 'news_categories', ['category_id'])
+    op.drop_index('ix_news_categories_category_news', table_name='news_categories')
+
+    op.create_index('source_id', 'news', ['source_id'])
+    op.drop_index('ix_news_source_summary_published_at', table_name='news')
+    op.drop_index('ix_news_has_summary_published_at', table_name='news')
+
+    op.alter_column(
+        'news', 'has_summary',
+        existing_type=mysql.TINYINT(display_width=1),
+        nullable=True,
+        server_default=None,
+    )
@@ -0,0 +1,29 @@
+"""add news updated_at index for incremental export
+
+Revision ID: 9d4a7e2b5c18
+Revises: 3f8b2d6c1e47
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a7e2b5c18'
+down_revision: Union[str, Sequence[str], None] = '3f8b2d6c1e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /news/export?updated_since=...: has_summary = 1 AND updated_at >= ?
+    # ORDER BY updated_at, id — range по индексу без filesort
+    op.create_index('ix_news_has_summary_updated_at', 'news', ['has_summary', 'updated_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_news_has_summary_updated_at', table_name='news')
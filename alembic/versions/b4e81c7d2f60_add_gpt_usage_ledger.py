@@ -0,0 +1,51 @@
+"""add gpt_usage ledger
+
+Revision ID: b4e81c7d2f60
+Revises: 9d4a7e2b5c18
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e81c7d2f60'
+down_revision: Union[str, Sequence[str], None] = '9d4a7e2b5c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Журнал токенов и стоимости вызовов OpenAI (GET /usage, дневной бюджет суммаризации)
+    op.create_table(
+        'gpt_usage',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('operation', sa.String(length=32), nullable=False),
+        sa.Column('model', sa.String(length=64), nullable=False),
+        sa.Column('news_id', sa.Integer(), nullable=True),
+        sa.Column('source_id', sa.Integer(), nullable=True),
+        sa.Column('cluster_label', sa.String(length=255), nullable=True),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cached_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cost_usd', sa.Numeric(precision=12, scale=6), nullable=False, server_default='0'),
+        sa.Column('error', sa.String(length=64), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_gpt_usage_created_at', 'gpt_usage', ['created_at'])
+    op.create_index('ix_gpt_usage_source_created_at', 'gpt_usage', ['source_id', 'created_at'])
+    op.create_index('ix_gpt_usage_news_id', 'gpt_usage', ['news_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_gpt_usage_news_id', table_name='gpt_usage')
+    op.drop_index('ix_gpt_usage_source_created_at', table_name='gpt_usage')
+    op.drop_index('ix_gpt_usage_created_at', table_name='gpt_usage')
+    op.drop_table('gpt_usage')
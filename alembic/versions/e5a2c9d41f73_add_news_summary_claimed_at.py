@@ -0,0 +1,29 @@
+"""add news summary_claimed_at for summary claims
+
+Revision ID: e5a2c9d41f73
+Revises: b4e81c7d2f60
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c9d41f73'
+down_revision: Union[str, Sequence[str], None] = 'b4e81c7d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # отметка «статью взял воркер суммаризации» вместо FOR UPDATE на время вызова GPT
+    op.add_column('news', sa.Column('summary_claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('news', 'summary_claimed_at')
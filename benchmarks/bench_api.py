@@ -0,0 +1,118 @@
+"""
+Нагрузочный бенчмарк API: requests/sec и латентность (p50/p95/p99) под N параллельными клиентами.
+
+Сравнение sync- и async-версии роутов — две копии API на разных портах:
+    git worktree add /tmp/ainews-sync <коммит до перехода на async>
+    (cd /tmp/ainews-sync && uvicorn main:app --port 8001 --workers 1)
+    uvicorn main:app --port 8000 --workers 1
+
+    python -m benchmarks.bench_api \
+        --target sync=http://127.0.0.1:8001/news/?per_page=20 \
+        --target async=http://127.0.0.1:8000/news/?per_page=20 \
+        --concurrency 200 --duration 30
+
+Кэш ответов /news и /clusters стоит обходить флагом --bust-cache (случайный
+query-параметр в каждом запросе) — иначе меряется Redis, а не работа с БД.
+
+Замеров sync против async на dev-стенде пока нет, так что выигрыш async-сессий по rps/p99
+не подтверждён: после прогона запишите цифры (железо, concurrency, rps, p99 обеих целей)
+в commands.txt рядом с командой.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+async def run_target(url: str, concurrency: int, duration: float, warmup: float, bust_cache: bool) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        measure_from = started + warmup
+        deadline = measure_from + duration
+
+        async def worker():
+            nonlocal errors
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                params = {"_": random.random()} if bust_cache else None
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get(url, params=params)
+                    ok = resp.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                t1 = time.perf_counter()
+                if t0 < measure_from:
+                    continue
+                if ok:
+                    latencies.append(t1 - t0)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def parse_targets(values: List[str]) -> List[Tuple[str, str]]:
+    targets = []
+    for value in values:
+        name, sep, url = value.partition("=")
+        targets.append((name, url) if sep else (value, value))
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="name=url (можно несколько)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0, help="секунд измерения на цель")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--bust-cache", action="store_true", help="добавлять случайный параметр к каждому запросу")
+    args = parser.parse_args()
+
+    results = []
+    for name, url in parse_targets(args.target):
+        print(f"→ {name}: {url} (c={args.concurrency}, {args.duration:.0f}s)")
+        results.append((name, asyncio.run(run_target(url, args.concurrency, args.duration, args.warmup, args.bust_cache))))
+
+    print(f"\n{'target':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in results:
+        print(f"{name:<12}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['errors']:>8}")
+
+    if len(results) > 1:
+        base_name, base = results[0]
+        for name, r in results[1:]:
+            if base["rps"] and r["p99_ms"]:
+                print(f"\n{name} vs {base_name}: x{r['rps'] / base['rps']:.2f} req/s, "
+                      f"p99 {base['p99_ms']:.0f} → {r['p99_ms']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
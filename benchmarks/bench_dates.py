@@ -0,0 +1,215 @@
+"""
+Разбор дат с лент: самопроверка свойств и скорость src/parsers/date_utils против прежней
+реализации в парсерах (несколько некомпилированных re.search и datetime.now() на каждую строку).
+
+    python -m benchmarks.bench_dates
+    python -m benchmarks.bench_dates --cases 5000 --pages 200
+
+Свойства (случайные моменты, фиксированный seed): момент -> строка в одном из форматов
+лент (ru/kk, с годом и без, «сегодня/вчера», сокращённый месяц, регистр, ё, неразрывные
+пробелы) -> parse_ru_datetime -> тот же момент в UTC. Плюс строки, которые должны давать None.
+Код возврата 1 — если хоть одно свойство нарушено.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from src.parsers.date_utils import ASTANA, DayAnchors, RuDateParser, _parse, parse_ru_datetime
+
+# Названия месяцев заданы здесь заново, а не взяты из date_utils — иначе проверка тавтологична
+GENITIVE = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля", "августа",
+            "сентября", "октября", "ноября", "декабря"]
+NOMINATIVE = ["январь", "февраль", "март", "апрель", "май", "июнь", "июль", "август",
+              "сентябрь", "октябрь", "ноябрь", "декабрь"]
+KAZAKH = ["қаңтар", "ақпан", "наурыз", "сәуір", "мамыр", "маусым", "шілде", "тамыз",
+          "қыркүйек", "қазан", "қараша", "желтоқсан"]
+
+
+# ======== ПРЕЖНЯЯ РЕАЛИЗАЦИЯ (NurParser._parse_ru_dt до выноса в date_utils) ========
+_LEGACY_MONTHS = {name: i + 1 for i, name in enumerate(GENITIVE)}
+
+
+def legacy_parse_ru_dt(s: str) -> Optional[datetime]:
+    if not s:
+        return None
+    tz_astana = timezone(timedelta(hours=5))
+    now_local = datetime.now(tz=tz_astana)
+    s_norm = s.strip().replace("\xa0", " ").lower().replace("ё", "е")
+
+    m = re.search(r"[сc]егодня[^0-9]*?(\d{1,2}):(\d{2})", s_norm) \
+        or re.search(r"(\d{1,2}):(\d{2})\s*,\s*[сc]егодня", s_norm)
+    if m:
+        hh, mm = map(int, m.groups()[-2:])
+        d = now_local.date()
+        return datetime(d.year, d.month, d.day, hh, mm, tzinfo=tz_astana).astimezone(timezone.utc)
+
+    m = re.search(r"вчера[^0-9]*?(\d{1,2}):(\d{2})", s_norm) \
+        or re.search(r"(\d{1,2}):(\d{2})\s*,\s*вчера", s_norm)
+    if m:
+        hh, mm = map(int, m.groups()[-2:])
+        d = (now_local - timedelta(days=1)).date()
+        return datetime(d.year, d.month, d.day, hh, mm, tzinfo=tz_astana).astimezone(timezone.utc)
+
+    m = re.search(r"(\d{1,2})\s+([а-я]+)\s+(\d{4}),\s*(\d{1,2}):(\d{2})", s_norm)
+    if m:
+        dd, mon, yyyy, hh, mm = m.groups()
+        month = _LEGACY_MONTHS.get(mon)
+        if not month:
+            return None
+        return datetime(int(yyyy), month, int(dd), int(hh), int(mm), tzinfo=tz_astana).astimezone(timezone.utc)
+
+    m = re.search(r"(\d{1,2}):(\d{2}),\s*(\d{1,2})\s+([а-я]+)\s+(\d{4})", s_norm)
+    if m:
+        hh, mm, dd, mon, yyyy = m.groups()
+        month = _LEGACY_MONTHS.get(mon)
+        if not month:
+            return None
+        return datetime(int(yyyy), month, int(dd), int(hh), int(mm), tzinfo=tz_astana).astimezone(timezone.utc)
+    return None
+
+
+# ======== ГЕНЕРАЦИЯ СТРОК ========
+def render(local: datetime, today, rng: random.Random) -> Tuple[str, bool]:
+    """Строка в одном из форматов лент; второй элемент — понимает ли её прежняя реализация."""
+    hm = f"{local.hour}:{local.minute:02d}" if rng.random() < 0.3 else f"{local:%H:%M}"
+    d, m, y = local.day, local.month - 1, local.year
+
+    if local.date() == today and rng.random() < 0.6:
+        return rng.choice([(f"Сегодня, {hm}", True), (f"{hm}, сегодня", True), (f"бүгін, {hm}", False)])
+    if local.date() == today - timedelta(days=1) and rng.random() < 0.6:
+        return rng.choice([(f"Вчера, {hm}", True), (f"{hm}, вчера", True), (f"кеше {hm}", False)])
+
+    variants = [
+        (f"{hm}, {d} {GENITIVE[m]} {y}", True),
+        (f"{d} {GENITIVE[m]} {y}, {hm}", True),
+        (f"{hm}, {d} {NOMINATIVE[m].capitalize()} {y}", False),
+        (f"{d} {KAZAKH[m]} {y}, {hm}", False),
+        (f"{hm}, {d} {GENITIVE[m][:4]}. {y}", False),
+    ]
+    if (today - local.date()).days < 300:
+        variants.append((f"{hm}, {d} {GENITIVE[m]}", False))  # без года, как в заголовках дней informburo
+    text, legacy_ok = rng.choice(variants)
+    if rng.random() < 0.2:
+        text = text.replace(" ", "\xa0")
+    if rng.random() < 0.2:
+        text = text.upper()
+    return text, legacy_ok
+
+
+def random_moment(rng: random.Random, now: datetime) -> datetime:
+    if rng.random() < 0.5:  # как на реальной ленте: в основном последние сутки-двое
+        local = now - timedelta(minutes=rng.randint(0, 36 * 60))
+    else:
+        local = now - timedelta(days=rng.randint(0, 900), minutes=rng.randint(0, 24 * 60))
+    return local.replace(second=0, microsecond=0)
+
+
+# ======== СВОЙСТВА ========
+NEGATIVE = [
+    "", "   ", "сегодня", "15 августа 2025", "13:51", "25:61, 15 августа 2025", "10:00, 31 февраля 2025",
+    "10:00, 15 мартобря 2025", "5 минут назад", "12:00, 2025-08-15",
+]
+
+
+def check_properties(cases: int, rng: random.Random) -> int:
+    now = datetime.now(ASTANA)
+    anchors = DayAnchors.at(now)
+    failures = 0
+    for _ in range(cases):
+        local = random_moment(rng, now)
+        text, _ = render(local, anchors.today, rng)
+        got = parse_ru_datetime(text, anchors)
+        if got != local.astimezone(timezone.utc):
+            failures += 1
+            if failures <= 10:
+                print(f"[FAIL] {text!r}: {got} != {local.astimezone(timezone.utc)}")
+    for text in NEGATIVE:
+        got = parse_ru_datetime(text, anchors)
+        if got is not None:
+            failures += 1
+            print(f"[FAIL] {text!r}: ожидали None, получили {got}")
+    # якоря — на момент создания парсера, а не на момент вызова
+    frozen = RuDateParser(now=datetime(2026, 1, 2, 0, 30, tzinfo=ASTANA))
+    expected = {
+        "вчера, 23:50": datetime(2026, 1, 1, 18, 50, tzinfo=timezone.utc),
+        "23:59, 31 декабря": datetime(2025, 12, 31, 18, 59, tzinfo=timezone.utc),  # без года -> прошлый
+    }
+    for text, want in expected.items():
+        if frozen(text) != want:
+            failures += 1
+            print(f"[FAIL] {text!r} при today=2026-01-02: {frozen(text)} != {want}")
+    return failures
+
+
+# ======== СКОРОСТЬ ========
+def listing_pages(pages: int, per_page: int, rng: random.Random) -> Tuple[List[List[str]], int]:
+    """Страницы лент: строки, которые понимает и прежняя реализация (для честного сравнения)."""
+    now = datetime.now(ASTANA)
+    result, mismatches = [], 0
+    for _ in range(pages):
+        page = []
+        start = now - timedelta(minutes=rng.randint(0, 120))
+        for i in range(per_page):
+            local = (start - timedelta(minutes=17 * i)).replace(second=0, microsecond=0)
+            text, legacy_ok = render(local, now.date(), rng)
+            while not legacy_ok:
+                text, legacy_ok = render(local, now.date(), rng)
+            if legacy_parse_ru_dt(text) != parse_ru_datetime(text):
+                mismatches += 1
+            page.append(text)
+        result.append(page)
+    return result, mismatches
+
+
+def timed(fn: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=2000, help="случайных строк для проверки свойств")
+    parser.add_argument("--pages", type=int, default=100, help="страниц лент для замера")
+    parser.add_argument("--per-page", type=int, default=40, help="карточек на странице")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    failures = check_properties(args.cases, rng)
+    print(f"{'✅' if not failures else '[FAIL]'} свойства: {args.cases + len(NEGATIVE) + 2} проверок, нарушений {failures}")
+
+    pages, mismatches = listing_pages(args.pages, args.per_page, rng)
+    if mismatches:
+        failures += mismatches
+        print(f"[FAIL] расхождений с прежней реализацией: {mismatches}")
+    total = args.pages * args.per_page
+
+    def run_legacy():
+        for page in pages:
+            for text in page:
+                legacy_parse_ru_dt(text)
+
+    def run_new():
+        for page in pages:
+            dates = RuDateParser()  # как в парсере: один на прогон
+            for text in page:
+                dates(text)
+
+    legacy = timed(run_legacy)
+    _parse.cache_clear()
+    cold = timed(run_new)
+    warm = timed(run_new)
+
+    print(f"{'':<22}{'мкс/строка':>12}{'x':>8}")
+    for name, elapsed in (("прежняя", legacy), ("date_utils (холодный)", cold), ("date_utils (кэш)", warm)):
+        print(f"{name:<22}{elapsed * 1e6 / total:>12.2f}{legacy / elapsed:>8.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
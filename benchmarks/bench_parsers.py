@@ -0,0 +1,166 @@
+"""
+Пропускная способность парсеров на записанном корпусе (fixtures/parsers/), без сети и БД.
+
+Для каждого типа источника — отдельный процесс (чистый peak RSS), в нём:
+  - полный parse() в режиме PARSER_HTTP_MODE=replay: страниц/с и мс на страницу
+    (лента + статьи: HTTP-слой из корпуса, разбор HTML, даты, сборка News);
+  - только extract_article() по страницам статей: мс на страницу;
+  - peak RSS процесса (ru_maxrss).
+
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --iterations 20 --json out.json
+    python -m benchmarks.bench_parsers --baseline out.json --tolerance 0.25   # код 1 при регрессии
+
+Обновить корпус настоящими страницами (нужна сеть):
+    python -m benchmarks.bench_parsers --record
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from src.parsers.http_replay import FixtureStore, fixtures_dir
+
+
+class MemoryNewsService:
+    """Вместо NewsService: в корпусе все статьи новые, сохранение — только счётчик."""
+
+    def __init__(self):
+        self.saved = 0
+
+    def get_by_url(self, url: str):
+        return None
+
+    def save(self, news):
+        self.saved += 1
+        news.id = self.saved
+        return news
+
+
+def load_sources(root: str) -> Dict[str, str]:
+    with open(os.path.join(root, "sources.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_parser(source_type: str, url: str, service: MemoryNewsService):
+    from src.models.source import SourceType
+    from src.parsers.registry import get_parser
+
+    source = SimpleNamespace(id=1, name=source_type, type=source_type, url=url)
+    return get_parser(SourceType(source_type))(source, service, new_news_batch=10 ** 9)
+
+
+def bench_one(source_type: str, url: str, iterations: int, root: str) -> Dict:
+    """Выполняется в дочернем процессе."""
+    os.environ["PARSER_HTTP_MODE"] = "replay"
+    os.environ["PARSER_FIXTURES_DIR"] = root
+    os.environ["RAW_ARCHIVE_DIR"] = ""  # архив сырых ответов мерил бы диск, а не парсер
+
+    pages, saved, elapsed = 0, 0, 0.0
+    for _ in range(iterations):
+        service = MemoryNewsService()
+        parser = make_parser(source_type, url, service)
+        started = time.perf_counter()
+        parser.parse()
+        elapsed += time.perf_counter() - started
+        pages += parser._http_adapter.hits
+        saved += service.saved
+
+    # extract_article отдельно: только страницы статей
+    store = FixtureStore(root, source_type)
+    parser_cls = type(make_parser(source_type, url, MemoryNewsService()))
+    article_urls = [u for u in store.index if u != url]
+    extract_ms: Optional[float] = None
+    try:
+        bodies = [store.get(u)[1] for u in article_urls]
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for body in bodies:
+                parser_cls.extract_article(body)
+        if bodies:
+            extract_ms = (time.perf_counter() - started) * 1000 / (iterations * len(bodies))
+    except NotImplementedError:
+        pass  # RSS: статьи целиком в фиде
+
+    return {
+        "source": source_type,
+        "pages": pages,
+        "saved": saved,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "parse_ms_per_page": elapsed * 1000 / pages if pages else 0.0,
+        "extract_ms_per_page": extract_ms,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def record(root: str):
+    """Живой прогон каждого парсера с записью всех ответов в корпус."""
+    os.environ["PARSER_HTTP_MODE"] = "record"
+    os.environ["PARSER_FIXTURES_DIR"] = root
+    for source_type, url in load_sources(root).items():
+        service = MemoryNewsService()
+        try:
+            make_parser(source_type, url, service).parse()
+            print(f"✅ {source_type}: записано, статей {service.saved}")
+        except Exception as e:
+            print(f"[ERR] {source_type}: {e}")
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["source"]: r for r in json.load(f)}
+    failures = 0
+    for r in results:
+        base = baseline.get(r["source"])
+        if not base or not base["pages_per_sec"]:
+            continue
+        ratio = r["pages_per_sec"] / base["pages_per_sec"]
+        if ratio < 1 - tolerance:
+            failures += 1
+            print(f"[FAIL] {r['source']}: {r['pages_per_sec']:.1f} стр/с против {base['pages_per_sec']:.1f} (x{ratio:.2f})")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--source", action="append", help="тип источника (можно несколько); по умолчанию все")
+    parser.add_argument("--fixtures", default=fixtures_dir())
+    parser.add_argument("--json", help="сохранить результаты (baseline для --baseline)")
+    parser.add_argument("--baseline", help="сравнить с сохранённым прогоном")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое падение стр/с")
+    parser.add_argument("--record", action="store_true", help="перезаписать корпус с живых сайтов")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.fixtures)
+        return 0
+
+    sources = {k: v for k, v in load_sources(args.fixtures).items() if not args.source or k in args.source}
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for source_type, url in sources.items():
+            results.append(pool.apply(bench_one, (source_type, url, args.iterations, args.fixtures)))
+
+    print(f"{'source':<12}{'pages':>8}{'pages/s':>10}{'parse ms':>10}{'extract ms':>12}{'peak RSS MB':>13}")
+    for r in results:
+        extract = f"{r['extract_ms_per_page']:.2f}" if r["extract_ms_per_page"] is not None else "-"
+        print(f"{r['source']:<12}{r['pages']:>8}{r['pages_per_sec']:>10.1f}{r['parse_ms_per_page']:>10.2f}"
+              f"{extract:>12}{r['peak_rss_mb']:>13.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        return 1 if compare(results, args.baseline, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Сквозной прогон суммаризации и кластеризации против локальной заглушки OpenAI
+(benchmarks/openai_stub.py): пропускная способность стадий, латентность GPT-вызовов
+на стороне клиента, 429/ретраи SDK и оценка стоимости того же прогона по ценам OpenAI.
+
+Нужны MySQL, Postgres и Redis из .env (dev-окружение docker-compose). Бенчмарк:
+  1) вставляет --articles синтетических статей по --topics темам (url https://bench.invalid/...);
+  2) суммаризирует их ядром run_summary_generation / summarize_news (_generate_summaries)
+     в --workers потоках — воркеры делят статьи отметкой summary_claimed_at, как в Celery;
+  3) process_recent_news -> run_clustering (задачи цепочки, вызванные синхронно) со своим run_id;
+  4) удаляет всё созданное (--keep — оставить).
+
+    python -m benchmarks.bench_pipeline --articles 200 --workers 4
+    python -m benchmarks.bench_pipeline --chat-latency 1500 --rate-429 0.1 --json out.json
+    python -m benchmarks.bench_pipeline --stub-url http://127.0.0.1:8900/v1   # заглушка уже запущена
+
+Кластеризация берёт все эмбеддинги за --hours, так что в dev-базе с живыми статьями
+в кластеры попадут и они; удаляются только кластеры этого run_id.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from typing import Dict, List
+
+import httpx
+
+from benchmarks import openai_stub
+from benchmarks.bench_api import percentile
+
+# $ за 1M токенов (platform.openai.com/pricing) — для оценки, сколько стоил бы прогон
+PRICES = {
+    "gpt-4o-mini": {"prompt_tokens": 0.15, "completion_tokens": 0.60},
+    "text-embedding-3-small": {"prompt_tokens": 0.02, "completion_tokens": 0.0},
+}
+
+PLACES = ["Астана", "Алматы", "Шымкент", "Караганда", "Актобе", "Павлодар", "Атырау", "Костанай"]
+SUBJECTS = [
+    "тарифы на электроэнергию", "строительство школ", "ремонт дорог", "цены на бензин", "паводки",
+    "отопительный сезон", "курс тенге", "урожай зерна", "реформа пенсий", "газификация сёл",
+    "общественный транспорт", "инвестиции в металлургию", "экспорт пшеницы", "чемпионат по боксу",
+    "выборы в маслихат", "цифровизация госуслуг", "нехватка врачей", "экология Балхаша",
+]
+FILLER = (
+    "заявил сообщил отметил подчеркнул по данным в рамках также около более процентов году "
+    "месяц неделе представители ведомства жители региона планируется работы продолжаются"
+).split()
+
+
+def make_topics(n: int, rng: random.Random) -> List[Dict[str, str]]:
+    return [{"place": rng.choice(PLACES), "subject": SUBJECTS[i % len(SUBJECTS)], "tag": f"№{i + 1}"} for i in range(n)]
+
+
+def make_article(topic: Dict[str, str], rng: random.Random) -> Dict[str, str]:
+    keywords = [topic["place"], topic["subject"], topic["tag"]]
+
+    def sentence() -> str:
+        words = rng.sample(FILLER, 6) + rng.sample(keywords, 2)
+        rng.shuffle(words)
+        return " ".join(words).capitalize() + "."
+
+    title = f"{topic['place']}: {topic['subject']} ({topic['tag']}) — {' '.join(rng.sample(FILLER, 3))}"
+    content = "\n".join(" ".join(sentence() for _ in range(4)) for _ in range(5))
+    return {"title": title[:255], "content": content}
+
+
+def timed(fn, samples: List[float]):
+    """Обёртка метода сервиса: латентность вызова глазами приложения (с ретраями SDK)."""
+    lock = threading.Lock()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with lock:
+                samples.append(time.perf_counter() - started)
+
+    return wrapper
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    s = sorted(samples)
+    return {
+        "calls": len(s),
+        "p50_ms": percentile(s, 50) * 1000,
+        "p95_ms": percentile(s, 95) * 1000,
+        "p99_ms": percentile(s, 99) * 1000,
+    }
+
+
+def estimate_cost(usage: Dict[str, Dict[str, int]]) -> float:
+    total = 0.0
+    for model, tokens in usage.items():
+        price = PRICES.get(model, {})
+        for kind, count in tokens.items():
+            total += count * price.get(kind, 0.0) / 1_000_000
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--topics", type=int, default=0, help="по умолчанию articles // 8")
+    parser.add_argument("--workers", type=int, default=4, help="параллельных воркеров суммаризации")
+    parser.add_argument("--source-id", type=int, help="источник для статей; по умолчанию первый")
+    parser.add_argument("--hours", type=int, default=1, help="окно эмбеддингов для кластеризации")
+    parser.add_argument("--min-cluster-size", type=int, default=5)
+    parser.add_argument("--min-samples", type=int, default=3)
+    parser.add_argument("--stub-url", help="внешняя заглушка (base_url с /v1); иначе поднимается в процессе")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="не удалять созданные статьи и кластеры")
+    parser.add_argument("--json", help="сохранить результаты")
+    openai_stub.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.stub_url:
+        base_url = args.stub_url.rstrip("/")
+        httpx.post(f"{base_url.rsplit('/v1', 1)[0]}/stub/settings", json=openai_stub.settings_from_args(args)).raise_for_status()
+    else:
+        openai_stub.configure(**openai_stub.settings_from_args(args))
+        base_url = openai_stub.start_in_thread()
+    stub_root = base_url.rsplit("/v1", 1)[0]
+    httpx.post(f"{stub_root}/stub/reset").raise_for_status()
+
+    # до импорта config / сервисов: Config читает окружение при импорте
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ.setdefault("APP_ROLE", "summary")
+    os.environ["DB_POOL_SIZE"] = str(args.workers + 2)
+    # нулевые цены в журнале gpt_usage: прогон по заглушке не съедает дневной бюджет (gpt:spend)
+    os.environ["GPT_PRICES"] = json.dumps({model: {} for model in PRICES})
+
+    from sqlalchemy import bindparam, delete, func, select, text
+
+    import tasks
+    from src.database.db import get_db, get_db_pg
+    from src.models.base import news_categories
+    from src.models.gpt_usage import GptUsage
+    from src.models.news import News
+    from src.services.clustering_service import ClusteringService
+    from src.services.gpt_service import GPTservice
+    from src.services.gpt_usage_service import ledger
+    from src.services.source_service import SourceService
+
+    samples: Dict[str, List[float]] = {"summarize": [], "embedding": [], "validate_cluster": []}
+    GPTservice.summarize_and_categorize = timed(GPTservice.summarize_and_categorize, samples["summarize"])
+    GPTservice.get_embedding = timed(GPTservice.get_embedding, samples["embedding"])
+    ClusteringService.validate_cluster_with_gpt = timed(ClusteringService.validate_cluster_with_gpt, samples["validate_cluster"])
+
+    rng = random.Random(args.seed)
+    run_id = f"bench_{datetime.now():%Y%m%d_%H%M%S}"
+    db, pg = next(get_db()), next(get_db_pg())
+    results: Dict = {"run_id": run_id, "articles": args.articles, "workers": args.workers}
+    news_ids: List[int] = []
+    try:
+        # ======== ДАННЫЕ ========
+        source_id = args.source_id or SourceService(db).get_all()[0].id
+        topics = make_topics(args.topics or max(1, args.articles // 8), rng)
+        now = datetime.utcnow()
+        rows = []
+        for i in range(args.articles):
+            article = make_article(topics[i % len(topics)], rng)
+            rows.append(News(
+                url=f"https://bench.invalid/{run_id}/{i}", source_id=source_id, published_at=now,
+                has_summary=False, **article,
+            ))
+        db.add_all(rows)
+        db.commit()
+        news_ids = [n.id for n in rows]
+        print(f"🔄 {run_id}: {len(news_ids)} статей, {len(topics)} тем, заглушка {base_url}")
+
+        # ======== СУММАРИЗАЦИЯ ========
+        started = time.perf_counter()
+        workers = [
+            threading.Thread(target=tasks._generate_summaries, kwargs={"max_items": len(news_ids), "news_ids": news_ids})
+            for _ in range(args.workers)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - started
+        summarized = db.scalar(select(func.count()).select_from(News).where(News.id.in_(news_ids), News.has_summary.is_(True)))
+        results["summaries"] = {
+            "summarized": summarized,
+            "seconds": elapsed,
+            "articles_per_sec": summarized / elapsed if elapsed else 0.0,
+            **latency_summary(samples["summarize"]),
+        }
+
+        # ======== ЭМБЕДДИНГИ -> КЛАСТЕРИЗАЦИЯ ========
+        started = time.perf_counter()
+        tasks.process_recent_news(run_id, hours=args.hours)
+        results["embeddings"] = {"seconds": time.perf_counter() - started, **latency_summary(samples["embedding"])}
+
+        started = time.perf_counter()
+        tasks.run_clustering(run_id, hours=args.hours, min_cluster_size=args.min_cluster_size, min_samples=args.min_samples)
+        clusters = pg.execute(
+            text("SELECT count(*) FROM news_clusters WHERE label LIKE :prefix"), {"prefix": f"gpt_validated_{run_id}_%"}
+        ).scalar()
+        results["clustering"] = {
+            "seconds": time.perf_counter() - started,
+            "clusters": clusters,
+            **latency_summary(samples["validate_cluster"]),
+        }
+    finally:
+        stub = httpx.get(f"{stub_root}/stub/stats").json()
+        results["stub"] = {k: stub[k] for k in ("requests", "rate_limited", "usage")}
+        results["estimated_cost_usd"] = estimate_cost(stub["usage"])
+
+        if not args.keep and news_ids:
+            prefix = {"prefix": f"gpt_validated_{run_id}_%"}
+            pg.execute(text(
+                "DELETE FROM news_cluster_items WHERE cluster_id IN "
+                "(SELECT cluster_id FROM news_clusters WHERE label LIKE :prefix)"
+            ), prefix)
+            pg.execute(text("DELETE FROM news_clusters WHERE label LIKE :prefix"), prefix)
+            pg.execute(
+                text("DELETE FROM news_embeddings WHERE news_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": news_ids},
+            )
+            pg.commit()
+            ledger.flush()  # буфер журнала — в БД, иначе допишется при выходе, уже после очистки
+            db.execute(delete(GptUsage).where(
+                GptUsage.news_id.in_(news_ids) | GptUsage.cluster_label.like(f"gpt_validated_{run_id}_%")
+            ))
+            db.execute(delete(news_categories).where(news_categories.c.news_id.in_(news_ids)))
+            db.execute(delete(News).where(News.id.in_(news_ids)))
+            db.commit()
+        db.close()
+        pg.close()
+
+    print(json.dumps(results, ensure_ascii=False, indent=1))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Бюджет холодного старта: сколько стоит импорт точки входа каждой роли (python -X importtime)
+и не тянет ли она чужие тяжёлые зависимости.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --repeat 7 --json import_budget.json
+    python -m benchmarks.import_budget --budget worker=900 --budget api=1200
+    python -m benchmarks.import_budget --target tasks=tasks:parser   # свой модуль[:APP_ROLE]
+
+Для каждой цели — отдельный процесс `python -X importtime -c "import <модуль>"` (первый запуск
+прогревает .pyc и не считается), берётся минимум по --repeat. Проверки:
+  - время импорта модуля (cumulative из importtime) не больше бюджета, мс;
+  - среди загруженных модулей нет запрещённых для роли (FORBIDDEN): Celery-воркер не грузит
+    стек LLM/кластеризации и парсеры, API — Celery, парсеры и numpy/hdbscan.
+Код возврата 1 — если хоть одна проверка не прошла.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# цель -> (модуль, APP_ROLE)
+TARGETS: Dict[str, Tuple[str, str]] = {
+    "worker": ("celery_app", "parser"),
+    "api": ("main", "api"),
+}
+# Бюджеты, мс — с запасом от замеров на dev-машине; ужесточать по мере выноса импортов
+BUDGETS_MS: Dict[str, float] = {"worker": 1500.0, "api": 2000.0}
+
+_LLM_AND_CLUSTERING = {"openai", "jsonschema", "numpy", "hdbscan", "sklearn", "numba", "llvmlite"}
+_PARSERS = {"bs4", "feedparser", "lxml", "src.parsers.rss_parser", "src.parsers.nur_parser"}
+FORBIDDEN: Dict[str, set] = {
+    "worker": _LLM_AND_CLUSTERING | _PARSERS | {"fastapi", "starlette"},
+    "api": _LLM_AND_CLUSTERING | _PARSERS | {"celery"},
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """Строки importtime -> [(self_us, cumulative_us, уровень вложенности, модуль)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), level, name.strip()))
+    return rows
+
+
+def measure(module: str, role: str) -> Dict:
+    env = {**os.environ, "APP_ROLE": role}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")][-5:]
+        raise RuntimeError(f"import {module} failed:\n" + "\n".join(tail))
+
+    total_us = next((cum for _, cum, level, name in rows if level == 0 and name == module), 0)
+    by_package: Counter = Counter()
+    for self_us, _, _, name in rows:
+        by_package[name.split(".")[0]] += self_us
+    return {
+        "ms": total_us / 1000,
+        "modules": sorted({name for *_, name in rows}),
+        "packages_ms": {pkg: us / 1000 for pkg, us in by_package.most_common(10)},
+    }
+
+
+def loaded_forbidden(modules: List[str], forbidden: set) -> List[str]:
+    """Запрещённые модули или пакеты (в т.ч. их подмодули), попавшие в импорт."""
+    hits = set()
+    for name in modules:
+        for banned in forbidden:
+            if name == banned or name.startswith(banned + "."):
+                hits.add(banned)
+    return sorted(hits)
+
+
+def run_target(name: str, module: str, role: str, repeat: int, budget: Optional[float]) -> Dict:
+    measure(module, role)  # прогрев .pyc
+    runs = [measure(module, role) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["ms"])
+    forbidden = loaded_forbidden(best["modules"], FORBIDDEN.get(name, set()))
+    return {
+        "module": module,
+        "role": role,
+        "ms": best["ms"],
+        "ms_all": [round(r["ms"], 1) for r in runs],
+        "budget_ms": budget,
+        "modules": len(best["modules"]),
+        "forbidden": forbidden,
+        "packages_ms": best["packages_ms"],
+        "ok": not forbidden and (budget is None or best["ms"] <= budget),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="замеров на цель (берётся минимум)")
+    parser.add_argument("--target", action="append", default=[], help="name=module[:APP_ROLE] вместо стандартных целей")
+    parser.add_argument("--budget", action="append", default=[], help="name=ms — переопределить бюджет")
+    parser.add_argument("--json", help="сохранить результаты")
+    args = parser.parse_args()
+
+    targets = dict(TARGETS)
+    if args.target:
+        targets = {}
+        for spec in args.target:
+            name, _, rest = spec.partition("=")
+            module, _, role = rest.partition(":")
+            targets[name] = (module, role or "api")
+    budgets = dict(BUDGETS_MS)
+    for spec in args.budget:
+        name, _, ms = spec.partition("=")
+        budgets[name] = float(ms)
+
+    results, failed = {}, False
+    for name, (module, role) in targets.items():
+        try:
+            result = run_target(name, module, role, args.repeat, budgets.get(name))
+        except RuntimeError as e:
+            print(f"[FAIL] {name}: {e}")
+            failed = True
+            continue
+        results[name] = result
+        failed |= not result["ok"]
+
+        budget = f"/ {result['budget_ms']:.0f}" if result["budget_ms"] is not None else ""
+        print(f"{'✅' if result['ok'] else '[FAIL]'} {name} (import {module}, APP_ROLE={role}): "
+              f"{result['ms']:.0f} мс {budget}, модулей {result['modules']}")
+        if result["forbidden"]:
+            print(f"   запрещённые для роли: {', '.join(result['forbidden'])}")
+        heaviest = ", ".join(f"{pkg} {ms:.0f}" for pkg, ms in list(result["packages_ms"].items())[:6])
+        print(f"   тяжелее всего (self, мс): {heaviest}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
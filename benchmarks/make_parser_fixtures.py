@@ -0,0 +1,196 @@
+"""
+Синтетический корпус страниц для replay-режима парсеров (fixtures/parsers/).
+
+Разметка повторяет то, что ищут селекторы каждого парсера (лента + статьи),
+тексты — детерминированный псевдотекст, так что корпус воспроизводим:
+    python -m benchmarks.make_parser_fixtures
+
+Настоящие страницы вместо синтетики — записью с живых сайтов:
+    python -m benchmarks.bench_parsers --record
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from typing import List, Tuple
+
+from src.parsers.http_replay import FixtureStore, fixtures_dir
+
+# URL лент — как в таблице sources (mysql-dump.sql)
+SOURCE_URLS = {
+    "tengrinews": "https://tengrinews.kz/news.rss",
+    "kazinform": "https://www.inform.kz/lenta/",
+    "zakon": "https://www.zakon.kz/news/",
+    "nur": "https://www.nur.kz/latest/",
+    "informburo": "https://informburo.kz/novosti",
+}
+
+WORDS = (
+    "Казахстан Астана Алматы правительство министерство заявил сообщил проект программа развитие "
+    "экономика бюджет регион граждане решение вопрос закон депутаты мажилис сенат президент "
+    "встреча визит соглашение инвестиции компания рынок цены тенге банк инфляция рост снижение "
+    "школа больница дорога строительство область город жители данные статистика процентов году "
+    "месяц неделе сегодня вчера отметил подчеркнул рамках работы также около более тысяч миллиардов"
+).split()
+
+MONTHS = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля", "августа",
+          "сентября", "октября", "ноября", "декабря"]
+
+ASTANA = timezone(timedelta(hours=5))
+# фиксированная «текущая» дата корпуса — страницы не меняются от запуска к запуску
+CORPUS_NOW = datetime(2026, 10, 19, 18, 0, tzinfo=ASTANA)
+
+
+def sentence(rng: random.Random, n_min: int = 8, n_max: int = 18) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(n_min, n_max))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng) for _ in range(rng.randint(3, 6)))
+
+
+def page(title: str, body: str) -> bytes:
+    # типичная обвязка новостного сайта: меню, скрипты, подвал — парсеру есть что пропускать
+    nav = "".join(f'<li><a href="/rubric/{i}">Рубрика {i}</a></li>' for i in range(1, 25))
+    scripts = "".join(f"<script>window.__cfg{i} = {{id: {i}, flags: [1, 2, 3]}};</script>" for i in range(12))
+    footer = "".join(f'<a href="/about/{i}">Раздел {i}</a> ' for i in range(30))
+    return (
+        "<!DOCTYPE html><html lang=\"ru\"><head><meta charset=\"utf-8\">"
+        f"<title>{escape(title)}</title>{scripts}</head><body>"
+        f'<header><nav><ul class="menu">{nav}</ul></nav></header>'
+        f"<main>{body}</main><footer>{footer}</footer></body></html>"
+    ).encode("utf-8")
+
+
+def articles(rng: random.Random, base: str, path: str, count: int) -> List[Tuple[str, str, datetime]]:
+    result = []
+    for i in range(count):
+        published = CORPUS_NOW - timedelta(minutes=37 * i + rng.randint(0, 20))
+        result.append((f"{base}{path}{6500000 - i}-novost-{i}", sentence(rng, 5, 10).rstrip("."), published))
+    return result
+
+
+def ru_full(dt: datetime) -> str:
+    return f"{dt:%H:%M}, {dt.day} {MONTHS[dt.month - 1]} {dt.year}"
+
+
+def ru_short(dt: datetime) -> str:
+    return f"сегодня, {dt:%H:%M}" if dt.date() == CORPUS_NOW.date() else ru_full(dt)
+
+
+def article_body(rng: random.Random, title: str, lead_cls: str, body_cls: str, para_cls: str = "") -> str:
+    cls = f' class="{para_cls}"' if para_cls else ""
+    paras = "".join(f"<p{cls}>{paragraph(rng)}</p>" for _ in range(rng.randint(5, 9)))
+    lead = f'<div class="{lead_cls}">{sentence(rng)}</div>' if lead_cls else ""
+    return f"<h1>{escape(title)}</h1>{lead}<div class=\"{body_cls}\">{paras}</div>"
+
+
+def build_tengrinews(rng, store: FixtureStore, url: str, count: int):
+    items = []
+    for i in range(count):
+        published = CORPUS_NOW - timedelta(minutes=29 * i)
+        title = sentence(rng, 5, 10).rstrip(".")
+        content = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(4))
+        items.append(
+            f"<item><title>{escape(title)}</title>"
+            f"<link>https://tengrinews.kz/kazakhstan_news/{600000 - i}/</link>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            f"<content:encoded><![CDATA[{content}]]></content:encoded></item>"
+        )
+    feed = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        "<title>Tengrinews</title><link>https://tengrinews.kz/</link>"
+        + "".join(items) + "</channel></rss>"
+    )
+    store.put(url, feed.encode("utf-8"), content_type="application/rss+xml; charset=utf-8")
+
+
+def build_kazinform(rng, store: FixtureStore, url: str, count: int):
+    arts = articles(rng, "https://www.inform.kz", "/ru/", count)
+    cards = "".join(
+        f'<div class="allNewsCard"><a href="{u}"><div class="allNewsCard_title">{escape(t)}</div>'
+        f'<div class="allNewsCard_time">{ru_full(p)}</div></a></div>'
+        for u, t, p in arts
+    )
+    store.put(url, page("Лента новостей", cards))
+    for u, t, _ in arts:
+        store.put(u, page(t, article_body(rng, t, "article__description", "article__body-text")))
+
+
+def build_zakon(rng, store: FixtureStore, url: str, count: int):
+    arts = articles(rng, "https://www.zakon.kz", "/", count)
+    cards = "".join(
+        f'<a class="newscard_link" href="{u}"><div class="newscard__title">{escape(t)}</div>'
+        f'<div class="newscard__date">{ru_short(p)}</div></a>'
+        for u, t, p in arts
+    )
+    store.put(url, page("Новости", cards))
+    for u, t, _ in arts:
+        store.put(u, page(t, article_body(rng, t, "description", "content")))
+
+
+def build_nur(rng, store: FixtureStore, url: str, count: int):
+    arts = articles(rng, "https://www.nur.kz", "/society/", count)
+    cards = "".join(
+        f'<article class="article-card"><a class="article-card__title" href="{u}">{escape(t)}</a>'
+        f'<time class="article-card__date" datetime="{p.astimezone(timezone.utc):%Y-%m-%dT%H:%M:%S}.000Z">'
+        f"{p:%H:%M}</time></article>"
+        for u, t, p in arts
+    )
+    store.put(url, page("Последние новости", cards))
+    for u, t, _ in arts:
+        store.put(u, page(t, article_body(rng, t, "", "formatted-body", "formatted-body__paragraph")))
+
+
+def build_informburo(rng, store: FixtureStore, url: str, count: int):
+    arts = articles(rng, "https://informburo.kz", "/novosti/", count)
+    rows, heading = [], None
+    for i, (u, t, p) in enumerate(arts):
+        day = "Сегодня" if p.date() == CORPUS_NOW.date() else f"{p.day} {MONTHS[p.month - 1]}"
+        if day != heading:
+            rows.append(f'<li><h2 class="date-heading">{day}</h2></li>')
+            heading = day
+        rows.append(
+            f'<li><div class="uk-grid"><a href="{u}"><img src="/img/{i}.jpg"></a>'
+            f'<div class="uk-width-expand"><a href="{u}">{escape(t)}</a>'
+            f'<time class="article-time">{p:%H:%M}</time></div></div></li>'
+        )
+    store.put(url, page("Новости", f'<ul class="uk-nav uk-nav-default">{"".join(rows)}</ul>'))
+    for u, t, _ in arts:
+        body = article_body(rng, t, "article-excerpt", "article-text")
+        store.put(u, page(t, f'<div class="article">{body}<div class="read-more">Читайте также</div></div>'))
+
+
+BUILDERS = {
+    "tengrinews": build_tengrinews,
+    "kazinform": build_kazinform,
+    "zakon": build_zakon,
+    "nur": build_nur,
+    "informburo": build_informburo,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=12, help="статей на источник")
+    parser.add_argument("--out", default=fixtures_dir())
+    args = parser.parse_args()
+
+    for source_type, builder in BUILDERS.items():
+        path = os.path.join(args.out, source_type)
+        shutil.rmtree(path, ignore_errors=True)
+        builder(random.Random(source_type), FixtureStore(args.out, source_type), SOURCE_URLS[source_type], args.articles)
+        print(f"✅ {source_type}: {len(os.listdir(path)) - 1} страниц")
+
+    with open(os.path.join(args.out, "sources.json"), "w", encoding="utf-8") as f:
+        json.dump(SOURCE_URLS, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+"""
+Локальная OpenAI-совместимая заглушка: нагрузочные прогоны суммаризации, эмбеддингов
+и кластеризации без обращения к OpenAI и без затрат.
+
+    python -m benchmarks.openai_stub --port 8900 --chat-latency 800 --rate-429 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=stub celery -A celery_app worker -Q summaries
+
+Эндпоинты:
+  POST /v1/chat/completions — с tools: tool call, аргументы которого проходят JSON Schema
+       функции (summarize_and_categorize: длины строк, enum категорий, min/maxItems);
+       без tools: ответ validate_cluster_with_gpt — JSON с кластерами по списку статей;
+  POST /v1/embeddings — детерминированные векторы: хэширование слов, так что тексты
+       с общими словами близки и HDBSCAN находит кластеры; input строкой или списком;
+  POST /v1/files, POST /v1/batches, GET /v1/batches/{id}, GET /v1/files/{id}/content —
+       Batch API в памяти (результат через --batch-delay секунд);
+  GET /stub/stats, POST /stub/reset, POST /stub/settings — счётчики и настройки на лету.
+
+Ответы зависят только от запроса. Латентность — из распределения --latency-dist
+(fixed / uniform / normal / lognormal) с медианой --chat-latency / --embedding-latency мс
+плюс --per-token-ms на токен ответа и --per-input-ms на текст в пачке эмбеддингов.
+429 с Retry-After: доля --rate-429 случайных запросов и всё сверх --rpm в минуту.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from array import array
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, fields
+from email import policy
+from email.parser import BytesParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+EMBEDDING_DIMS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072, "text-embedding-ada-002": 1536}
+LATENCY_DISTS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class StubSettings:
+    chat_latency_ms: float = 800.0
+    embedding_latency_ms: float = 60.0
+    per_token_ms: float = 0.0
+    per_input_ms: float = 2.0
+    latency_dist: str = "lognormal"
+    latency_sigma: float = 0.4
+    rate_429: float = 0.0
+    rpm: int = 0
+    retry_after: float = 1.0
+    batch_delay: float = 2.0
+
+
+settings = StubSettings()
+_latency_rng = random.Random()
+
+
+class StubStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.usage: Dict[str, Counter] = defaultdict(Counter)  # модель -> prompt/completion токены
+
+    def account(self, endpoint: str, model: str, usage: Dict[str, int]):
+        self.requests[endpoint] += 1
+        self.usage[model]["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        self.usage[model]["completion_tokens"] += usage.get("completion_tokens", 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "rate_limited": dict(self.rate_limited),
+            "usage": {model: dict(c) for model, c in self.usage.items()},
+        }
+
+
+stats = StubStats()
+
+
+# ======== ЛАТЕНТНОСТЬ И 429 ========
+def sample_latency(median_ms: float) -> float:
+    """Секунды; median_ms — медиана распределения (для lognormal — с тяжёлым правым хвостом)."""
+    if median_ms <= 0:
+        return 0.0
+    dist, sigma = settings.latency_dist, settings.latency_sigma
+    if dist == "fixed":
+        ms = median_ms
+    elif dist == "uniform":
+        ms = _latency_rng.uniform(median_ms * (1 - sigma), median_ms * (1 + sigma))
+    elif dist == "normal":
+        ms = _latency_rng.gauss(median_ms, median_ms * sigma)
+    else:
+        ms = median_ms * math.exp(_latency_rng.gauss(0, sigma))
+    return max(0.0, ms) / 1000
+
+
+_window: deque = deque()
+
+
+def _error(status: int, message: str, code: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        headers=headers,
+        content={"error": {"message": message, "type": "invalid_request_error" if status < 429 else "requests",
+                           "param": None, "code": code}},
+    )
+
+
+def _rate_limit(endpoint: str) -> Optional[JSONResponse]:
+    limited = False
+    if settings.rpm:
+        now = time.monotonic()
+        while _window and now - _window[0] > 60:
+            _window.popleft()
+        limited = len(_window) >= settings.rpm
+        if not limited:
+            _window.append(now)
+    if not limited and settings.rate_429 and _latency_rng.random() < settings.rate_429:
+        limited = True
+    if not limited:
+        return None
+    stats.rate_limited[endpoint] += 1
+    # SDK openai ждёт retry-after-ms / retry-after и повторяет запрос сам (max_retries)
+    return _error(429, "Rate limit reached (stub)", "rate_limit_exceeded", headers={
+        "retry-after": f"{settings.retry_after:g}",
+        "retry-after-ms": str(int(settings.retry_after * 1000)),
+    })
+
+
+# ======== ДЕТЕРМИНИРОВАННЫЕ ОТВЕТЫ ========
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+CATEGORY_RE = re.compile(r"(\d+) — ([^,\n]+)")
+TITLE_RE = re.compile(r"Заголовок \(RU\):\s*(.+)")
+TEXT_RE = re.compile(r"Текст \(RU\):\s*(.+?)\n\s*\n", re.S)
+
+
+def approx_tokens(text: str) -> int:
+    # ~3 символа на токен для смеси кириллицы и латиницы; tiktoken ради заглушки не тянем
+    return max(1, math.ceil(len(text) / 3))
+
+
+def _digest(payload: Any) -> bytes:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).digest()
+
+
+def _fit(text: str, min_len: int, max_len: int, filler: List[str]) -> str:
+    text = text.strip()
+    i = 0
+    while len(text) < min_len:
+        text = f"{text} {filler[i % len(filler)]}".strip()
+        i += 1
+    if len(text) > max_len:
+        text = text[:max_len - 1].rstrip() + "."
+    return text.ljust(min_len, ".")
+
+
+def _prompt_context(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    prompt = "\n".join(m.get("content") or "" for m in messages if isinstance(m.get("content"), str))
+    title = TITLE_RE.search(prompt)
+    body = TEXT_RE.search(prompt)
+    body_text = body.group(1).strip() if body else prompt
+    sentences = SENTENCE_RE.split(body_text)
+    return {
+        "prompt": prompt,
+        "title": (title.group(1).strip() if title else body_text[:100]),
+        "lead": " ".join(sentences[:3]),
+        "words": WORD_RE.findall(body_text) or ["news"],
+        "categories": [(int(i), name.strip()) for i, name in CATEGORY_RE.findall(prompt)],
+    }
+
+
+def from_schema(schema: Dict[str, Any], rng: random.Random, ctx: Dict[str, Any], path: Tuple[str, ...] = ()) -> Any:
+    """Значение, проходящее schema (подмножество JSON Schema, которое используют наши tools)."""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type")
+    if kind == "object":
+        return {k: from_schema(v, rng, ctx, path + (k,)) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        items = schema.get("items", {})
+        lo = schema.get("minItems", 0)
+        n = rng.randint(lo, max(lo, min(schema.get("maxItems", lo + 2), lo + 2)))
+        props = items.get("properties", {})
+        if "id" in props and "enum" in props.get("name", {}):
+            # категории: имя из enum схемы, id — из списка «id — название» в промпте
+            allowed = set(props["name"]["enum"])
+            pairs = [p for p in ctx["categories"] if p[1] in allowed] or list(enumerate(props["name"]["enum"], 1))
+            return [{"id": i, "name": name} for i, name in rng.sample(pairs, min(n, len(pairs)))]
+        return [from_schema(items, rng, ctx, path + (str(i),)) for i in range(n)]
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 1), schema.get("maximum", 1000))
+    if kind == "number":
+        return round(rng.random(), 4)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "string":
+        lang = path[-1] if path else ""
+        if "titles" in path:
+            text = ctx["title"]
+        elif "summaries" in path:
+            text = ctx["lead"]
+        else:
+            text = " ".join(rng.choice(ctx["words"]) for _ in range(12))
+        if lang in ("en", "kk", "kz"):
+            text = f"[{lang}] {text}"
+        return _fit(text, schema.get("minLength", 1), schema.get("maxLength", 400), ctx["words"])
+    return {}
+
+
+def _cluster_reply(prompt: str) -> str:
+    """Ответ для validate_cluster_with_gpt: статьи по id, одна или две группы по ≥3."""
+    start = prompt.find("Статьи:")
+    start = prompt.find("[", start) if start >= 0 else -1
+    try:
+        articles, _ = json.JSONDecoder().raw_decode(prompt[start:]) if start >= 0 else ([], 0)
+    except ValueError:
+        return "{}"
+    by_id = {a["id"]: a for a in articles if isinstance(a, dict) and "id" in a}
+    ids = sorted(by_id)
+    if len(ids) < 3:
+        return "{}"
+    groups = [ids] if len(ids) < 6 else [ids[:len(ids) // 2], ids[len(ids) // 2:]]
+    clusters = [{"theme": str(by_id[g[0]].get("title", ""))[:120], "article_ids": g} for g in groups]
+    # как и настоящая модель, заворачиваем в ```json — проверяется и разбор ограждений
+    return "```json\n" + json.dumps({"clusters": clusters}, ensure_ascii=False) + "\n```"
+
+
+def chat_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    digest = _digest(body.get("messages"))
+    rng = random.Random(digest)
+    ctx = _prompt_context(body.get("messages") or [])
+    message: Dict[str, Any] = {"role": "assistant", "content": None}
+
+    tools = [t["function"] for t in body.get("tools") or [] if t.get("type") == "function"]
+    if tools:
+        forced = (body.get("tool_choice") or {}) if isinstance(body.get("tool_choice"), dict) else {}
+        name = forced.get("function", {}).get("name") or tools[0]["name"]
+        fn = next((t for t in tools if t["name"] == name), tools[0])
+        arguments = json.dumps(from_schema(fn.get("parameters", {}), rng, ctx), ensure_ascii=False)
+        message["tool_calls"] = [{
+            "id": f"call_{digest.hex()[:24]}",
+            "type": "function",
+            "function": {"name": fn["name"], "arguments": arguments},
+        }]
+        completion, finish = arguments, "tool_calls"
+    else:
+        completion = _cluster_reply(ctx["prompt"]) if "Статьи:" in ctx["prompt"] else ctx["lead"][:400] or "OK"
+        message["content"], finish = completion, "stop"
+
+    prompt_tokens = approx_tokens(ctx["prompt"]) + sum(approx_tokens(json.dumps(t)) for t in tools)
+    completion_tokens = approx_tokens(completion)
+    return {
+        "id": f"chatcmpl-{digest.hex()[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "system_fingerprint": "stub",
+        "choices": [{"index": 0, "message": message, "finish_reason": finish, "logprobs": None}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def embed(text: str, dims: int) -> List[float]:
+    """Хэширование слов (feature hashing) + немного шума от текста целиком, L2-нормировано."""
+    vec = [0.0] * dims
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) < 3:
+            continue
+        h = hashlib.blake2b(word.encode(), digest_size=8).digest()
+        vec[int.from_bytes(h[:4], "little") % dims] += 1.0 if h[4] & 1 else -1.0
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    for i in rng.sample(range(dims), 8):
+        vec[i] += rng.uniform(-0.5, 0.5)
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def create_embeddings(body: Dict[str, Any]) -> Dict[str, Any]:
+    model = body.get("model", "text-embedding-3-small")
+    inputs = body.get("input")
+    if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    if not inputs:
+        raise ValueError("'input' must be a non-empty string or array")
+    dims = body.get("dimensions") or EMBEDDING_DIMS.get(model, 1536)
+
+    data, tokens = [], 0
+    for i, item in enumerate(inputs):
+        text = item if isinstance(item, str) else " ".join(map(str, item))
+        tokens += approx_tokens(text)
+        vector = embed(text, dims)
+        if body.get("encoding_format") == "base64":
+            # SDK openai по умолчанию просит base64 (float32 little-endian) и декодирует сам
+            vector = base64.b64encode(array("f", vector).tobytes()).decode()
+        data.append({"object": "embedding", "index": i, "embedding": vector})
+    return {
+        "object": "list",
+        "data": data,
+        "model": model,
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+# ======== BATCH API ========
+_files: Dict[str, Dict[str, Any]] = {}
+_batches: Dict[str, Dict[str, Any]] = {}
+
+BATCH_ENDPOINTS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "/v1/chat/completions": ("chat", chat_completion),
+    "/v1/embeddings": ("embeddings", create_embeddings),
+}
+
+
+def _store_file(content: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+    file_id = f"file-{uuid.uuid4().hex[:24]}"
+    meta = {
+        "id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+        "filename": filename, "purpose": purpose, "status": "processed",
+    }
+    _files[file_id] = {"meta": meta, "content": content}
+    return meta
+
+
+def _multipart(content_type: str, body: bytes) -> Dict[str, Tuple[Optional[str], bytes]]:
+    # python-multipart ради одной формы не тянем: multipart/form-data разбирает email
+    msg = BytesParser(policy=policy.HTTP).parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in msg.iter_parts()
+    }
+
+
+async def _run_batch(batch_id: str):
+    batch = _batches[batch_id]
+    batch["status"], batch["in_progress_at"] = "in_progress", int(time.time())
+    await asyncio.sleep(settings.batch_delay)
+
+    endpoint, handler = BATCH_ENDPOINTS[batch["endpoint"]]
+    results, errors = [], []
+    for line in _files[batch["input_file_id"]]["content"].decode().splitlines():
+        if not line.strip():
+            continue
+        request_id = f"req_{uuid.uuid4().hex[:24]}"
+        custom_id = None
+        try:
+            req = json.loads(line)
+            custom_id = req.get("custom_id")
+            body = handler(req["body"])
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append({"id": request_id, "custom_id": custom_id, "response": None,
+                           "error": {"code": "invalid_request", "message": str(e)}})
+            continue
+        stats.account(f"batch:{endpoint}", body["model"], body["usage"])
+        results.append({"id": request_id, "custom_id": custom_id,
+                        "response": {"status_code": 200, "request_id": request_id, "body": body}, "error": None})
+
+    def jsonl(rows):
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode()
+
+    batch["output_file_id"] = _store_file(jsonl(results), f"{batch_id}_output.jsonl", "batch_output")["id"]
+    if errors:
+        batch["error_file_id"] = _store_file(jsonl(errors), f"{batch_id}_error.jsonl", "batch_output")["id"]
+    batch["request_counts"] = {"total": len(results) + len(errors), "completed": len(results), "failed": len(errors)}
+    batch["status"], batch["completed_at"] = "completed", int(time.time())
+
+
+# ======== ПРИЛОЖЕНИЕ ========
+app = FastAPI(title="OpenAI stub")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions_endpoint(request: Request):
+    body = await request.json()
+    limited = _rate_limit("chat")
+    if limited:
+        return limited
+    result = chat_completion(body)
+    usage = result["usage"]
+    await asyncio.sleep(sample_latency(settings.chat_latency_ms) + usage["completion_tokens"] * settings.per_token_ms / 1000)
+    stats.account("chat", result["model"], usage)
+    return result
+
+
+@app.post("/v1/embeddings")
+async def embeddings_endpoint(request: Request):
+    body = await request.json()
+    limited = _rate_limit("embeddings")
+    if limited:
+        return limited
+    try:
+        result = create_embeddings(body)
+    except ValueError as e:
+        return _error(400, str(e), "invalid_input")
+    await asyncio.sleep(sample_latency(settings.embedding_latency_ms) + len(result["data"]) * settings.per_input_ms / 1000)
+    stats.account("embeddings", result["model"], result["usage"])
+    return result
+
+
+@app.post("/v1/files")
+async def upload_file(request: Request):
+    form = _multipart(request.headers.get("content-type", ""), await request.body())
+    if "file" not in form:
+        return _error(400, "Missing 'file' field", "invalid_file")
+    filename, content = form["file"]
+    purpose = form.get("purpose", (None, b"batch"))[1].decode()
+    return _store_file(content, filename or "upload.jsonl", purpose)
+
+
+@app.get("/v1/files/{file_id}")
+async def retrieve_file(file_id: str):
+    if file_id not in _files:
+        return _error(404, f"No such File object: {file_id}", "not_found")
+    return _files[file_id]["meta"]
+
+
+@app.get("/v1/files/{file_id}/content")
+async def file_content(file_id: str):
+    if file_id not in _files:
+        return _error(404, f"No such File object: {file_id}", "not_found")
+    return Response(_files[file_id]["content"], media_type="application/jsonl")
+
+
+@app.post("/v1/batches")
+async def create_batch(request: Request):
+    body = await request.json()
+    file_id, endpoint = body.get("input_file_id"), body.get("endpoint")
+    if file_id not in _files:
+        return _error(404, f"No such File object: {file_id}", "not_found")
+    if endpoint not in BATCH_ENDPOINTS:
+        return _error(400, f"Unsupported endpoint: {endpoint}", "invalid_endpoint")
+
+    batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+    _batches[batch_id] = {
+        "id": batch_id, "object": "batch", "endpoint": endpoint, "errors": None,
+        "input_file_id": file_id, "completion_window": body.get("completion_window", "24h"),
+        "status": "validating", "output_file_id": None, "error_file_id": None,
+        "created_at": int(time.time()), "in_progress_at": None, "completed_at": None,
+        "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        "metadata": body.get("metadata"),
+    }
+    asyncio.get_running_loop().create_task(_run_batch(batch_id))
+    return _batches[batch_id]
+
+
+@app.get("/v1/batches/{batch_id}")
+async def retrieve_batch(batch_id: str):
+    if batch_id not in _batches:
+        return _error(404, f"No such Batch object: {batch_id}", "not_found")
+    return _batches[batch_id]
+
+
+@app.get("/stub/stats")
+async def stub_stats():
+    return {**stats.as_dict(), "settings": asdict(settings)}
+
+
+@app.post("/stub/reset")
+async def stub_reset():
+    stats.reset()
+    _window.clear()
+    return {"ok": True}
+
+
+@app.post("/stub/settings")
+async def stub_settings(request: Request):
+    configure(**await request.json())
+    return asdict(settings)
+
+
+def configure(**overrides):
+    known = {f.name for f in fields(StubSettings)}
+    for name, value in overrides.items():
+        if name not in known:
+            raise ValueError(f"Unknown stub setting: {name}")
+        setattr(settings, name, type(getattr(settings, name))(value))
+    if settings.latency_dist not in LATENCY_DISTS:
+        raise ValueError(f"latency_dist must be one of {LATENCY_DISTS}")
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0) -> str:
+    """Поднимает заглушку в фоновом потоке (для бенчмарков в одном процессе); возвращает base_url."""
+    if not port:
+        with socket.socket() as s:
+            s.bind((host, 0))
+            port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="openai-stub", daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("OpenAI stub did not start within 10s")
+        time.sleep(0.05)
+    return f"http://{host}:{port}/v1"
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--chat-latency", type=float, default=settings.chat_latency_ms, help="медиана, мс")
+    parser.add_argument("--embedding-latency", type=float, default=settings.embedding_latency_ms, help="медиана, мс")
+    parser.add_argument("--per-token-ms", type=float, default=settings.per_token_ms, help="мс на токен ответа chat")
+    parser.add_argument("--per-input-ms", type=float, default=settings.per_input_ms, help="мс на текст в пачке эмбеддингов")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTS, default=settings.latency_dist)
+    parser.add_argument("--latency-sigma", type=float, default=settings.latency_sigma, help="разброс (доля медианы / σ логнормали)")
+    parser.add_argument("--rate-429", type=float, default=settings.rate_429, help="доля запросов с 429")
+    parser.add_argument("--rpm", type=int, default=settings.rpm, help="лимит запросов в минуту, 0 — без лимита")
+    parser.add_argument("--retry-after", type=float, default=settings.retry_after, help="Retry-After в 429, с")
+    parser.add_argument("--batch-delay", type=float, default=settings.batch_delay, help="через сколько секунд готов batch")
+
+
+def settings_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "chat_latency_ms": args.chat_latency,
+        "embedding_latency_ms": args.embedding_latency,
+        "per_token_ms": args.per_token_ms,
+        "per_input_ms": args.per_input_ms,
+        "latency_dist": args.latency_dist,
+        "latency_sigma": args.latency_sigma,
+        "rate_429": args.rate_429,
+        "rpm": args.rpm,
+        "retry_after": args.retry_after,
+        "batch_delay": args.batch_delay,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+    configure(**settings_from_args(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
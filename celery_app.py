@@ -1,31 +1,121 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import (
+    before_task_publish, task_postrun, task_prerun, worker_init, worker_process_init, worker_process_shutdown,
+)
+import time
 from datetime import timedelta
+from config import Config
 
 app = Celery(
     "kaznews",
-    broker="redis://localhost:6379/0",
-    backend="redis://localhost:6379/0",
+    broker=Config.REDIS_URL,
+    backend=Config.REDIS_URL,
 )
 
-# Регистрация двух очередей
+# Регистрация очередей
 app.conf.task_queues = {
-    "parsers": {},   # очередь для парсеров
-    "summaries": {}  # очередь для генерации summary
+    "parsers": {},     # очередь для парсеров
+    "summaries": {},   # очередь для генерации summary
+    "clustering": {},  # эмбеддинги + кластеризация
 }
 import tasks  
 
 # Планировщик
 app.conf.beat_schedule = {
-    "run-parsers-every-10-minutes": {
-        "task": "tasks.run_all_parsers",
-	"schedule": timedelta(minutes=10),
+    # Раз в минуту проверяем, каким источникам пора на обход (интервал у каждого свой)
+    "dispatch-due-sources-every-minute": {
+        "task": "tasks.dispatch_due_sources",
+        "schedule": timedelta(minutes=1),
         "options": {"queue": "parsers"},    # кладём задачу в очередь parsers
     },
-    "run-summary-generation-every-10-minutes": {
+    # Основной путь — событийный (парсер -> tasks.summarize_news), здесь только догоняющий проход
+    "run-summary-sweep": {
         "task": "tasks.run_summary_generation",
-	"schedule": timedelta(minutes=10),
+        "schedule": timedelta(minutes=Config.SUMMARY_SWEEP_INTERVAL_MINUTES),
         "options": {"queue": "summaries"},  # кладём задачу в очередь summaries
     },
+    "run-clustering-pipeline": {
+        "task": "tasks.run_clustering_pipeline",
+        "schedule": timedelta(minutes=Config.CLUSTERING_INTERVAL_MINUTES),
+        "options": {"queue": "clustering"},
+    },
 }
 app.conf.timezone = "UTC"
+
+
+@worker_process_init.connect
+def reset_db_pools(**kwargs):
+    # дочерний процесс prefork не должен пользоваться соединениями родителя
+    from src.database.db import dispose_engines
+    dispose_engines()
+
+
+# ======== МЕТРИКИ ========
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    if not Config.METRICS_WORKER_PORT:
+        return
+    # экспортер — в главном процессе воркера; значения prefork-детей он видит
+    # только через PROMETHEUS_MULTIPROC_DIR (при -P solo/threads каталог не нужен)
+    from src.utils.metrics import start_exporter
+    start_exporter(Config.METRICS_WORKER_PORT)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    from src.utils.metrics import mark_process_dead
+    mark_process_dead(pid)
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        from src.utils.metrics import TASK_SECONDS
+        TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+# ======== ТРАССИРОВКА ========
+# Контекст трейса едет в заголовках сообщения: парсер -> summarize_news,
+# process_recent_news -> run_clustering остаются одним трейсом
+@before_task_publish.connect
+def inject_trace_context(headers=None, **kwargs):
+    from src.utils.tracing import inject_headers
+    inject_headers(headers)
+
+
+@task_prerun.connect
+def start_trace_span(task_id=None, task=None, **kwargs):
+    from src.utils.tracing import start_task_span
+    start_task_span(task, task_id)
+
+
+@task_postrun.connect
+def end_trace_span(task_id=None, state=None, **kwargs):
+    from src.utils.tracing import end_task_span
+    end_task_span(task_id, state)
+
+
+@worker_process_shutdown.connect
+def flush_traces(**kwargs):
+    from src.utils.tracing import shutdown_tracing
+    shutdown_tracing()
+
+
+# ======== ЖУРНАЛ РАСХОДОВ OPENAI ========
+# строки копятся пачкой; после задачи — в БД, чтобы /usage не отставал на часы
+# (prefork-ребёнок выходит через os._exit, atexit журнала там не срабатывает)
+@task_postrun.connect
+@worker_process_shutdown.connect
+def flush_gpt_usage(**kwargs):
+    from src.services.gpt_usage_service import ledger
+    ledger.flush()
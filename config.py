@@ -12,3 +12,93 @@ class Config:
     POSTGRES_URI = os.getenv("POSTGRES_URI")
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Роль процесса: api / parser / summary / clustering — от неё зависит размер пулов БД
+    APP_ROLE = os.getenv("APP_ROLE", "api")
+    # Явные переопределения пула (по умолчанию — профиль роли, см. src/database/db.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0")) or None
+    DB_MAX_OVERFLOW = int(os.environ["DB_MAX_OVERFLOW"]) if os.getenv("DB_MAX_OVERFLOW") else None
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # Redis: брокер Celery, распределённые блокировки, статистика запусков
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Сколько секунд живёт закэшированный total ленты /news
+    NEWS_COUNT_CACHE_TTL = int(os.getenv("NEWS_COUNT_CACHE_TTL", "60"))
+
+    # Кэш ответов API (/news, /clusters): TTL в Redis и в памяти, размер LRU процесса,
+    # max-age для клиентов (свежесть дальше проверяется по ETag)
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_LOCAL_SIZE = int(os.getenv("RESPONSE_CACHE_LOCAL_SIZE", "256"))
+    RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "30"))
+
+    # OpenAI-совместимый endpoint: пусто — api.openai.com; для нагрузочных прогонов
+    # без затрат — локальная заглушка (python -m benchmarks.openai_stub)
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+    # Журнал расходов OpenAI (src/services/gpt_usage_service.py): строк на один INSERT и
+    # максимальная задержка записи; GPT_PRICES — JSON с ценами ($ за 1M токенов) поверх встроенных
+    GPT_LEDGER_BATCH = int(os.getenv("GPT_LEDGER_BATCH", "50"))
+    GPT_LEDGER_FLUSH_SECONDS = float(os.getenv("GPT_LEDGER_FLUSH_SECONDS", "30"))
+    GPT_PRICES = os.getenv("GPT_PRICES", "")
+
+    # Дневной бюджет OpenAI (UTC-сутки), $; 0 — без ограничения. С доли GPT_BUDGET_THROTTLE_AT
+    # суммаризация идёт с паузой GPT_BUDGET_THROTTLE_DELAY сек между статьями, после бюджета — стоит до следующих суток
+    GPT_DAILY_BUDGET_USD = float(os.getenv("GPT_DAILY_BUDGET_USD", "0"))
+    GPT_BUDGET_THROTTLE_AT = float(os.getenv("GPT_BUDGET_THROTTLE_AT", "0.8"))
+    GPT_BUDGET_THROTTLE_DELAY = float(os.getenv("GPT_BUDGET_THROTTLE_DELAY", "5"))
+
+    # Семантический поиск: сколько секунд помнить эмбеддинг запроса, ef_search для HNSW
+    SEMANTIC_QUERY_CACHE_TTL = int(os.getenv("SEMANTIC_QUERY_CACHE_TTL", str(7 * 24 * 3600)))
+    SEMANTIC_EF_SEARCH = int(os.getenv("SEMANTIC_EF_SEARCH", "64"))
+
+    # Защита от наложения запусков по расписанию (секунды жизни блокировок)
+    PARSERS_LOCK_TTL = int(os.getenv("PARSERS_LOCK_TTL", "1800"))
+    SOURCE_LOCK_TTL = int(os.getenv("SOURCE_LOCK_TTL", "900"))
+    # Суммаризация: парсеры ставят задачи пачками по SUMMARY_ENQUEUE_BATCH новых статей,
+    # beat раз в SUMMARY_SWEEP_INTERVAL_MINUTES подбирает пропущенное (не больше SUMMARY_BATCH_LIMIT)
+    SUMMARY_ENQUEUE_BATCH = int(os.getenv("SUMMARY_ENQUEUE_BATCH", "5"))
+    SUMMARY_SWEEP_INTERVAL_MINUTES = int(os.getenv("SUMMARY_SWEEP_INTERVAL_MINUTES", "30"))
+    SUMMARY_BATCH_LIMIT = int(os.getenv("SUMMARY_BATCH_LIMIT", "200"))
+    # Через сколько секунд взятая, но не дописанная статья (воркер умер) снова доступна другим
+    SUMMARY_CLAIM_TTL = int(os.getenv("SUMMARY_CLAIM_TTL", "900"))
+    # Как часто во время прохода суммаризации сбрасывать кэш ответов /news (секунды)
+    SUMMARY_CACHE_BUMP_SECONDS = float(os.getenv("SUMMARY_CACHE_BUMP_SECONDS", "10"))
+
+    # Адаптивный обход источников (секунды): интервал = среднее время между публикациями
+    # за CRAWL_RATE_WINDOW_HOURS, зажатое в [MIN, MAX]; при ошибках — backoff до CRAWL_MAX_BACKOFF
+    CRAWL_MIN_INTERVAL = int(os.getenv("CRAWL_MIN_INTERVAL", "120"))
+    CRAWL_MAX_INTERVAL = int(os.getenv("CRAWL_MAX_INTERVAL", "3600"))
+    CRAWL_MAX_BACKOFF = int(os.getenv("CRAWL_MAX_BACKOFF", "21600"))
+    CRAWL_RATE_WINDOW_HOURS = int(os.getenv("CRAWL_RATE_WINDOW_HOURS", "24"))
+    CRAWL_JITTER = float(os.getenv("CRAWL_JITTER", "0.15"))
+
+    # Архив сырых ответов парсеров (для reextract.py без повторного обхода). Пусто — выключен
+    RAW_ARCHIVE_DIR = os.getenv("RAW_ARCHIVE_DIR", "")
+    RAW_ARCHIVE_SEGMENT_MB = int(os.getenv("RAW_ARCHIVE_SEGMENT_MB", "256"))
+
+    # Порт Prometheus-экспортера Celery-воркера (0 — выключен; API отдаёт /metrics сам).
+    # Под prefork нужен ещё PROMETHEUS_MULTIPROC_DIR, см. src/utils/metrics.py
+    METRICS_WORKER_PORT = int(os.getenv("METRICS_WORKER_PORT", "0"))
+
+    # Трассировка OpenTelemetry: otlp (локальный коллектор, OTEL_EXPORTER_OTLP_ENDPOINT) /
+    # file (JSON-строки в TRACING_DIR) / console; пусто — выключена. См. src/utils/tracing.py
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "").lower()
+    TRACING_DIR = os.getenv("TRACING_DIR", "traces")
+
+    # Профилирование (src/utils/profiling.py): PROFILE — задачи на каждом запуске
+    # (crawl_source,summarize_news — рабочие пути; run_all_parsers,run_summary_generation —
+    # ручной обход и догоняющий проход; run_clustering; или *), PROFILE_ROUTES — шаблоны
+    # роутов API (/news/search или *). Артефакты — в PROFILE_DIR
+    PROFILE = os.getenv("PROFILE", "")
+    PROFILE_ROUTES = os.getenv("PROFILE_ROUTES", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MEMORY = os.getenv("PROFILE_MEMORY", "1") != "0"     # снимки tracemalloc (замедляют в разы)
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))  # шаг сэмплера стеков
+
+    # Пайплайн кластеризации (эмбеддинги -> HDBSCAN -> GPT-валидация)
+    CLUSTERING_INTERVAL_MINUTES = int(os.getenv("CLUSTERING_INTERVAL_MINUTES", "30"))
+    CLUSTERING_LOCK_TTL = int(os.getenv("CLUSTERING_LOCK_TTL", "1800"))
+    # run_clustering ждёт занятую блокировку повторами с таким шагом (секунды), до CLUSTERING_LOCK_TTL
+    CLUSTERING_LOCK_RETRY_DELAY = int(os.getenv("CLUSTERING_LOCK_RETRY_DELAY", "60"))
@@ -1,8 +1,16 @@
 # main.py
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from config import Config
 from src.api.v1 import news
 from src.api.v1 import clusters
+from src.api.v1 import usage
+from src.database.db import pool_stats
+from src.utils.metrics import HTTP_SECONDS, metrics_payload
+from src.utils.profiling import profile_request
+from src.utils.tracing import trace_request
 
 app = FastAPI()
 
@@ -15,6 +23,40 @@ app.add_middleware(
     allow_headers=["*"],   # или ["Authorization", "Content-Type"]
 )
 
+# Латентность по шаблону роута (/news/{news_id}, а не по каждому id)
+@app.middleware("http")
+async def track_request_latency(request: Request, call_next):
+    started, status = time.perf_counter(), 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_SECONDS.labels(request.method, route, str(status)).observe(time.perf_counter() - started)
+
+
+# Серверный спан на запрос (если включена трассировка, см. src/utils/tracing.py)
+app.middleware("http")(trace_request)
+
+# Профилирование выбранных роутов (PROFILE_ROUTES); без него middleware не подключается
+if Config.PROFILE_ROUTES:
+    app.middleware("http")(profile_request)
+
+
 # ✅ Подключаем роуты
 app.include_router(news.router)
 app.include_router(clusters.router)
+app.include_router(usage.router)
+
+
+# Состояние пулов БД: занятые/свободные соединения, overflow, ожидание checkout
+@app.get("/internal/db-pool", include_in_schema=False)
+def get_db_pool_stats():
+    return pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    payload, content_type = metrics_payload()
+    return Response(payload, media_type=content_type)
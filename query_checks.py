@@ -0,0 +1,257 @@
+"""
+Регрессионная проверка запросов API:
+1) планы (EXPLAIN) для основных путей доступа к news;
+2) число запросов на страницу ответа — N+1 при сериализации ловится здесь.
+
+Запуск — на MySQL с данными из mysql-dump.sql и применёнными миграциями:
+    mysql -h 127.0.0.1 -P 3307 -u root -p newsdb < mysql-dump.sql
+    alembic upgrade head
+    python query_checks.py            # индекс должен быть среди possible_keys
+    python query_checks.py --strict   # индекс должен быть выбран, без full scan и filesort
+
+Запросы не переписываются вручную: вызываются настоящие методы сервисов,
+их SQL перехватывается и прогоняется через EXPLAIN FORMAT=JSON.
+Код возврата != 0 — если какой-то путь доступа потерял свой индекс
+или ответ API стал стоить больше запросов, чем заложено в build_query_budgets.
+"""
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy import event, text
+
+from src.database.db import get_db, get_db_pg, engine, engine_pg
+from src.services.news_service import NewsService
+from src.services.cluster_service import ClusterService
+from src.services.clustering_service import ClusteringService
+from src.services.search_service import SearchService
+from src.services.export_service import export_stmt
+from src.schemas.news import NewsOut, PaginatedNews
+from src.schemas.cluster import ClusterOut
+
+
+@contextmanager
+def capture_sql(target_engine):
+    """Собирает (statement, parameters) всех SELECT, выполненных внутри блока."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(target_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(target_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def walk_tables(node):
+    """Все узлы "table" из EXPLAIN FORMAT=JSON (рекурсивно, включая подзапросы)."""
+    if isinstance(node, dict):
+        if "table" in node and isinstance(node["table"], dict):
+            yield node["table"]
+        for value in node.values():
+            yield from walk_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from walk_tables(value)
+
+
+def has_filesort(node) -> bool:
+    if isinstance(node, dict):
+        if node.get("using_filesort"):
+            return True
+        return any(has_filesort(v) for v in node.values())
+    if isinstance(node, list):
+        return any(has_filesort(v) for v in node)
+    return False
+
+
+def explain(db, statement, parameters):
+    conn = db.connection()
+    row = conn.exec_driver_sql(f"EXPLAIN FORMAT=JSON {statement}", parameters).fetchone()
+    return json.loads(row[0])
+
+
+# (название, вызов сервиса, таблица -> допустимые индексы, запрещён ли filesort)
+def build_checks(db):
+    news_service = NewsService(db)
+    clustering = ClusteringService.__new__(ClusteringService)  # без GPT-клиента, нужна только MySQL-сессия
+    clustering.mysql_db = db
+    week_ago = datetime.utcnow() - timedelta(days=7)
+
+    return [
+        (
+            "news listing (get_paginated)",
+            lambda: news_service.get_paginated(page=1, per_page=10),
+            {"news": {"ix_news_has_summary_published_at"}},
+            True,
+        ),
+        (
+            "news listing by source",
+            lambda: news_service.get_paginated(page=1, per_page=10, source_id=1),
+            {"news": {"ix_news_source_summary_published_at"}},
+            True,
+        ),
+        (
+            "news listing by date range",
+            lambda: news_service.get_paginated(page=1, per_page=10, date_from=week_ago),
+            {"news": {"ix_news_has_summary_published_at"}},
+            True,
+        ),
+        (
+            "news listing by category",
+            lambda: news_service.get_paginated(page=1, per_page=10, category_ids=[1, 2]),
+            {
+                "news": {"ix_news_has_summary_published_at"},
+                "news_categories": {"ix_news_categories_category_news", "PRIMARY"},
+            },
+            False,
+        ),
+        (
+            "news search (fulltext)",
+            lambda: SearchService(db).search("Токаев", per_page=10),
+            {"news": {"ix_news_fulltext"}},
+            False,
+        ),
+        (
+            "incremental export (updated_since)",
+            lambda: db.execute(export_stmt(updated_since=week_ago).limit(10)).all(),
+            {"news": {"ix_news_has_summary_updated_at"}},
+            True,
+        ),
+        (
+            "pending summaries",
+            lambda: news_service.get_pending_summaries(),
+            {"news": {"ix_news_has_summary_published_at"}},
+            False,
+        ),
+        (
+            "recent news for embeddings",
+            lambda: clustering.fetch_recent_news(hours=24),
+            {"news": {"ix_news_has_summary_published_at"}},
+            False,
+        ),
+    ]
+
+
+# (название, engine, вызов сервиса + сериализация как в API, максимум запросов)
+def build_query_budgets(db, pg_db):
+    news_service = NewsService(db)
+    cluster_service = ClusterService(pg_db)
+    first_id = db.execute(text("SELECT MIN(id) FROM news")).scalar() or 0
+    first_cluster_id = pg_db.execute(text("SELECT MIN(cluster_id) FROM news_clusters")).scalar() or 0
+
+    return [
+        (
+            "GET /news/?per_page=100",
+            engine,
+            # COUNT (если total не в кэше) + страница с JOIN sources + SELECT категорий IN (...)
+            lambda: PaginatedNews.model_validate(
+                news_service.get_paginated(page=1, per_page=100), from_attributes=True
+            ),
+            3,
+        ),
+        (
+            "GET /news/{id}",
+            engine,
+            lambda: NewsOut.model_validate(news_service.get(first_id), from_attributes=True),
+            2,
+        ),
+        (
+            "GET /clusters/?per_page=100",
+            engine_pg,
+            lambda: [ClusterOut.model_validate(c) for c in cluster_service.get_all(limit=100)],
+            2,
+        ),
+        (
+            "GET /clusters/?hours=72",
+            engine_pg,
+            lambda: [ClusterOut.model_validate(c) for c in cluster_service.get_all(limit=100, hours=72)],
+            2,
+        ),
+        (
+            "GET /clusters/{id}",
+            engine_pg,
+            lambda: ClusterOut.model_validate(cluster_service.get(first_cluster_id)),
+            2,
+        ),
+        (
+            # проекция статей лежит в news_cluster_items — MySQL не нужен
+            "GET /clusters/{id}?expand=news",
+            engine_pg,
+            lambda: ClusterOut.model_validate(cluster_service.get_expanded(first_cluster_id, db)),
+            2,
+        ),
+    ]
+
+
+def check_query_budgets(db, pg_db) -> int:
+    failures = 0
+    print("\n=== query budgets ===")
+    for name, target_engine, call, budget in build_query_budgets(db, pg_db):
+        db.expire_all()
+        pg_db.expire_all()
+        with capture_sql(target_engine) as captured:
+            call()
+        status = "OK" if len(captured) <= budget else "FAIL"
+        print(f"  [{status}] {name}: {len(captured)} запрос(ов), бюджет {budget}")
+        if status == "FAIL":
+            failures += 1
+            for statement, _ in captured:
+                print(f"      {' '.join(statement.split())[:160]}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strict", action="store_true", help="требовать, чтобы индекс был выбран оптимизатором")
+    args = parser.parse_args()
+
+    load_dotenv()
+    db = next(get_db())
+    failures = 0
+
+    for name, call, expected, forbid_filesort in build_checks(db):
+        with capture_sql(engine) as captured:
+            call()
+
+        print(f"=== {name} ===")
+        for statement, parameters in captured:
+            plan = explain(db, statement, parameters)
+            for table in walk_tables(plan):
+                table_name = table.get("table_name")
+                allowed = expected.get(table_name)
+                if allowed is None:
+                    continue
+                key = table.get("key")
+                possible = set(table.get("possible_keys") or [])
+                access = table.get("access_type")
+                print(f"  {table_name}: access={access} key={key} possible={sorted(possible)}")
+
+                ok = bool(allowed & possible) or key in allowed
+                if args.strict:
+                    ok = key in allowed and access != "ALL"
+                if not ok:
+                    failures += 1
+                    print(f"  [FAIL] {table_name}: ожидался один из {sorted(allowed)}")
+
+            if args.strict and forbid_filesort and has_filesort(plan):
+                failures += 1
+                print("  [FAIL] using filesort")
+
+    pg_db = next(get_db_pg())
+    failures += check_query_budgets(db, pg_db)
+
+    db.rollback()
+    pg_db.rollback()
+    print(f"\n{'OK' if not failures else f'{failures} проблем(ы)'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Повторное извлечение статей из архива сырых страниц (RAW_ARCHIVE_DIR) — без сети.
+
+Когда сайт меняет вёрстку и селекторы парсера чинятся, уже сохранённые статьи
+можно пересобрать текущим extract_article() парсера по архиву:
+    python reextract.py --dry-run                 # посчитать, что изменится
+    python reextract.py --source-id 3 --resummarize
+    python reextract.py --since 2026-10-01 --workers 8
+
+Извлечение (BeautifulSoup) идёт параллельно в --workers процессах, чтение сегментов —
+последовательно по диску; в MySQL пишет только главный процесс, пачками по --chunk.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from config import Config
+from src.database.db import get_db
+from src.models.news import News
+from src.models.source import SourceType
+from src.parsers.base_parser import BaseParser
+from src.parsers.registry import get_parser
+from src.services.source_service import SourceService
+from src.utils.raw_archive import ArchiveRecord, RawArchive
+
+
+def supports_extraction(parser_cls) -> bool:
+    return parser_cls.extract_article.__func__ is not BaseParser.extract_article.__func__
+
+
+def _extract_chunk(root: str, source_type: str, records: List[ArchiveRecord]) -> Tuple[List[Tuple[str, Dict]], int]:
+    """В дочернем процессе: [(url, поля статьи)], число ошибок извлечения."""
+    parser_cls = get_parser(SourceType(source_type))
+    archive = RawArchive(root)
+    extracted, errors = [], 0
+    for page in archive.iter_pages(records):
+        html = page.body
+        if page.encoding:
+            try:
+                html = page.body.decode(page.encoding)
+            except (LookupError, UnicodeDecodeError):
+                pass  # пусть BeautifulSoup определит кодировку сам
+        try:
+            extracted.append((page.url, parser_cls.extract_article(html)))
+        except Exception as e:
+            print(f"[ERR] {page.url}: {e}", file=sys.stderr)
+            errors += 1
+    return extracted, errors
+
+
+def apply_chunk(db, extracted: List[Tuple[str, Dict]], counts: Counter, dry_run: bool, resummarize: bool):
+    changed = []
+    by_url = {url: fields for url, fields in extracted}
+    rows = db.execute(select(News).where(News.url.in_(list(by_url)))).scalars().all()
+    counts["missing"] += len(by_url) - len(rows)
+
+    for news in rows:
+        content = by_url[news.url].get("content")
+        if not content:
+            counts["empty"] += 1  # селекторы ничего не нашли — старый текст не затираем
+            continue
+        if content == news.content:
+            counts["unchanged"] += 1
+            continue
+        counts["updated"] += 1
+        if not dry_run:
+            news.content = content
+            if resummarize:
+                news.has_summary = False
+                changed.append(news.id)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+        if changed:
+            _enqueue_resummarize(changed)
+            counts["resummarize_queued"] += len(changed)
+
+
+def _enqueue_resummarize(news_ids: List[int]):
+    """
+    Ставит summarize_news по явным id: догоняющий run_summary_generation берёт только
+    статьи за последние сутки, а пересобранные обычно старше — без задачи они так и
+    остались бы без summary и пропали бы из ленты и поиска.
+    """
+    from tasks import summarize_news  # Celery — только когда действительно ставим задачи
+
+    batch = Config.SUMMARY_ENQUEUE_BATCH
+    for i in range(0, len(news_ids), batch):
+        summarize_news.apply_async(args=[news_ids[i:i + batch]], queue="summaries")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source-id", type=int, action="append", help="источник (можно несколько); по умолчанию все")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="только страницы, загруженные после даты")
+    parser.add_argument("--archive-dir", default=None, help="по умолчанию RAW_ARCHIVE_DIR")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=200, help="страниц на одну задачу / один commit")
+    parser.add_argument("--dry-run", action="store_true", help="только посчитать изменения")
+    parser.add_argument("--resummarize", action="store_true", help="сбросить has_summary у изменённых статей и поставить их суммаризацию")
+    args = parser.parse_args()
+
+    load_dotenv()
+    root = args.archive_dir or Config.RAW_ARCHIVE_DIR
+    if not root or not os.path.exists(os.path.join(root, "index.sqlite")):
+        print("Архив не найден: задайте RAW_ARCHIVE_DIR или --archive-dir", file=sys.stderr)
+        return 1
+
+    archive = RawArchive(root)
+    db = next(get_db())
+    counts: Counter = Counter()
+    started = time.perf_counter()
+
+    sources = [s for s in SourceService(db).get_all() if not args.source_id or s.id in args.source_id]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for source in sources:
+            parser_cls = get_parser(source.source_type)
+            if parser_cls is None or not supports_extraction(parser_cls):
+                print(f"⏭️ {source.name}: парсер не извлекает статьи из HTML, пропускаем")
+                continue
+
+            # страница-лента источника тоже в архиве — статьёй она не является
+            records = [r for r in archive.records(source.id, args.since) if r.url != source.url]
+            print(f"🔄 {source.name}: {len(records)} страниц в архиве")
+            futures = [
+                pool.submit(_extract_chunk, root, source.type, records[i:i + args.chunk])
+                for i in range(0, len(records), args.chunk)
+            ]
+            for future in as_completed(futures):
+                extracted, errors = future.result()
+                counts["pages"] += len(extracted) + errors
+                counts["errors"] += errors
+                apply_chunk(db, extracted, counts, args.dry_run, args.resummarize)
+
+    db.close()
+    elapsed = time.perf_counter() - started
+    rate = counts["pages"] / elapsed if elapsed else 0.0
+    print(f"\n{'DRY RUN: ' if args.dry_run else ''}{dict(counts)} за {elapsed:.1f} с ({rate:.0f} стр/с)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
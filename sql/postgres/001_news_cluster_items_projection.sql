@@ -0,0 +1,15 @@
+-- Проекция статьи (MySQL news + sources) рядом с элементом кластера:
+-- GET /clusters/{id}?expand=news отдаётся без похода в MySQL за каждой статьёй.
+-- Postgres-таблицы не под alembic (он работает только с MySQL), применять вручную:
+--   psql "$POSTGRES_URI" -f sql/postgres/001_news_cluster_items_projection.sql
+-- Существующие строки дозаполняются при первом запросе кластера с ?expand=news.
+
+ALTER TABLE news_cluster_items
+    ADD COLUMN IF NOT EXISTS title text,
+    ADD COLUMN IF NOT EXISTS summary text,
+    ADD COLUMN IF NOT EXISTS source_name varchar(255),
+    ADD COLUMN IF NOT EXISTS published_at timestamp without time zone;
+
+-- selectinload(NewsCluster.items) ищет элементы по cluster_id IN (...)
+CREATE INDEX IF NOT EXISTS ix_news_cluster_items_cluster_id
+    ON news_cluster_items (cluster_id);
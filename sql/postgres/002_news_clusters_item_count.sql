@@ -0,0 +1,30 @@
+-- Счётчик статей и время последней статьи кластера: GET /clusters/ сортирует
+-- и фильтрует по ним через индекс, без GROUP BY по всем news_cluster_items.
+-- Новые кластеры получают значения в ClusteringService.run_clustering.
+-- Применять после 001 (last_article_at берётся из проекции published_at):
+--   psql "$POSTGRES_URI" -f sql/postgres/002_news_clusters_item_count.sql
+
+ALTER TABLE news_clusters
+    ADD COLUMN IF NOT EXISTS item_count integer NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_article_at timestamp without time zone;
+
+-- Backfill существующей истории (однократно)
+UPDATE news_clusters c
+SET item_count = s.item_count,
+    last_article_at = COALESCE(s.last_article_at, c.created_at)
+FROM (
+    SELECT cluster_id, count(*) AS item_count, max(published_at) AS last_article_at
+    FROM news_cluster_items
+    GROUP BY cluster_id
+) s
+WHERE s.cluster_id = c.cluster_id;
+
+UPDATE news_clusters SET last_article_at = created_at WHERE last_article_at IS NULL;
+
+-- Топ без окна: ORDER BY item_count DESC, cluster_id DESC LIMIT n — чтение первых n строк индекса
+CREATE INDEX IF NOT EXISTS ix_news_clusters_item_count
+    ON news_clusters (item_count DESC, cluster_id DESC);
+
+-- Окно ?hours=N: range scan по свежим кластерам, сортируется только окно
+CREATE INDEX IF NOT EXISTS ix_news_clusters_last_article_at
+    ON news_clusters (last_article_at DESC);
@@ -0,0 +1,7 @@
+-- ANN-индекс для GET /news/semantic-search: ORDER BY embedding <=> :query LIMIT k
+-- идёт по графу HNSW, а не перебором всех векторов. Нужен pgvector >= 0.5.
+-- OpenAI-эмбеддинги нормированы, поэтому косинусное расстояние.
+--   psql "$POSTGRES_URI" -f sql/postgres/003_news_embeddings_hnsw.sql
+
+CREATE INDEX IF NOT EXISTS ix_news_embeddings_embedding_hnsw
+    ON news_embeddings USING hnsw (embedding vector_cosine_ops);
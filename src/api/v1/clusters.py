@@ -1,30 +1,61 @@
 # src/api/clusters.py
-from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from src.database.db import get_db_pg
-from src.services.cluster_service import ClusterService
+from src.database.db import get_async_db, get_async_db_pg
+from src.services.cluster_service import AsyncClusterService
 from src.schemas.cluster import ClusterOut
+from src.utils.response_cache import cached_json_response
 
 router = APIRouter(prefix="/clusters", tags=["Clusters"])
 
 
+_cluster_list = TypeAdapter(List[ClusterOut])
+
+# без ?expand=news элементы кластера отдаются как раньше — только id и news_id
+_WITHOUT_NEWS = {"items": {"__all__": {"news"}}}
+
+
 @router.get("/", response_model=list[ClusterOut])
-def get_clusters(
-    db: Session = Depends(get_db_pg),
+async def get_clusters(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db_pg),
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
+    hours: Optional[int] = Query(None, ge=1, le=24 * 90, description="только кластеры со статьями за последние N часов"),
 ):
-    service = ClusterService(db)
-    offset = (page - 1) * per_page
-    return service.get_all(limit=per_page, offset=offset)
+    async def produce() -> str:
+        service = AsyncClusterService(db)
+        offset = (page - 1) * per_page
+        clusters = await service.get_all(limit=per_page, offset=offset, hours=hours)
+        return _cluster_list.dump_json(
+            _cluster_list.validate_python(clusters, from_attributes=True),
+            exclude={"__all__": _WITHOUT_NEWS},
+        ).decode()
+
+    return await cached_json_response(request, "clusters", produce)
 
 
 @router.get("/{cluster_id}", response_model=ClusterOut)
-def get_cluster(cluster_id: int, db: Session = Depends(get_db_pg)):
-    service = ClusterService(db)
-    cluster = service.get(cluster_id)
-    if not cluster:
-        raise HTTPException(status_code=404, detail="Cluster not found")
-    return cluster
+async def get_cluster(
+    cluster_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db_pg),
+    mysql_db: AsyncSession = Depends(get_async_db),
+    expand: Optional[str] = Query(None, pattern="^news$", description="news — вложить статьи в элементы"),
+):
+    async def produce() -> str:
+        service = AsyncClusterService(db)
+        if expand == "news":
+            cluster = await service.get_expanded(cluster_id, mysql_db)
+        else:
+            cluster = await service.get(cluster_id)
+        if not cluster:
+            raise HTTPException(status_code=404, detail="Cluster not found")
+        return ClusterOut.model_validate(cluster).model_dump_json(
+            exclude=None if expand == "news" else _WITHOUT_NEWS
+        )
+
+    return await cached_json_response(request, "clusters", produce)
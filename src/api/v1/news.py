@@ -1,41 +1,138 @@
 # src/api/news.py
-from http.client import HTTPException
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional,List
 from datetime import datetime
 
-from src.database.db import get_db
-from src.services.news_service import NewsService
-from src.schemas.news import NewsOut, PaginatedNews
+from src.database.db import get_async_db, get_async_db_pg
+from src.services.export_service import ExportService
+from src.services.news_service import AsyncNewsService
+from src.schemas.news import NewsOut, NewsSearchResult, NewsSemanticResult, PaginatedNews
+from src.services.search_service import AsyncSearchService
+from src.services.semantic_search_service import SemanticSearchService
+from src.utils.response_cache import cached_json_response
 
 router = APIRouter(prefix="/news", tags=["News"])
 
 
 @router.get("/", response_model=PaginatedNews)
-def get_news(
-    db: Session = Depends(get_db),
+async def get_news(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     category_ids: Optional[List[int]] = Query(None, alias="category_ids[]"),
     source_id: Optional[int] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor предыдущей страницы (keyset-пагинация, page игнорируется)"),
+    include_total: bool = Query(True, description="false — не считать total (бесконечная лента)"),
 ):
-    service = NewsService(db)
-    return service.get_paginated(
-        page=page,
-        per_page=per_page,
+    async def produce() -> str:
+        service = AsyncNewsService(db)
+        try:
+            result = await service.get_paginated(
+                page=page,
+                per_page=per_page,
+                category_ids=category_ids,
+                source_id=source_id,
+                date_from=date_from,
+                date_to=date_to,
+                cursor=cursor,
+                with_total=include_total,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return PaginatedNews.model_validate(result, from_attributes=True).model_dump_json()
+
+    # при попадании в кэш MySQL не трогаем: сессия не открывает соединение до первого запроса
+    return await cached_json_response(request, "news", produce)
+
+# /search, /semantic-search и /export объявлены до /{news_id}, иначе путь попадёт в news_id
+@router.get("/search", response_model=NewsSearchResult)
+async def search_news(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200, description="слова для поиска в заголовках и summary (ru/kz/en)"),
+    db: AsyncSession = Depends(get_async_db),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1, le=50),
+    category_ids: Optional[List[int]] = Query(None, alias="category_ids[]"),
+    source_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    async def produce() -> str:
+        service = AsyncSearchService(db)
+        try:
+            result = await service.search(
+                q,
+                page=page,
+                per_page=per_page,
+                category_ids=category_ids,
+                source_id=source_id,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return NewsSearchResult.model_validate(result, from_attributes=True).model_dump_json()
+
+    return await cached_json_response(request, "news", produce)
+
+
+@router.get("/semantic-search", response_model=NewsSemanticResult)
+async def semantic_search_news(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=500, description="запрос на естественном языке"),
+    limit: int = Query(10, ge=1, le=50),
+    min_score: Optional[float] = Query(None, ge=0, le=1, description="минимальная косинусная близость"),
+    db: AsyncSession = Depends(get_async_db),
+    pg_db: AsyncSession = Depends(get_async_db_pg),
+):
+    async def produce() -> str:
+        service = SemanticSearchService(db, pg_db)
+        try:
+            result = await service.search(q, limit=limit, min_score=min_score)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:  # OpenAI недоступен — эмбеддинг запроса не получить
+            raise HTTPException(status_code=503, detail=str(e))
+        return NewsSemanticResult.model_validate(result, from_attributes=True).model_dump_json()
+
+    return await cached_json_response(request, "news", produce)
+
+
+@router.get("/export")
+async def export_news(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    category_ids: Optional[List[int]] = Query(None, alias="category_ids[]"),
+    source_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    updated_since: Optional[datetime] = Query(None, description="только изменённые с этого момента (инкрементальная синхронизация)"),
+):
+    # без кэша ответов и без Depends(get_async_db): сессию держит сам поток выгрузки
+    service = ExportService(
+        format,
         category_ids=category_ids,
         source_id=source_id,
         date_from=date_from,
         date_to=date_to,
+        updated_since=updated_since,
     )
+    filename = f"news-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        service.chunks(),
+        media_type=service.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @router.get("/{news_id}", response_model=NewsOut)
-def get_news_by_id(news_id: int, db: Session = Depends(get_db)):
-    service = NewsService(db)
-    news = service.get(news_id)
+async def get_news_by_id(news_id: int, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncNewsService(db)
+    news = await service.get(news_id)
     if not news:
         raise HTTPException(status_code=404, detail="News not found")
     return news
\ No newline at end of file
@@ -0,0 +1,37 @@
+# src/api/usage.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime, timedelta
+
+from src.database.db import get_async_db
+from src.services.gpt_usage_service import AsyncGptUsageService
+from src.schemas.usage import UsageReport
+
+router = APIRouter(prefix="/usage", tags=["Usage"])
+
+
+@router.get("/", response_model=UsageReport)
+async def get_usage(
+    db: AsyncSession = Depends(get_async_db),
+    group_by: str = Query("source", pattern="^(source|operation|model|day|news)$"),
+    since: Optional[datetime] = Query(None, description="начало периода (UTC); по умолчанию — 7 суток назад"),
+    until: Optional[datetime] = Query(None, description="конец периода (UTC, не включительно)"),
+    operation: Optional[str] = Query(None, description="summarize / embedding / validate_cluster"),
+    source_id: Optional[int] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Расход токенов и стоимость OpenAI из журнала gpt_usage, плюс состояние дневного бюджета."""
+    since = since or datetime.utcnow() - timedelta(days=7)
+    service = AsyncGptUsageService(db)
+    rows = await service.aggregate(
+        group_by, since, until=until, operation=operation, source_id=source_id, limit=limit,
+    )
+    return {
+        "group_by": group_by,
+        "since": since,
+        "until": until,
+        "rows": rows,
+        "total_cost_usd": await service.total_cost(since, until=until, operation=operation, source_id=source_id),
+        "budget": await service.budget_status(),
+    }
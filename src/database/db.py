@@ -1,25 +1,199 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from src.models import news, source, category 
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from src.models import news, source, category
 from config import Config
+from src.utils.tracing import instrument_engine
+
+# Engine'ы создаются лениво, при первой сессии: парсер-воркеру не нужен Postgres,
+# API — синхронные драйверы, а форкнутый Celery-ребёнок не должен унаследовать
+# открытые родителем соединения.
+
+# Размер пула по роли процесса (APP_ROLE). Переопределяется DB_POOL_SIZE / DB_MAX_OVERFLOW.
+POOL_PROFILES = {
+    "api":        {"pool_size": 10, "max_overflow": 20},
+    "parser":     {"pool_size": 2,  "max_overflow": 2},
+    "summary":    {"pool_size": 2,  "max_overflow": 2},
+    "clustering": {"pool_size": 2,  "max_overflow": 1},
+}
+
+
+def _pool_kwargs(name: str) -> dict:
+    profile = POOL_PROFILES.get(Config.APP_ROLE, POOL_PROFILES["api"])
+    return {
+        "pool_size": Config.DB_POOL_SIZE or profile["pool_size"],
+        "max_overflow": Config.DB_MAX_OVERFLOW if Config.DB_MAX_OVERFLOW is not None else profile["max_overflow"],
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,  # MySQL рвёт простаивающие соединения (wait_timeout)
+        "pool_pre_ping": True,
+        "pool_logging_name": name,
+    }
+
+
+# ======== МЕТРИКИ ПУЛА ========
+_pool_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats(name: str) -> Dict[str, float]:
+    return _pool_stats.setdefault(name, {
+        "checkouts": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "connections_opened": 0,
+    })
+
+
+class _TimedPoolMixin:
+    """Замеряет ожидание свободного соединения в пуле (время внутри checkout)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with _stats_lock:
+                s = _stats(self.logging_name)
+                s["checkouts"] += 1
+                s["wait_seconds_total"] += waited
+                s["wait_seconds_max"] = max(s["wait_seconds_max"], waited)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _track_connections(sync_engine: Engine, name: str):
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        with _stats_lock:
+            _stats(name)["connections_opened"] += 1
+
+
+# ======== ENGINES ========
+_engines: Dict[str, object] = {}
+_engines_lock = threading.Lock()
+
+
+def _get_or_create(name: str, factory):
+    engine_ = _engines.get(name)
+    if engine_ is None:
+        with _engines_lock:
+            engine_ = _engines.get(name)
+            if engine_ is None:
+                engine_ = factory()
+                _track_connections(getattr(engine_, "sync_engine", engine_), name)
+                instrument_engine(getattr(engine_, "sync_engine", engine_), name)
+                _engines[name] = engine_
+    return engine_
+
+
+def get_engine() -> Engine:
+    return _get_or_create("mysql", lambda: create_engine(
+        Config.SQLALCHEMY_DATABASE_URI, echo=False, poolclass=TimedQueuePool, **_pool_kwargs("mysql"),
+    ))
 
-engine = create_engine(Config.SQLALCHEMY_DATABASE_URI, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine_pg() -> Engine:
+    return _get_or_create("postgres", lambda: create_engine(
+        Config.POSTGRES_URI, echo=False, poolclass=TimedQueuePool, **_pool_kwargs("postgres"),
+    ))
+
+
+# Тот же URI, другой драйвер: mysql+pymysql -> mysql+asyncmy, postgresql(+psycopg2) -> postgresql+asyncpg
+def _async_url(uri: str, drivername: str):
+    return make_url(uri).set(drivername=drivername)
+
+
+def get_async_engine() -> AsyncEngine:
+    return _get_or_create("mysql_async", lambda: create_async_engine(
+        _async_url(Config.SQLALCHEMY_DATABASE_URI, "mysql+asyncmy"),
+        echo=False, poolclass=TimedAsyncAdaptedQueuePool, **_pool_kwargs("mysql_async"),
+    ))
+
+
+def get_async_engine_pg() -> AsyncEngine:
+    return _get_or_create("postgres_async", lambda: create_async_engine(
+        _async_url(Config.POSTGRES_URI, "postgresql+asyncpg"),
+        echo=False, poolclass=TimedAsyncAdaptedQueuePool, **_pool_kwargs("postgres_async"),
+    ))
+
+
+def __getattr__(name: str):
+    # совместимость: `from src.database.db import engine` создаёт engine при обращении
+    if name == "engine":
+        return get_engine()
+    if name == "engine_pg":
+        return get_engine_pg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def dispose_engines():
+    """
+    Для Celery worker_process_init: соединения, унаследованные от родителя через fork,
+    выбрасываются без закрытия (их сокеты принадлежат родителю), пул наполнится заново.
+    """
+    for engine_ in list(_engines.values()):
+        if isinstance(engine_, Engine):
+            engine_.dispose(close=False)
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """Состояние пулов созданных engine'ов: размер, занято, overflow, ожидание checkout."""
+    result = {}
+    for name, engine_ in list(_engines.items()):
+        pool = getattr(engine_, "sync_engine", engine_).pool
+        with _stats_lock:
+            stats = dict(_stats(name))
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+        result[name] = stats
+    return result
+
+
+# ======== SESSIONS ========
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
         db.close()
 
 
-engine_pg = create_engine(Config.POSTGRES_URI, echo=False)
-SessionLocalPG = sessionmaker(autocommit=False, autoflush=False, bind=engine_pg)
+SessionLocalPG = sessionmaker(autocommit=False, autoflush=False)
 
 def get_db_pg():
-    db = SessionLocalPG()
+    db = SessionLocalPG(bind=get_engine_pg())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ======== ASYNC (FastAPI) ========
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
+AsyncSessionLocalPG = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+async def get_async_db_pg():
+    async with AsyncSessionLocalPG(bind=get_async_engine_pg()) as db:
+        yield db
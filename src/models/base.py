@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Table, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, timezone
 
@@ -9,6 +9,7 @@ news_categories = Table(
     Base.metadata,
     Column("news_id", Integer, ForeignKey("news.id"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    Index("ix_news_categories_category_news", "category_id", "news_id"),
 )
 
 
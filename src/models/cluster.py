@@ -1,5 +1,5 @@
 # src/models/cluster.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.models.base import Base  # именно Base, не BaseModel (см. news.py)
 
@@ -10,9 +10,17 @@ class NewsCluster(Base):
     created_at = Column(DateTime, nullable=False)
     label = Column(String(255), nullable=True)
     theme = Column(String(255), nullable=True)
+    # ведутся при сохранении кластера (sql/postgres/002_*.sql) — сортировка без GROUP BY
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_article_at = Column(DateTime, nullable=True)
 
     items = relationship("NewsClusterItem", back_populates="cluster")
 
+    __table_args__ = (
+        Index("ix_news_clusters_item_count", item_count.desc(), cluster_id.desc()),
+        Index("ix_news_clusters_last_article_at", last_article_at.desc()),
+    )
+
 
 class NewsClusterItem(Base):
     __tablename__ = "news_cluster_items"
@@ -21,4 +29,27 @@ class NewsClusterItem(Base):
     cluster_id = Column(Integer, ForeignKey("news_clusters.cluster_id"), nullable=False)
     news_id = Column(Integer, nullable=False)
 
+    # Денормализованная проекция статьи из MySQL (sql/postgres/001_*.sql):
+    # заполняется при сохранении кластера, для старых строк — при первом ?expand=news
+    title = Column(Text, nullable=True)
+    summary = Column(Text, nullable=True)
+    source_name = Column(String(255), nullable=True)
+    published_at = Column(DateTime, nullable=True)
+
     cluster = relationship("NewsCluster", back_populates="items")
+
+    __table_args__ = (
+        Index("ix_news_cluster_items_cluster_id", "cluster_id"),
+    )
+
+    @property
+    def news(self):
+        if self.title is None:
+            return None
+        return {
+            "id": self.news_id,
+            "title": self.title,
+            "summary": self.summary,
+            "source_name": self.source_name,
+            "published_at": self.published_at,
+        }
@@ -0,0 +1,32 @@
+# src/models/gpt_usage.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Numeric, String
+from src.models.base import Base  # без updated_at: строки журнала не меняются
+
+
+class GptUsage(Base):
+    """Журнал обращений к OpenAI: одна строка — один вызов (пишется пачками, см. gpt_usage_service)."""
+    __tablename__ = "gpt_usage"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, nullable=False)
+    operation = Column(String(32), nullable=False)   # summarize / embedding (статьи и поисковые запросы) / validate_cluster / image
+    model = Column(String(64), nullable=False)
+
+    # к чему относится вызов; без FK — журнал переживает удаление статей и не блокирует их
+    news_id = Column(Integer, nullable=True)
+    source_id = Column(Integer, nullable=True)
+    cluster_label = Column(String(255), nullable=True)  # префикс label кластеров: gpt_validated_<run_id>_<label>
+
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)  # попадания в prompt cache OpenAI
+    latency_ms = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Numeric(12, 6), nullable=False, default=0)
+    error = Column(String(64), nullable=True)  # тип исключения, если ответ получен, но не принят
+
+    __table_args__ = (
+        Index("ix_gpt_usage_created_at", "created_at"),
+        # «сколько стоила суммаризация Zakon за неделю»
+        Index("ix_gpt_usage_source_created_at", "source_id", "created_at"),
+        Index("ix_gpt_usage_news_id", "news_id"),
+    )
@@ -1,10 +1,24 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from src.models.base import BaseModel
 
 
 class News(BaseModel):
     __tablename__ = "news"
+    __table_args__ = (
+        # лента и очередь суммаризации: has_summary = ? + диапазон/сортировка по published_at
+        Index("ix_news_has_summary_published_at", "has_summary", "published_at"),
+        # то же с фильтром по источнику
+        Index("ix_news_source_summary_published_at", "source_id", "has_summary", "published_at"),
+        # инкрементальный экспорт (/news/export?updated_since=...): has_summary = 1 + range по updated_at
+        Index("ix_news_has_summary_updated_at", "has_summary", "updated_at", "id"),
+        # полнотекстовый поиск (/news/search) — MATCH должен перечислять ровно эти колонки
+        Index(
+            "ix_news_fulltext",
+            "title_ru", "title_kz", "title_en", "summary_ru", "summary_kz", "summary_en",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(255), nullable=False)
@@ -19,10 +33,12 @@ class News(BaseModel):
     summary_kz = Column(Text, nullable=True)
     summary_en = Column(Text, nullable=True)
 
-    has_summary = Column(Boolean, default=False)
+    has_summary = Column(Boolean, default=False, nullable=False, server_default=text("0"))
     image_url = Column(String(255), nullable=True)
 
     published_at = Column(DateTime, nullable=True)
+    # когда воркер суммаризации взял статью (сбрасывается при записи результата или ошибке)
+    summary_claimed_at = Column(DateTime, nullable=True)
 
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
 
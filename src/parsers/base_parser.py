@@ -2,14 +2,41 @@ from abc import ABC, abstractmethod
 from src.models.source import Source
 from src.services.news_service import NewsService
 import requests
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, List
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import logging
+import sqlite3
 import time
 
+from src.parsers.date_utils import RuDateParser
+from src.parsers.http_replay import install_http_mode
+from src.utils.metrics import ARTICLES_TOTAL, FETCH_SECONDS, FETCH_TOTAL
+from src.utils.raw_archive import get_raw_archive
+from src.utils.tracing import set_attributes, span, traced
+
+logger = logging.getLogger(__name__)
+
+
+
+class FetchError(RuntimeError):
+    """
+    Не удалось загрузить страницу. Если сервер ответил — status_code и
+    retry_after (сек, из заголовка Retry-After) заполнены: по ним планировщик
+    обхода решает, насколько отложить следующий запрос к источнику.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class BaseParser(ABC):
      # Статусы, при которых имеет смысл повторить запрос
     _RETRY_STATUS = {429, 500, 502, 503, 504}
+    # Дольше этого (сек) внутри одного запуска не ждём, даже если просит Retry-After
+    _MAX_RETRY_AFTER = 10.0
 
     # Базовые заголовки. Если в наследнике есть атрибут UA — он будет подставлен.
     _DEFAULT_HEADERS = {
@@ -21,9 +48,25 @@ class BaseParser(ABC):
         "Pragma": "no-cache",
     }
 
-    def __init__(self, source: Source, service: NewsService):
+    def __init__(
+        self,
+        source: Source,
+        service: NewsService,
+        on_new_news: Optional[Callable[[List[int]], None]] = None,
+        new_news_batch: int = 5,
+    ):
+        """
+        on_new_news — колбэк, получающий id только что сохранённых статей
+        пачками по new_news_batch (например, постановка задачи суммаризации).
+        Остаток пачки отдаётся в flush_new_news() после parse().
+        """
         self.source = source
         self.service = service
+        self._on_new_news = on_new_news
+        self._new_news_batch = new_news_batch
+        self._new_news_ids: List[int] = []
+        # метка источника в метриках
+        self.metric_source = getattr(source, "name", None) or getattr(source, "type", None) or "unknown"
 
          # Сессия для переиспользования TCP-соединений
         self._session = requests.Session()
@@ -32,12 +75,35 @@ class BaseParser(ABC):
         # Если у наследника определён UA (как в RSSParser.UA) — подставим его
         if hasattr(self, "UA") and isinstance(getattr(self, "UA"), str):
             self._session.headers["User-Agent"] = getattr(self, "UA")
+
+        # Даты с лент: якоря «сегодня/вчера» — на момент создания парсера (один прогон)
+        self.dates = RuDateParser()
+
+        # PARSER_HTTP_MODE=record|replay — запись/воспроизведение ответов из fixtures/parsers
+        self._http_adapter = install_http_mode(self._session, getattr(source, "type", None) or "default")
     
     @abstractmethod
     def parse(self):
         """Метод для парсинга новостей с портала."""
         pass
+
+    @classmethod
+    def extract_article(cls, html) -> Dict[str, str]:
+        """
+        Извлечение полей статьи из HTML её страницы ({"content": ...}).
+        Вынесено из parse(), чтобы reextract.py мог прогнать текущие селекторы
+        по архиву сырых страниц без сети.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not extract articles from HTML pages")
     
+    def is_known(self, url: str) -> bool:
+        """Статья уже в базе — карточка пропускается (и учитывается в метриках как skipped)."""
+        if self.service.get_by_url(url) is None:
+            return False
+        ARTICLES_TOTAL.labels(self.metric_source, "skipped").inc()
+        return True
+
+    @traced("parser.save_to_db")
     def save_to_db(self, news_data):
         """Сохранение данных в базу."""
         from src.models.news import News
@@ -49,61 +115,157 @@ class BaseParser(ABC):
             source_id=self.source.id
         )
         self.service.save(news)
+        ARTICLES_TOTAL.labels(self.metric_source, "saved").inc()
+
+        self._new_news_ids.append(news.id)
+        if len(self._new_news_ids) >= self._new_news_batch:
+            self.flush_new_news()
 
-    # ===== Новый метод =====
-    def fetch_html(
+    def flush_new_news(self):
+        """Отдаёт накопленные id новых статей в on_new_news."""
+        ids, self._new_news_ids = self._new_news_ids, []
+        if ids and self._on_new_news:
+            self._on_new_news(ids)
+
+    def fetch(
         self,
         url: str,
-        as_bytes: bool = False,
         *,
         timeout: float = 15.0,
         retries: int = 2,
         backoff: float = 0.6,
         extra_headers: Optional[Dict[str, str]] = None,
         allow_404: bool = False,
-    ) -> str:
+    ) -> requests.Response:
         """
-        Забирает HTML-документ по URL и возвращает как строку.
+        GET через общую сессию парсера с таймаутом и повторами.
         - timeout: таймаут одного запроса (сек)
         - retries: число повторных попыток при временных ошибках/429/5xx
         - backoff: экспоненциальная задержка между повторами (сек)
-        - extra_headers: доп. заголовки для конкретного запроса
-        - allow_404: если True, при 404 вернёт пустую строку вместо исключения
+        - extra_headers: доп. заголовки для конкретного запроса (в т.ч. If-None-Match
+          / If-Modified-Since — тогда ответ может быть 304 без тела)
+        - allow_404: если True, ответ 404 возвращается, а не бросается
+        При сетевой ошибке или HTTP >= 400 бросает FetchError (со status_code/retry_after).
         """
         headers = dict(self._session.headers)
         if extra_headers:
             headers.update(extra_headers)
 
-        last_exc: Optional[Exception] = None
+        with span("parser.fetch", source=self.metric_source, **{"url.full": url}) as s:
+            resp = self._fetch(url, headers, timeout, retries, backoff, allow_404)
+            set_attributes(s, **{"http.response.status_code": resp.status_code})
+            return resp
 
+    def _fetch(self, url, headers, timeout, retries, backoff, allow_404) -> requests.Response:
         for attempt in range(retries + 1):
+            started = time.perf_counter()
             try:
                 resp = self._session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-
-                if resp.status_code == 404 and allow_404:
-                    return ""
-
-                # Повтор при временных статусах
-                if resp.status_code in self._RETRY_STATUS and attempt < retries:
+            except requests.RequestException as e:
+                FETCH_TOTAL.labels(self.metric_source, "error").inc()
+                if attempt < retries:
                     time.sleep(backoff * (2 ** attempt))
                     continue
+                # На последней попытке — пробрасываем понятную ошибку
+                raise FetchError(f"Failed to fetch HTML from {url}: {e}") from e
 
-                resp = self._session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-                resp.raise_for_status()
+            FETCH_SECONDS.labels(self.metric_source).observe(time.perf_counter() - started)
+            FETCH_TOTAL.labels(self.metric_source, str(resp.status_code)).inc()
 
-                if as_bytes:
-                    return resp.content
+            if resp.status_code == 404 and allow_404:
+                return resp
 
-                # Корректируем кодировку, если сервер её не указал
-                if not resp.encoding:
-                    resp.encoding = resp.apparent_encoding or "utf-8"
+            retry_after = self._retry_after(resp)
 
-                return resp.text
+            # Повтор при временных статусах (долгий Retry-After не ждём — пусть планировщик отложит источник)
+            if resp.status_code in self._RETRY_STATUS and attempt < retries:
+                delay = backoff * (2 ** attempt)
+                if retry_after is not None:
+                    if retry_after > self._MAX_RETRY_AFTER:
+                        raise FetchError(
+                            f"Failed to fetch HTML from {url}: HTTP {resp.status_code}",
+                            status_code=resp.status_code,
+                            retry_after=retry_after,
+                        )
+                    delay = max(delay, retry_after)
+                time.sleep(delay)
+                continue
 
-            except requests.RequestException as e:
-                last_exc = e
-                if attempt < retries:
-                    time.sleep(backoff * (2 ** attempt))
-                    continue
-                # На последней попытке — пробрасываем понятную ошибку
-                raise RuntimeError(f"Failed to fetch HTML from {url}: {e}") from e
\ No newline at end of file
+            if resp.status_code >= 400:
+                raise FetchError(
+                    f"Failed to fetch HTML from {url}: HTTP {resp.status_code}",
+                    status_code=resp.status_code,
+                    retry_after=retry_after,
+                )
+
+            if resp.status_code != 304:
+                self._archive_response(url, resp)
+            return resp
+
+    def fetch_html(self, url: str, as_bytes: bool = False, *, allow_404: bool = False, **kwargs) -> str:
+        """
+        Забирает HTML-документ по URL и возвращает как строку (as_bytes — байты как есть).
+        Параметры запроса — как у fetch(); при allow_404 на 404 вернёт пустую строку.
+        """
+        resp = self.fetch(url, allow_404=allow_404, **kwargs)
+        if resp.status_code == 404:
+            return b"" if as_bytes else ""
+
+        if as_bytes:
+            return resp.content
+
+        # Корректируем кодировку, если сервер её не указал
+        if not resp.encoding:
+            resp.encoding = resp.apparent_encoding or "utf-8"
+
+        return resp.text
+
+    def fetch_article(self, url: str, as_bytes: bool = False, **kwargs) -> Optional[str]:
+        """
+        Страница статьи из ленты: как fetch_html(), но 4xx (кроме 429) — битая ссылка, а не беда
+        источника: статья пропускается (None), обход идёт дальше и планировщик источник не откладывает.
+        429, 5xx и сетевые ошибки пробрасываются — это повод отложить весь источник.
+        """
+        try:
+            return self.fetch_html(url, as_bytes=as_bytes, **kwargs)
+        except FetchError as e:
+            if e.status_code is None or e.status_code == 429 or e.status_code >= 500:
+                raise
+            ARTICLES_TOTAL.labels(self.metric_source, "unavailable").inc()
+            logger.warning(f"Skipping article {url}: HTTP {e.status_code}")
+            return None
+
+    def _archive_response(self, url: str, resp: requests.Response):
+        """Сырой ответ — в архив (если включён RAW_ARCHIVE_DIR); сбой архива парсинг не прерывает."""
+        archive = get_raw_archive()
+        if archive is None:
+            return
+        try:
+            archive.append(
+                url,
+                resp.content,
+                status=resp.status_code,
+                encoding=resp.encoding,
+                content_type=resp.headers.get("Content-Type"),
+                source_id=getattr(self.source, "id", None),
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Raw archive: failed to store {url} ({e})")
+
+    @staticmethod
+    def _retry_after(resp: requests.Response) -> Optional[float]:
+        """Retry-After в секундах (поддерживаются оба формата: число и HTTP-дата)."""
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,136 @@
+# src/parsers/date_utils.py
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+# Даты в лентах казахстанских сайтов — местное время Астаны (UTC+5), на выходе — UTC.
+# Поддерживаемые формы (ru и kk, порядок частей любой):
+#   'сегодня, 16:15' / '16:15, Сегодня' / 'вчера, 11:22' / 'бүгін, 09:00' / 'кеше 23:10'
+#   '13 августа 2025, 18:25' / '13:51, 15 Август 2025' / '12:00, 3 сент. 2025'
+#   '18:25, 13 августа' — год не указан: текущий, а если дата уходит в будущее — прошлый
+ASTANA = timezone(timedelta(hours=5))
+
+# Одна таблица месяцев: родительный и именительный падежи ru, казахские названия
+_RU_MONTHS = {
+    "января": 1, "январь": 1, "февраля": 2, "февраль": 2, "марта": 3, "март": 3,
+    "апреля": 4, "апрель": 4, "мая": 5, "май": 5, "июня": 6, "июнь": 6,
+    "июля": 7, "июль": 7, "августа": 8, "август": 8, "сентября": 9, "сентябрь": 9,
+    "октября": 10, "октябрь": 10, "ноября": 11, "ноябрь": 11, "декабря": 12, "декабрь": 12,
+}
+_KK_MONTHS = {
+    "қаңтар": 1, "ақпан": 2, "наурыз": 3, "сәуір": 4, "мамыр": 5, "маусым": 6,
+    "шілде": 7, "тамыз": 8, "қыркүйек": 9, "қазан": 10, "қараша": 11, "желтоқсан": 12,
+}
+MONTHS = {**_RU_MONTHS, **_KK_MONTHS}
+# Кандидат для непрямых форм — по первым трём буквам (они однозначны)
+_MONTH_PREFIXES = {name[:3]: month for name, month in MONTHS.items()}
+
+_RELATIVE = {"сегодня": 0, "бүгін": 0, "вчера": 1, "кеше": 1}
+
+_TIME_RE = re.compile(r"(?<!\d)(\d{1,2}):(\d{2})(?!\d)")
+_RELATIVE_RE = re.compile(r"\b(сегодня|вчера|бүгін|кеше)\b")
+_DATE_RE = re.compile(r"(?<![\d:])(\d{1,2})\s+([^\W\d_]{3,})\.?(?:\s+(\d{4}))?")
+
+# ё -> е, неразрывный пробел, латинская «c» вместо кириллической (встречается в 'cегодня')
+_NORMALIZE = str.maketrans({"ё": "е", "\xa0": " ", "c": "с"})
+
+
+def month_number(word: str) -> Optional[int]:
+    """Номер месяца по слову: полное название, сокращение ('сент', 'авг') или kk с окончанием ('тамызда')."""
+    word = word.lower().replace("ё", "е")
+    month = MONTHS.get(word)
+    if month or len(word) < 3:
+        return month
+    month = _MONTH_PREFIXES.get(word[:3])
+    if month is None:
+        return None
+    if any(name.startswith(word) for name, m in MONTHS.items() if m == month):
+        return month
+    if any(word.startswith(name) for name, m in _KK_MONTHS.items() if m == month):
+        return month
+    return None
+
+
+@dataclass(frozen=True)
+class DayAnchors:
+    """«Сегодня» и «вчера» по Астане — считаются один раз на прогон парсера."""
+    today: date
+
+    @property
+    def yesterday(self) -> date:
+        return self.today - timedelta(days=1)
+
+    @classmethod
+    def at(cls, now: Optional[datetime] = None) -> "DayAnchors":
+        now = now.astimezone(ASTANA) if now else datetime.now(ASTANA)
+        return cls(today=now.date())
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str, today: date) -> Optional[datetime]:
+    # today — часть ключа: после полуночи 'сегодня, 10:00' даёт уже другую дату
+    t = _TIME_RE.search(text)
+    if not t:
+        return None
+    hh, mm = int(t.group(1)), int(t.group(2))
+
+    rel = _RELATIVE_RE.search(text)
+    if rel:
+        day = today - timedelta(days=_RELATIVE[rel.group(1)])
+    else:
+        m = _DATE_RE.search(text)
+        if not m:
+            return None
+        month = month_number(m.group(2))
+        if not month:
+            return None
+        year = int(m.group(3)) if m.group(3) else today.year
+        try:
+            day = date(year, month, int(m.group(1)))
+        except ValueError:
+            return None
+        if not m.group(3) and day > today + timedelta(days=1):
+            # '31 декабря' на ленте 2 января — прошлый год
+            try:
+                day = day.replace(year=year - 1)
+            except ValueError:  # 29 февраля
+                return None
+
+    try:
+        local = datetime(day.year, day.month, day.day, hh, mm, tzinfo=ASTANA)
+    except ValueError:
+        return None
+    return local.astimezone(timezone.utc)
+
+
+def parse_ru_datetime(s: Optional[str], anchors: Optional[DayAnchors] = None) -> Optional[datetime]:
+    """Строка даты с ленты -> tz-aware UTC datetime или None, если формат не распознан."""
+    if not s:
+        return None
+    return _parse(s.strip().lower().translate(_NORMALIZE), (anchors or DayAnchors.at()).today)
+
+
+def parse_iso_utc(s: Optional[str]) -> Optional[datetime]:
+    """ISO 8601 (в т.ч. '2025-08-15T11:15:00.000Z') -> UTC; без зоны — считаем UTC."""
+    if not s:
+        return None
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class RuDateParser:
+    """
+    Разбор дат одного прогона парсера: якоря «сегодня/вчера» фиксируются при создании,
+    а не datetime.now() на каждую карточку; повторяющиеся строки берутся из кэша _parse.
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.anchors = DayAnchors.at(now)
+
+    def __call__(self, s: Optional[str]) -> Optional[datetime]:
+        return parse_ru_datetime(s, self.anchors)
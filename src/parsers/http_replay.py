@@ -0,0 +1,148 @@
+# src/parsers/http_replay.py
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Транспорт HTTP для парсеров (переменная окружения PARSER_HTTP_MODE):
+#   live   — обычные запросы (по умолчанию);
+#   record — запросы в сеть + ответ сохраняется в корпус фикстур;
+#   replay — только из корпуса, без сети; URL не из корпуса — ошибка соединения.
+# Корпус: <PARSER_FIXTURES_DIR>/<тип источника>/index.json + тела ответов файлами.
+HTTP_MODES = ("live", "record", "replay")
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "fixtures", "parsers")
+
+
+def http_mode() -> str:
+    mode = os.getenv("PARSER_HTTP_MODE", "live").lower()
+    if mode not in HTTP_MODES:
+        raise ValueError(f"PARSER_HTTP_MODE must be one of {HTTP_MODES}, got {mode!r}")
+    return mode
+
+
+def fixtures_dir() -> str:
+    return os.path.normpath(os.getenv("PARSER_FIXTURES_DIR") or DEFAULT_FIXTURES_DIR)
+
+
+class FixtureStore:
+    """Ответы одного источника: index.json (url -> метаданные) и файлы тел."""
+
+    def __init__(self, root: str, namespace: str):
+        self.path = os.path.join(root, namespace)
+        self._index_path = os.path.join(self.path, "index.json")
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict]] = None
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            try:
+                with open(self._index_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {}
+        return self._index
+
+    @staticmethod
+    def _filename(url: str, content_type: str) -> str:
+        ext = ".xml" if "xml" in (content_type or "") else ".html"
+        return hashlib.sha1(url.encode()).hexdigest()[:16] + ext
+
+    def get(self, url: str):
+        """(метаданные, тело) или None."""
+        meta = self.index.get(url)
+        if meta is None:
+            return None
+        with open(os.path.join(self.path, meta["file"]), "rb") as f:
+            return meta, f.read()
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        status: int = 200,
+        content_type: str = "text/html; charset=utf-8",
+        location: Optional[str] = None,
+    ):
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            filename = self._filename(url, content_type)
+            with open(os.path.join(self.path, filename), "wb") as f:
+                f.write(body)
+            self.index[url] = {"file": filename, "status": status, "content_type": content_type}
+            if location:  # редирект: сессия requests сама пойдёт по Location и при replay
+                self.index[url]["location"] = location
+            with open(self._index_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def _build_response(request: requests.PreparedRequest, meta: Dict, body: bytes) -> requests.Response:
+    status, content_type = meta["status"], meta["content_type"]
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(body))})
+    if meta.get("location"):
+        resp.headers["Location"] = meta["location"]
+    resp._content = body
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.url = request.url
+    resp.request = request
+    resp.reason = "OK" if status < 400 else "Replayed"
+    return resp
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Отдаёт ответы из корпуса; счётчик hits — для бенчмарков (страниц за прогон)."""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+        self.hits = 0
+
+    def send(self, request, **kwargs):
+        found = self.store.get(request.url)
+        if found is None:
+            raise requests.ConnectionError(f"No recorded fixture for {request.url} in {self.store.path}")
+        meta, body = found
+        self.hits += 1
+        return _build_response(request, meta, body)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Обычный транспорт, дополнительно сохраняющий успешные ответы в корпус."""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if resp.status_code < 400 and resp.status_code != 304:  # 304 без тела — не затираем записанный ответ
+            self.store.put(
+                request.url,
+                resp.content,
+                status=resp.status_code,
+                content_type=resp.headers.get("Content-Type", "text/html"),
+                location=resp.headers.get("Location") if resp.is_redirect else None,
+            )
+        return resp
+
+
+def install_http_mode(session: requests.Session, namespace: str) -> Optional[HTTPAdapter]:
+    """
+    Подключает к сессии транспорт по PARSER_HTTP_MODE.
+    namespace — подкаталог корпуса (тип источника). В режиме live ничего не меняет.
+    """
+    mode = http_mode()
+    if mode == "live":
+        return None
+    store = FixtureStore(fixtures_dir(), namespace)
+    adapter = ReplayAdapter(store) if mode == "replay" else RecordingAdapter(store)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
@@ -0,0 +1,30 @@
+# src/parsers/registry.py
+from importlib import import_module
+from typing import Dict, Optional, Type
+
+from src.models.source import SourceType
+
+# Парсер по типу источника — общий для Celery-задач и reextract.py. Здесь пути, а не классы:
+# модуль парсера (а с ним bs4 / feedparser) импортируется при первом get_parser, поэтому
+# воркеры суммаризации и кластеризации, импортируя tasks, парсеров не грузят
+PARSERS: Dict[SourceType, str] = {
+    SourceType.TENGRINEWS: "src.parsers.rss_parser.RSSParser",
+    SourceType.KAZINFORM: "src.parsers.kazinform_parser.KazinformParser",
+    SourceType.ZAKON: "src.parsers.zakon_parser.ZakonParser",
+    SourceType.NUR: "src.parsers.nur_parser.NurParser",
+    SourceType.INFORMBURO: "src.parsers.informburo_parser.InformburoParser",
+}
+
+_resolved: Dict[str, type] = {}
+
+
+def get_parser(source_type: SourceType) -> Optional[Type]:
+    """Класс парсера для типа источника; None — если парсера нет."""
+    path = PARSERS.get(source_type)
+    if path is None:
+        return None
+    parser_cls = _resolved.get(path)
+    if parser_cls is None:
+        module, name = path.rsplit(".", 1)
+        parser_cls = _resolved[path] = getattr(import_module(module), name)
+    return parser_cls
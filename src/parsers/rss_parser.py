@@ -1,15 +1,53 @@
 from src.parsers.base_parser import BaseParser
 
 import logging
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime, timezone
 import calendar
 import html
 from src.models.source import Source
 from src.services.news_service import NewsService
+from src.parsers.http_replay import http_mode
+from src.utils.redis_client import get_redis
 
 import feedparser
 from dateutil import parser as dateparse
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class FeedState:
+    """
+    Состояние фида между запусками — Redis-хэш rss:feed:<source_id>:
+    etag / last_modified — валидаторы для условного GET,
+    last_guid — самая свежая уже разобранная запись.
+    Redis недоступен — работаем как без состояния (весь фид, дедупликация по URL).
+    """
+
+    def __init__(self, source_id: int, redis=None):
+        self.key = f"rss:feed:{source_id}"
+        self.redis = redis or get_redis()
+
+    def load(self) -> Dict[str, str]:
+        try:
+            return self.redis.hgetall(self.key) or {}
+        except RedisError as e:
+            logger.warning(f"Feed state {self.key} unavailable: {e}")
+            return {}
+
+    def save(self, **fields: Optional[str]):
+        try:
+            pipe = self.redis.pipeline()
+            values = {k: v for k, v in fields.items() if v}
+            if values:
+                pipe.hset(self.key, mapping=values)
+            stale = [k for k, v in fields.items() if not v]
+            if stale:
+                pipe.hdel(self.key, *stale)  # сервер перестал отдавать валидатор — старый не шлём
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Feed state {self.key} not saved: {e}")
 
 
 class RSSParser(BaseParser):
@@ -17,34 +55,72 @@ class RSSParser(BaseParser):
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
     )
+    ACCEPT = "application/rss+xml, application/xml;q=0.9, */*;q=0.8"
+    # Сколько записей разбирать, пока для фида не известен last_guid (первый запуск)
+    FIRST_RUN_ENTRIES = 20
 
-    def __init__(self, source: Source, service: NewsService):
-        super().__init__(source, service)
+    def __init__(self, source: Source, service: NewsService, **kwargs):
+        super().__init__(source, service, **kwargs)
 
     def parse(self):
         """
         Парсер RSS для Tengrinews (и совместимых фидов).
+        Фид загружается общим fetch() (сессия, таймаут, повторы) условным GET:
+        304 — новых записей нет, разбор пропускается. Записи идут от новых
+        к старым и обрываются на last_guid прошлого запуска.
         На выход: [{title, content(html), url, published_at(UTC)}]
         """
-        d = feedparser.parse(
-            self.source.url,
-            agent=self.UA,
-            request_headers={
-                "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"
-            },
-        )
-
+        # record/replay — без состояния между запусками: фид разбирается целиком
+        state = FeedState(self.source.id) if http_mode() == "live" else None
+        known = state.load() if state else {}
+
+        headers = {"Accept": self.ACCEPT}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+
+        resp = self.fetch(self.source.url, extra_headers=headers)
+        if resp.status_code == 304:
+            logger.info(f"Feed {self.source.url} not modified, skipping")
+            return
+
+        # заголовки ответа — чтобы feedparser взял charset из Content-Type
+        d = feedparser.parse(resp.content, response_headers={k.lower(): v for k, v in resp.headers.items()})
         if getattr(d, "bozo", 0):
-            logging.warning("feedparser bozo: %s", getattr(d, "bozo_exception", None))
-
+            logger.warning(f"feedparser bozo: {getattr(d, 'bozo_exception', None)}")
 
-        for e in d.entries[:20]:
-            row = self._entry_to_row(e)
-            if self.service.get_by_url(row["url"]) is not None:
+        newest = None
+        for guid, row in self._new_entries(d.entries, known.get("last_guid")):
+            newest = newest or guid
+            if row is None or self.is_known(row["url"]):
                 continue
             self.save_to_db(row)
 
+        # только после успешного разбора: при падении следующий запуск перечитает фид
+        if state:
+            state.save(
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                last_guid=newest or known.get("last_guid"),
+            )
+
+    def _new_entries(self, entries: List, last_guid: Optional[str]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        (guid, строка) по записям фида до последней уже разобранной.
+        Если last_guid неизвестен — первые FIRST_RUN_ENTRIES; если он выпал из фида —
+        весь фид (уже сохранённое отсеет проверка по URL).
+        """
+        limit = None if last_guid else self.FIRST_RUN_ENTRIES
+        for i, e in enumerate(entries):
+            guid = self._guid(e)
+            if guid == last_guid or (limit is not None and i >= limit):
+                return
+            yield guid, self._entry_to_row(e)
 
+    @staticmethod
+    def _guid(e) -> str:
+        return (e.get("id") or e.get("link") or e.get("title") or "").strip()
 
     def _entry_to_row(self, e) -> Optional[Dict]:
         title = (e.get("title") or "").strip()
@@ -4,9 +4,18 @@ from datetime import datetime
 from typing import List, Optional
 
 
+class ClusterNewsOut(BaseModel):
+    id: int
+    title: str
+    summary: Optional[str] = None
+    source_name: Optional[str] = None
+    published_at: Optional[datetime] = None
+
+
 class ClusterItemOut(BaseModel):
     id: int
     news_id: int
+    news: Optional[ClusterNewsOut] = None  # только с ?expand=news
 
     class Config:
         from_attributes = True   # вместо orm_mode
@@ -17,6 +26,8 @@ class ClusterOut(BaseModel):
     created_at: datetime
     label: Optional[str] = None
     theme: Optional[str] = None
+    item_count: int = 0
+    last_article_at: Optional[datetime] = None
     items: List[ClusterItemOut] = []
 
     class Config:
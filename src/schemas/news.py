@@ -1,7 +1,7 @@
 # src/schemas/news.py
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 
 class CategoryOut(BaseModel):
@@ -45,8 +45,30 @@ class NewsOut(BaseModel):
 
 
 class PaginatedNews(BaseModel):
-    page: int
+    page: Optional[int] = None        # None в режиме cursor
     per_page: int
-    total: int
+    total: Optional[int] = None       # None, если include_total=false
     items: List[NewsOut]
     has_next: bool
+    next_cursor: Optional[str] = None  # передать в ?cursor= для следующей страницы
+
+
+class NewsSearchHit(NewsOut):
+    score: float                     # релевантность MATCH ... AGAINST
+    highlights: Dict[str, str] = {}  # поле -> фрагмент с <mark>…</mark> (HTML-экранирован)
+
+
+class NewsSearchResult(BaseModel):
+    page: int
+    per_page: int
+    items: List[NewsSearchHit]
+    has_next: bool
+
+
+class NewsSemanticHit(NewsOut):
+    score: float  # косинусная близость запроса и summary, 0..1
+
+
+class NewsSemanticResult(BaseModel):
+    query: str    # нормализованный запрос (по нему кэшируется эмбеддинг)
+    items: List[NewsSemanticHit]
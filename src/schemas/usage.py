@@ -0,0 +1,37 @@
+# src/schemas/usage.py
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class UsageRow(BaseModel):
+    # ключ группы — заполнены только поля выбранного group_by
+    source_id: Optional[int] = None
+    source_name: Optional[str] = None
+    operation: Optional[str] = None
+    model: Optional[str] = None
+    day: Optional[date] = None
+    news_id: Optional[int] = None
+
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost_usd: float
+    avg_latency_ms: Optional[float] = None
+    errors: int
+
+
+class BudgetStatus(BaseModel):
+    daily_budget_usd: Optional[float] = None   # None — бюджет не задан
+    spent_today_usd: Optional[float] = None    # None — Redis недоступен
+    state: Optional[str] = None                # ok / throttle / pause
+
+
+class UsageReport(BaseModel):
+    group_by: str
+    since: datetime
+    until: Optional[datetime] = None
+    rows: List[UsageRow]
+    total_cost_usd: float
+    budget: BudgetStatus
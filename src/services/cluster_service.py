@@ -1,26 +1,147 @@
 # src/services/cluster_service.py
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import bindparam, select, update
 from src.models.cluster import NewsCluster, NewsClusterItem
+from src.models.news import News
+from src.models.source import Source
+
+logger = logging.getLogger(__name__)
+
+
+# ======== ПРОЕКЦИЯ СТАТЕЙ (MySQL -> news_cluster_items) ========
+def news_projection_stmt(news_ids: Iterable[int]):
+    """Один SELECT ... IN по MySQL: всё, что кладётся в проекцию элемента кластера."""
+    return (
+        select(News.id, News.title, News.summary_ru, Source.name, News.published_at)
+        .outerjoin(Source, News.source_id == Source.id)
+        .where(News.id.in_(list(news_ids)))
+    )
+
+
+def projection_from_rows(rows) -> Dict[int, dict]:
+    return {
+        r[0]: {"title": r[1], "summary": r[2], "source_name": r[3], "published_at": r[4]}
+        for r in rows
+    }
+
+
+def _missing_projection(cluster: NewsCluster) -> List[NewsClusterItem]:
+    return [item for item in cluster.items if item.title is None]
+
+
+def _apply_projection(items: List[NewsClusterItem], projection: Dict[int, dict]) -> List[dict]:
+    """
+    Проставляет проекцию в загруженные объекты (без пометки dirty — сессию не коммитим,
+    иначе expire после commit вызвал бы ленивую подгрузку каждого элемента)
+    и возвращает параметры для executemany-UPDATE.
+    """
+    updates = []
+    for item in items:
+        values = projection.get(item.news_id)
+        if not values:  # статьи, удалённой из MySQL, нет — item.news останется None
+            continue
+        for key, value in values.items():
+            set_committed_value(item, key, value)
+        updates.append({"item_id": item.id, **values})
+    return updates
+
+
+_items = NewsClusterItem.__table__
+# SET-колонки берутся из ключей параметров executemany
+STORE_PROJECTION_SQL = update(_items).where(_items.c.id == bindparam("item_id"))
+
+
+def clusters_page_stmt(limit: int, offset: int = 0, hours: Optional[int] = None):
+    """
+    Топ кластеров по числу статей. item_count / last_article_at ведутся при записи
+    (run_clustering), поэтому без GROUP BY по news_cluster_items: индексный проход
+    ix_news_clusters_item_count или ix_news_clusters_last_article_at (для окна hours).
+    """
+    stmt = select(NewsCluster).options(selectinload(NewsCluster.items))
+    if hours is not None:
+        stmt = stmt.where(NewsCluster.last_article_at >= datetime.utcnow() - timedelta(hours=hours))
+    return (
+        stmt.order_by(NewsCluster.item_count.desc(), NewsCluster.cluster_id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+
 
 class ClusterService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all(self, limit: int = 20, offset: int = 0):
-        return (
-            self.db.query(NewsCluster)
-            .outerjoin(NewsClusterItem, NewsCluster.cluster_id == NewsClusterItem.cluster_id)
-            .group_by(NewsCluster.cluster_id)
-            .order_by(func.count(NewsClusterItem.id).desc())  # 👈 сортировка по числу новостей
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+    def get_all(self, limit: int = 20, offset: int = 0, hours: Optional[int] = None):
+        return self.db.execute(clusters_page_stmt(limit, offset, hours)).scalars().all()
 
     def get(self, cluster_id: int):
         return (
             self.db.query(NewsCluster)
+            .options(selectinload(NewsCluster.items))
             .filter_by(cluster_id=cluster_id)
             .first()
         )
+
+    def get_expanded(self, cluster_id: int, mysql_db: Session):
+        """
+        Кластер со статьями (item.news). Проекция уже лежит в news_cluster_items,
+        так что это те же 2 запроса к Postgres; элементы без проекции (сохранённые до неё)
+        догружаются одним IN-запросом к MySQL и записываются обратно.
+        """
+        cluster = self.get(cluster_id)
+        if not cluster:
+            return None
+        missing = _missing_projection(cluster)
+        if missing:
+            rows = mysql_db.execute(news_projection_stmt(i.news_id for i in missing)).all()
+            updates = _apply_projection(missing, projection_from_rows(rows))
+            if updates:
+                try:
+                    # отдельным соединением: проекция — кэш, транзакцию сессии не трогаем
+                    with self.db.get_bind().begin() as conn:
+                        conn.execute(STORE_PROJECTION_SQL, updates)
+                except SQLAlchemyError as e:
+                    logger.warning(f"Cluster {cluster_id}: failed to store news projection ({e})")
+        return cluster
+
+
+class AsyncClusterService:
+    """То же, что ClusterService, для async-роутов API (AsyncSession)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all(self, limit: int = 20, offset: int = 0, hours: Optional[int] = None):
+        return (await self.db.execute(clusters_page_stmt(limit, offset, hours))).scalars().all()
+
+    async def get(self, cluster_id: int):
+        stmt = (
+            select(NewsCluster)
+            .options(selectinload(NewsCluster.items))
+            .where(NewsCluster.cluster_id == cluster_id)
+        )
+        return (await self.db.execute(stmt)).scalars().first()
+
+    async def get_expanded(self, cluster_id: int, mysql_db: AsyncSession):
+        """См. ClusterService.get_expanded."""
+        cluster = await self.get(cluster_id)
+        if not cluster:
+            return None
+        missing = _missing_projection(cluster)
+        if missing:
+            rows = (await mysql_db.execute(news_projection_stmt(i.news_id for i in missing))).all()
+            updates = _apply_projection(missing, projection_from_rows(rows))
+            if updates:
+                try:
+                    async with self.db.bind.begin() as conn:
+                        await conn.execute(STORE_PROJECTION_SQL, updates)
+                except SQLAlchemyError as e:
+                    logger.warning(f"Cluster {cluster_id}: failed to store news projection ({e})")
+        return cluster
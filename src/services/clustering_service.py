@@ -1,14 +1,16 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import numpy as np
-import hdbscan
 from collections import Counter
 import json
 
 from src.services.gpt_service import GPTservice
+from src.services.cluster_service import news_projection_stmt, projection_from_rows
 from src.models.news import News
-from sqlalchemy import text
+from src.utils.metrics import CLUSTERING_FIT_SECONDS, gpt_call, timed
+from src.utils.profiling import profiled
+from src.utils.tracing import span
+from sqlalchemy import text, true
 
 
 class ClusteringService:
@@ -29,7 +31,7 @@ class ClusteringService:
         return (
             self.mysql_db.query(News)
             .filter(News.published_at >= cutoff)
-            .filter(News.has_summary.is_(True))
+            .filter(News.has_summary == true())
             .all()
         )
 
@@ -52,25 +54,36 @@ class ClusteringService:
         self.pg_db.commit()
         print(f"[OK] Embedding сохранён для news_id={news_id}")
 
-    def process_recent_news(self, hours: int = 24):
+    def process_recent_news(self, hours: int = 24) -> Dict[str, int]:
+        """
+        Считает эмбеддинги для свежих статей с summary.
+        :return: счётчики {"articles", "embedded", "skipped", "errors"}
+        """
         articles = self.fetch_recent_news(hours=hours)
+        counts = {"articles": len(articles), "embedded": 0, "skipped": 0, "errors": 0}
         for art in articles:
             try:
                 if self.embedding_exists(art.id):
                     print(f"[SKIP] Embedding уже существует для news_id={art.id}")
+                    counts["skipped"] += 1
                     continue
 
                 text_for_emb = art.summary_ru or art.title
-                embedding = self.gpt.get_embedding(text_for_emb)
+                embedding = self.gpt.get_embedding(text_for_emb, news_id=art.id, source_id=art.source_id)
                 self.save_embedding(art.id, art.title, text_for_emb, embedding)
+                counts["embedded"] += 1
 
             except Exception as e:
                 print(f"[ERR] news_id={art.id}: {e}")
+                counts["errors"] += 1
+        return counts
 
     # ============================
     #   КЛАСТЕРИЗАЦИЯ
     # ============================
     def fetch_embeddings_with_summaries(self, hours: int = 24):
+        import numpy as np  # numpy / hdbscan (numba, llvmlite) — только при кластеризации
+
         cutoff = datetime.utcnow() - timedelta(hours=hours)
         sql = text("""
             SELECT news_id, title, summary, embedding
@@ -97,7 +110,9 @@ class ClusteringService:
 
         return ids, np.vstack(vectors), articles_info
 
-    def validate_cluster_with_gpt(self, cluster_label: int, articles: List[Dict]) -> List[Dict]:
+    def validate_cluster_with_gpt(
+        self, cluster_label: int, articles: List[Dict], run_id: Optional[str] = None,
+    ) -> List[Dict]:
         """
         Отправляет один HDBSCAN-кластер в GPT,
         модель внутри может выделить несколько подтем.
@@ -137,11 +152,15 @@ class ClusteringService:
 """
 
         try:
-            response = self.gpt.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                max_completion_tokens=600
-            )
+            # в журнале — префикс label сохранённых из этого кандидата кластеров
+            ledger_label = f"gpt_validated_{run_id}_{cluster_label}" if run_id else str(cluster_label)
+            with gpt_call("validate_cluster", "gpt-4o-mini", cluster_label=ledger_label) as call:
+                response = self.gpt.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_completion_tokens=600
+                )
+                call.usage(response.usage)
             result_text = response.choices[0].message.content.strip()
 
             print(f"===== GPT RAW RESPONSE (cluster {cluster_label}) =====")
@@ -172,21 +191,51 @@ class ClusteringService:
             print(f"[WARN] Ошибка валидации кластера {cluster_label} через GPT: {e}")
             return []
 
-    def run_clustering(self, hours: int = 24, min_cluster_size: int = 3, min_samples: int = 2):
+    def run_exists(self, run_id: str) -> bool:
+        """Есть ли уже кластеры, сохранённые запуском run_id (для идемпотентности)."""
+        sql = text("SELECT 1 FROM news_clusters WHERE label LIKE :prefix LIMIT 1")
+        row = self.pg_db.execute(sql, {"prefix": f"gpt_validated_{run_id}_%"}).fetchone()
+        return row is not None
+
+    @profiled("run_clustering")
+    def run_clustering(
+        self,
+        hours: int = 24,
+        min_cluster_size: int = 3,
+        min_samples: int = 2,
+        run_id: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        HDBSCAN по эмбеддингам + GPT-валидация кластеров.
+        :param run_id: id запуска; попадает в label кластеров, повторный запуск
+                       с тем же run_id ничего не вставляет
+        :return: счётчики {"articles", "candidates", "noise", "saved_clusters", "saved_items"}
+        """
+        counts = {"articles": 0, "candidates": 0, "noise": 0, "saved_clusters": 0, "saved_items": 0}
+        if run_id is None:
+            run_id = datetime.now().strftime('%Y%m%d_%H%M')
+        elif self.run_exists(run_id):
+            print(f"⏭️ Кластеры запуска {run_id} уже сохранены, пропускаем")
+            return counts
+
         news_ids, vectors, articles_info = self.fetch_embeddings_with_summaries(hours=hours)
+        counts["articles"] = len(news_ids)
         if len(news_ids) < min_cluster_size:
             print(f"⚠️ Недостаточно статей для кластеризации ({len(news_ids)} < {min_cluster_size})")
-            return
+            return counts
 
         print(f"🔄 Начинаем кластеризацию {len(news_ids)} статей...")
 
+        import hdbscan
+
         clusterer = hdbscan.HDBSCAN(
             min_cluster_size=min_cluster_size,
             min_samples=min_samples,
             metric="euclidean",
             cluster_selection_epsilon=0.3
         )
-        labels = clusterer.fit_predict(vectors)
+        with timed(CLUSTERING_FIT_SECONDS), span("clustering.fit_predict", points=len(news_ids)):
+            labels = clusterer.fit_predict(vectors)
 
         cluster_articles, label_counts = {}, Counter(labels)
         for label in label_counts:
@@ -198,16 +247,17 @@ class ClusteringService:
                 cluster_articles[label] = cluster_arts
 
         noise_count = label_counts.get(-1, 0)
+        counts["candidates"], counts["noise"] = len(cluster_articles), noise_count
         print(f"📊 HDBSCAN результат: {len(cluster_articles)} кластеров для валидации, {noise_count} шумовых точек")
 
         if not cluster_articles:
             print("✅ Не найдено кластеров для валидации")
-            return
+            return counts
 
         saved_clusters = 0
         for label, articles in cluster_articles.items():
             print(f"🤖 Отправляем кластер {label} на валидацию в GPT...")
-            validated = self.validate_cluster_with_gpt(label, articles)
+            validated = self.validate_cluster_with_gpt(label, articles, run_id=run_id)
 
             if not validated:
                 print(f"⚠️ Кластер {label} не дал валидных подтем")
@@ -216,30 +266,42 @@ class ClusteringService:
             for idx, cluster_data in enumerate(validated):
                 article_ids, theme = cluster_data["article_ids"], cluster_data["theme"]
 
+                # проекция статей для GET /clusters/{id}?expand=news — одним IN-запросом к MySQL
+                projection = projection_from_rows(
+                    self.mysql_db.execute(news_projection_stmt(article_ids)).all()
+                )
+                published = [p["published_at"] for p in projection.values() if p["published_at"]]
+
                 insert_cluster_sql = text("""
-                    INSERT INTO news_clusters (label, theme)
-                    VALUES (:label, :theme)
+                    INSERT INTO news_clusters (label, theme, item_count, last_article_at)
+                    VALUES (:label, :theme, :item_count, COALESCE(:last_article_at, NOW()))
                     RETURNING cluster_id
                 """)
                 res = self.pg_db.execute(insert_cluster_sql, {
-                    "label": f"gpt_validated_{datetime.now().strftime('%Y%m%d_%H%M')}_{label}_{idx}",
-                    "theme": theme
+                    "label": f"gpt_validated_{run_id}_{label}_{idx}",
+                    "theme": theme,
+                    "item_count": len(article_ids),
+                    "last_article_at": max(published) if published else None,
                 })
                 cluster_id = res.scalar()
 
-                for news_id in article_ids:
-                    insert_item_sql = text("""
-                        INSERT INTO news_cluster_items (cluster_id, news_id)
-                        VALUES (:cluster_id, :news_id)
-                    """)
-                    self.pg_db.execute(insert_item_sql, {
-                        "cluster_id": cluster_id,
-                        "news_id": news_id
-                    })
+                empty = {"title": None, "summary": None, "source_name": None, "published_at": None}
+                insert_item_sql = text("""
+                    INSERT INTO news_cluster_items
+                        (cluster_id, news_id, title, summary, source_name, published_at)
+                    VALUES (:cluster_id, :news_id, :title, :summary, :source_name, :published_at)
+                """)
+                self.pg_db.execute(insert_item_sql, [
+                    {"cluster_id": cluster_id, "news_id": news_id, **projection.get(news_id, empty)}
+                    for news_id in article_ids
+                ])
 
                 print(f"✅ Сохранён кластер {cluster_id}: {len(article_ids)} статей")
                 print(f"   📝 Тема: {theme}")
                 saved_clusters += 1
+                counts["saved_items"] += len(article_ids)
 
         self.pg_db.commit()
+        counts["saved_clusters"] = saved_clusters
         print(f"🎯 Итого сохранено {saved_clusters} GPT-валидированных кластеров")
+        return counts
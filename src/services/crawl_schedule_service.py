@@ -0,0 +1,113 @@
+# src/services/crawl_schedule_service.py
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from config import Config
+from src.models.news import News
+from src.models.source import Source
+from src.utils.redis_client import get_redis
+
+
+class CrawlScheduleService:
+    """
+    Адаптивное расписание обхода источников.
+
+    Базовый интервал источника выводится из его темпа публикаций
+    (news.published_at за последние CRAWL_RATE_WINDOW_HOURS): среднее время между
+    статьями, зажатое в [CRAWL_MIN_INTERVAL, CRAWL_MAX_INTERVAL]. При ошибках интервал
+    растёт экспоненциально (с учётом Retry-After на 429), сверху — случайный jitter,
+    чтобы источники не синхронизировались.
+
+    Состояние хранится в Redis-хэше crawl:source:<id>:
+    next_at (unix ts), interval (сек), failures, last_status.
+    """
+
+    def __init__(self, db: Session, redis=None):
+        self.db = db
+        self.redis = redis or get_redis()
+
+    @staticmethod
+    def _key(source_id: int) -> str:
+        return f"crawl:source:{source_id}"
+
+    # ======== ТЕМП ПУБЛИКАЦИЙ ========
+    def publishing_interval(self, source_id: int) -> Optional[float]:
+        """Среднее время (сек) между публикациями источника за окно истории; None, если статей нет."""
+        window = timedelta(hours=Config.CRAWL_RATE_WINDOW_HOURS)
+        cutoff = datetime.utcnow() - window
+        stmt = (
+            select(func.count(News.id))
+            .where(News.source_id == source_id)
+            .where(News.published_at >= cutoff)
+        )
+        count = self.db.execute(stmt).scalar() or 0
+        if not count:
+            return None
+        return window.total_seconds() / count
+
+    def base_interval(self, source_id: int) -> float:
+        gap = self.publishing_interval(source_id)
+        if gap is None:
+            return float(Config.CRAWL_MAX_INTERVAL)
+        return float(min(max(gap, Config.CRAWL_MIN_INTERVAL), Config.CRAWL_MAX_INTERVAL))
+
+    @staticmethod
+    def _jitter(interval: float) -> float:
+        j = Config.CRAWL_JITTER
+        return interval * random.uniform(1 - j, 1 + j)
+
+    # ======== ПЛАНИРОВАНИЕ ========
+    def due_sources(self, sources: Iterable[Source], now: Optional[float] = None) -> List[Source]:
+        """Источники, у которых наступило время обхода (новые источники — сразу)."""
+        now = now or time.time()
+        sources = list(sources)
+        pipe = self.redis.pipeline()
+        for source in sources:
+            pipe.hget(self._key(source.id), "next_at")
+        next_ats = pipe.execute()
+        return [s for s, next_at in zip(sources, next_ats) if next_at is None or float(next_at) <= now]
+
+    def mark_dispatched(self, source_id: int, lease: int = Config.SOURCE_LOCK_TTL):
+        """Откладывает источник на время «аренды», пока задача обхода стоит в очереди."""
+        self.redis.hset(self._key(source_id), "next_at", time.time() + lease)
+
+    def record_success(self, source_id: int) -> float:
+        """Успешный обход: пересчитываем интервал по темпу публикаций, сбрасываем ошибки."""
+        interval = self._jitter(self.base_interval(source_id))
+        self.redis.hset(self._key(source_id), mapping={
+            "next_at": time.time() + interval,
+            "interval": round(interval, 1),
+            "failures": 0,
+            "last_status": "ok",
+        })
+        return interval
+
+    def record_failure(
+        self,
+        source_id: int,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> float:
+        """Ошибка обхода: экспоненциальный backoff от базового интервала, но не меньше Retry-After."""
+        key = self._key(source_id)
+        failures = int(self.redis.hincrby(key, "failures", 1))
+        base = self.redis.hget(key, "interval")
+        base = float(base) if base else float(Config.CRAWL_MIN_INTERVAL)
+
+        interval = min(base * (2 ** failures), Config.CRAWL_MAX_BACKOFF)
+        if retry_after is not None:
+            interval = max(interval, retry_after)
+        interval = self._jitter(interval)
+
+        self.redis.hset(key, mapping={
+            "next_at": time.time() + interval,
+            "last_status": str(status_code or "error"),
+        })
+        return interval
@@ -6,13 +6,16 @@ import time
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from openai import OpenAI
-from jsonschema import validate, ValidationError
+
+from config import Config
+from src.utils.metrics import gpt_call
+from src.utils.tracing import traced
 
 
 class GPTservice:
     def __init__(self, db: Optional[Session] = None, model: str = "gpt-4o-mini"):
         self.db = db
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=Config.OPENAI_BASE_URL)
         self.model = model
 
     def _categories_items_schema(self, available: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -27,6 +30,7 @@ class GPTservice:
         } if available else {"type": "object"}
         
 
+    @traced("gpt.summarize_and_categorize")
     def summarize_and_categorize(
         self,
         title_ru: str,
@@ -35,6 +39,8 @@ class GPTservice:
         *,
         max_tokens: int = 1200,
         temperature: float = 0.2,
+        news_id: Optional[int] = None,
+        source_id: Optional[int] = None,
     ) -> Dict[str, Any]:
         schema = {
             "type": "object",
@@ -112,37 +118,46 @@ class GPTservice:
             }
         }]
 
-        comp = self.client.chat.completions.create(
-            model=self.model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg},
-            ],
-            tools=tools,
-            tool_choice={"type": "function", "function": {"name": "news_multilang_summary"}},
-        )
+        # в метриках ошибок — и сбои API, и ответы, не прошедшие схему
+        with gpt_call("summarize", self.model, news_id=news_id, source_id=source_id) as call:
+            comp = self.client.chat.completions.create(
+                model=self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "system", "content": system_msg},
+                    {"role": "user", "content": user_msg},
+                ],
+                tools=tools,
+                tool_choice={"type": "function", "function": {"name": "news_multilang_summary"}},
+            )
+            call.usage(comp.usage)
 
-        tool_calls = comp.choices[0].message.tool_calls
-        if not tool_calls:
-            raise RuntimeError("Модель не вернула function-call с данными.")
-        args = tool_calls[0].function.arguments
-        result = json.loads(args)
+            tool_calls = comp.choices[0].message.tool_calls
+            if not tool_calls:
+                raise RuntimeError("Модель не вернула function-call с данными.")
+            args = tool_calls[0].function.arguments
+            result = json.loads(args)
+
+            from jsonschema import ValidationError, validate  # нужен только суммаризации
+
+            try:
+                validate(instance=result, schema=schema)
+            except ValidationError as e:
+                raise RuntimeError(f"Invalid GPT response: {e.message}")
 
-        try:
-            validate(instance=result, schema=schema)
-        except ValidationError as e:
-            raise RuntimeError(f"Invalid GPT response: {e.message}")
-        
         return result
     
     
     
+    @traced("gpt.get_embedding")
     def get_embedding(
         self, 
         text: str, 
-        model: str = "text-embedding-3-small"
+        model: str = "text-embedding-3-small",
+        *,
+        news_id: Optional[int] = None,
+        source_id: Optional[int] = None,
     ) -> List[float]:
         """
         Получает эмбеддинг для текста с помощью OpenAI API
@@ -150,15 +165,18 @@ class GPTservice:
         Args:
             text: Текст для получения эмбеддинга
             model: Модель для эмбеддинга (по умолчанию text-embedding-3-small)
+            news_id, source_id: статья и источник — для журнала расходов
             
         Returns:
             List[float]: Вектор эмбеддинга
         """
         try:
-            response = self.client.embeddings.create(
-                input=text,
-                model=model
-            )
+            with gpt_call("embedding", model, news_id=news_id, source_id=source_id) as call:
+                response = self.client.embeddings.create(
+                    input=text,
+                    model=model
+                )
+                call.usage(response.usage)
             return response.data[0].embedding
         except Exception as e:
             raise RuntimeError(f"Ошибка получения эмбеддинга: {str(e)}")
@@ -176,12 +194,13 @@ class GPTservice:
                 "Без текста и логотипов. Профессиональный фоторепортажный стиль, реалистичное освещение, "
                 "композиция как в редакционной фотографии, без надписей и водяных знаков."
             )
-            response = self.client.images.generate(
-                model="gpt-image-1",
-                prompt=prompt,
-                size=size,
-                quality="medium"
-            )
+            with gpt_call("image", "gpt-image-1"):
+                response = self.client.images.generate(
+                    model="gpt-image-1",
+                    prompt=prompt,
+                    size=size,
+                    quality="medium"
+                )
 
             image_base64 = response.data[0].b64_json
             image_data = base64.b64decode(image_base64)
@@ -0,0 +1,302 @@
+# src/services/gpt_usage_service.py
+import atexit
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import Config
+from src.models.gpt_usage import GptUsage
+from src.models.source import Source
+from src.utils.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# $ за 1M токенов (platform.openai.com/pricing); cached — входные токены из prompt cache.
+# Переопределяются GPT_PRICES (JSON той же формы)
+DEFAULT_PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-4o-mini": {"prompt": 0.15, "cached": 0.075, "completion": 0.60},
+    "gpt-4o": {"prompt": 2.50, "cached": 1.25, "completion": 10.00},
+    "text-embedding-3-small": {"prompt": 0.02},
+    "text-embedding-3-large": {"prompt": 0.13},
+}
+
+
+_unpriced = set()
+
+
+@lru_cache(maxsize=1)
+def prices() -> Dict[str, Dict[str, float]]:
+    overrides = json.loads(Config.GPT_PRICES) if Config.GPT_PRICES else {}
+    return {**DEFAULT_PRICES, **overrides}
+
+
+def cost_usd(model: str, prompt_tokens: int, completion_tokens: int = 0, cached_tokens: int = 0) -> float:
+    """Стоимость вызова по таблице цен; неизвестная модель — 0 (и предупреждение в лог)."""
+    price = prices().get(model)
+    if price is None:
+        if model not in _unpriced:
+            _unpriced.add(model)
+            logger.warning(f"GPT usage: no price for model {model}, cost recorded as 0")
+        return 0.0
+    prompt = price.get("prompt", 0.0)
+    return (
+        (prompt_tokens - cached_tokens) * prompt
+        + cached_tokens * price.get("cached", prompt)
+        + completion_tokens * price.get("completion", 0.0)
+    ) / 1_000_000
+
+
+def _spend_key(day: str) -> str:
+    return f"gpt:spend:{day}"
+
+
+# статьи, отложенные из-за исчерпанного бюджета: без TTL — ждут, сколько бы ни длилась пауза
+DEFERRED_KEY = "gpt:budget:deferred"
+
+
+def _today() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d")
+
+
+class GptUsageLedger:
+    """
+    Журнал расходов процесса: строки копятся в памяти и пишутся в gpt_usage одним INSERT —
+    по GPT_LEDGER_BATCH строк, не позже GPT_LEDGER_FLUSH_SECONDS после первой строки пачки
+    (таймер — для API, где вызовы редки и задач нет), после каждой Celery-задачи и при выходе процесса. Дневной расход сразу прибавляется
+    к Redis-счётчику gpt:spend:<дата> — по нему работает BudgetGuard во всех воркерах.
+    """
+
+    # если БД недоступна, строки ждут следующей попытки, но не больше стольких пачек
+    MAX_PENDING_BATCHES = 20
+
+    def __init__(self, batch: int, flush_seconds: float):
+        self.batch, self.flush_seconds = batch, flush_seconds
+        self._rows: List[Dict[str, Any]] = []
+        self._first_at: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        *,
+        operation: str,
+        model: str,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        news_id: Optional[int] = None,
+        source_id: Optional[int] = None,
+        cluster_label: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        cost = cost_usd(model, prompt_tokens, completion_tokens, cached_tokens)
+        row = {
+            "created_at": datetime.utcnow(),
+            "operation": operation,
+            "model": model,
+            "news_id": news_id,
+            "source_id": source_id,
+            "cluster_label": cluster_label,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "latency_ms": int(latency * 1000),
+            "cost_usd": round(cost, 6),
+            "error": error,
+        }
+        self._add_spend(cost)
+        with self._lock:
+            if not self._rows:
+                self._first_at = time.monotonic()
+                self._schedule()
+            self._rows.append(row)
+            due = len(self._rows) >= self.batch or time.monotonic() - self._first_at >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def _schedule(self):
+        # вызывается под self._lock, когда в пустой буфер пришла первая строка
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Timer(self.flush_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @staticmethod
+    def _add_spend(cost: float):
+        if cost <= 0:
+            return
+        key = _spend_key(_today())
+        try:
+            pipe = get_redis().pipeline()
+            pipe.incrbyfloat(key, cost)
+            pipe.expire(key, 3 * 24 * 3600)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"GPT usage: failed to update daily spend ({e})")
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows, self._first_at = self._rows, [], None
+        if not rows:
+            return
+        from src.database.db import SessionLocal, get_engine
+
+        db = SessionLocal(bind=get_engine())
+        try:
+            db.execute(insert(GptUsage), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"GPT usage: failed to write {len(rows)} ledger rows ({e})")
+            with self._lock:
+                self._rows = (rows + self._rows)[-self.batch * self.MAX_PENDING_BATCHES:]
+                self._first_at = self._first_at or time.monotonic()
+                self._schedule()
+        finally:
+            db.close()
+
+
+ledger = GptUsageLedger(Config.GPT_LEDGER_BATCH, Config.GPT_LEDGER_FLUSH_SECONDS)
+atexit.register(ledger.flush)
+
+
+class BudgetGuard:
+    """Дневной бюджет OpenAI: ok / throttle (с доли GPT_BUDGET_THROTTLE_AT) / pause (бюджет исчерпан)."""
+
+    OK, THROTTLE, PAUSE = "ok", "throttle", "pause"
+
+    def __init__(self, budget: Optional[float] = None, throttle_at: Optional[float] = None):
+        self.budget = Config.GPT_DAILY_BUDGET_USD if budget is None else budget
+        self.throttle_at = Config.GPT_BUDGET_THROTTLE_AT if throttle_at is None else throttle_at
+
+    def state_for(self, spent: float) -> str:
+        if self.budget <= 0 or spent < self.budget * self.throttle_at:
+            return self.OK
+        return self.PAUSE if spent >= self.budget else self.THROTTLE
+
+    def spent_today(self) -> float:
+        return float(get_redis().get(_spend_key(_today())) or 0)
+
+    def state(self) -> str:
+        if self.budget <= 0:
+            return self.OK
+        try:
+            return self.state_for(self.spent_today())
+        except RedisError as e:
+            # без счётчика не останавливаем суммаризацию — бюджет лишь страховка
+            logger.warning(f"GPT budget: Redis unavailable ({e}), not enforcing")
+            return self.OK
+
+    @staticmethod
+    def defer(news_ids: List[int]):
+        """
+        Запоминает статьи, которые не суммаризированы из-за паузы: догоняющий проход берёт
+        только последние сутки, а пауза (или возраст статьи) может оказаться длиннее.
+        """
+        if not news_ids:
+            return
+        try:
+            get_redis().sadd(DEFERRED_KEY, *news_ids)
+        except RedisError as e:
+            logger.error(f"GPT budget: failed to defer news {news_ids} ({e})")
+
+    @staticmethod
+    def pop_deferred(count: int) -> List[int]:
+        """Забирает до count отложенных статей (для постановки в очередь после паузы)."""
+        try:
+            return [int(i) for i in get_redis().spop(DEFERRED_KEY, count) or []]
+        except RedisError as e:
+            logger.warning(f"GPT budget: failed to read deferred news ({e})")
+            return []
+
+
+def _filtered(stmt, since: datetime, until: Optional[datetime], operation: Optional[str], source_id: Optional[int]):
+    stmt = stmt.where(GptUsage.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(GptUsage.created_at < until)
+    if operation:
+        stmt = stmt.where(GptUsage.operation == operation)
+    if source_id is not None:
+        stmt = stmt.where(GptUsage.source_id == source_id)
+    return stmt
+
+
+class AsyncGptUsageService:
+    """Сводки журнала расходов для API."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def aggregate(
+        self,
+        group_by: str,
+        since: datetime,
+        until: Optional[datetime] = None,
+        operation: Optional[str] = None,
+        source_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        cost = func.sum(GptUsage.cost_usd)
+        columns = {
+            "source": [GptUsage.source_id, Source.name.label("source_name")],
+            "operation": [GptUsage.operation],
+            "model": [GptUsage.model],
+            "day": [func.date(GptUsage.created_at).label("day")],
+            "news": [GptUsage.news_id, GptUsage.source_id],
+        }[group_by]
+        stmt = (
+            select(
+                *columns,
+                func.count().label("calls"),
+                func.coalesce(func.sum(GptUsage.prompt_tokens), 0).label("prompt_tokens"),
+                func.coalesce(func.sum(GptUsage.completion_tokens), 0).label("completion_tokens"),
+                func.coalesce(func.sum(GptUsage.cached_tokens), 0).label("cached_tokens"),
+                func.coalesce(cost, 0).label("cost_usd"),
+                func.avg(GptUsage.latency_ms).label("avg_latency_ms"),
+                func.count(GptUsage.error).label("errors"),
+            )
+            .group_by(*columns)
+            .limit(limit)
+        )
+        if group_by == "source":
+            stmt = stmt.outerjoin(Source, Source.id == GptUsage.source_id)
+        if group_by == "news":
+            stmt = stmt.where(GptUsage.news_id.is_not(None))
+        stmt = _filtered(stmt, since, until, operation, source_id)
+        stmt = stmt.order_by(columns[0] if group_by == "day" else cost.desc())
+
+        rows = await self.db.execute(stmt)
+        return [dict(r._mapping) for r in rows]
+
+    async def total_cost(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        operation: Optional[str] = None,
+        source_id: Optional[int] = None,
+    ) -> float:
+        stmt = _filtered(select(func.coalesce(func.sum(GptUsage.cost_usd), 0)), since, until, operation, source_id)
+        return float(await self.db.scalar(stmt))
+
+    @staticmethod
+    async def budget_status() -> Dict[str, Any]:
+        guard = BudgetGuard()
+        try:
+            spent = float(await get_async_redis().get(_spend_key(_today())) or 0)
+        except RedisError as e:
+            logger.warning(f"GPT budget: Redis unavailable ({e})")
+            spent = None
+        return {
+            "daily_budget_usd": guard.budget or None,
+            "spent_today_usd": spent,
+            "state": guard.state_for(spent) if spent is not None else None,
+        }
@@ -5,33 +5,38 @@ from ast import List
 from typing import Optional, Sequence, Dict, Any, Iterable, Tuple
 from datetime import datetime,timedelta
 
-from sqlalchemy import select, or_,exists
+from sqlalchemy import select, update, func, or_, and_, exists, true, false
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from config import Config
 from src.models.news import News
 from src.models.category import Category
+import base64
 import os
 import random
+import time
 
 import logging
+
+# Всё, что сериализует NewsOut: источник — JOIN'ом (many-to-one),
+# категории — одним SELECT ... IN на всю страницу. Без этого — 2 запроса на статью.
+NEWS_OUT_LOADERS = (
+    joinedload(News.source),
+    selectinload(News.categories),
+)
+
+
 class NewsService:
     def __init__(self, db: Session):
         self.db = db
-        self.image_files = [
-            "news_1759743147.png",
-            "news_1759743183.png",
-            "news_1759743285.png",
-            "news_1759743328.png",
-        ]
-        self.image_path = "/images/news/" 
 
     # ======== READ ========
     def get(self, news_id: int) -> Optional[News]:
-        news = self.db.get(News, news_id)
+        news = self.db.get(News, news_id, options=NEWS_OUT_LOADERS)
         if news:
-            # временно добавляем рандомное изображение
-            setattr(news, "image_url", self.image_path + random.choice(self.image_files))
+            attach_placeholder_image(news)
         return news
     
     def get_all(self) -> Iterable[News]:
@@ -41,18 +46,63 @@ class NewsService:
         stmt = select(News).where(News.url == url)
         return self.db.execute(stmt).scalar_one_or_none()
     
-    def get_pending_summaries(self) -> list[News]:
+    def _pending_summaries_stmt(self, news_ids: Optional[Iterable[int]] = None):
+        # "= false" (а не IS FALSE / IS NULL) — ref-доступ по ix_news_has_summary_published_at
+        stmt = select(News).where(News.has_summary == false())
+        if news_ids is not None:
+            # конкретные статьи (сразу после парсинга) — без окна по дате
+            return stmt.where(News.id.in_(list(news_ids)))
+
         now_utc = datetime.utcnow()
         one_day_ago = now_utc - timedelta(days=1)
+        return stmt.where(News.published_at >= one_day_ago)
+
+    def get_pending_summaries(self) -> list[News]:
+        return self.db.execute(self._pending_summaries_stmt()).scalars().all()
+
+    def get_pending_summary_ids(self) -> list[int]:
+        return self.db.execute(self._pending_summaries_stmt().with_only_columns(News.id)).scalars().all()
 
+    def claim_pending_summary(
+        self,
+        exclude_ids: Iterable[int] = (),
+        news_ids: Optional[Iterable[int]] = None,
+    ) -> Optional[News]:
+        """
+        Забирает одну статью без summary: в короткой транзакции (SELECT ... FOR UPDATE SKIP LOCKED)
+        ставит summary_claimed_at и сразу commit. Блокировки и соединение на время вызова GPT
+        не держатся — параллельные воркеры пропускают статью по отметке, пока она не старше
+        SUMMARY_CLAIM_TTL (воркер умер, не дописав).
+        Статья возвращается отсоединённой от сессии: обращение к её полям не открывает транзакцию.
+        exclude_ids — статьи, на которых этот воркер уже упал в текущем запуске.
+        news_ids — ограничить выбор этими статьями (иначе — всё за последние сутки).
+        """
+        stale = datetime.utcnow() - timedelta(seconds=Config.SUMMARY_CLAIM_TTL)
+        stmt = self._pending_summaries_stmt(news_ids).where(or_(
+            News.summary_claimed_at.is_(None),
+            News.summary_claimed_at < stale,
+        ))
+        if exclude_ids:
+            stmt = stmt.where(News.id.notin_(list(exclude_ids)))
         stmt = (
-            select(News)
-            .where(
-                or_(News.has_summary.is_(False), News.has_summary.is_(None))
-            )
-            .where(News.published_at >= one_day_ago)
+            stmt.order_by(News.published_at.desc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
         )
-        return self.db.execute(stmt).scalars().all()
+        news = self.db.execute(stmt).scalar_one_or_none()
+        if news is None:
+            self.db.rollback()
+            return None
+        news.summary_claimed_at = datetime.utcnow()
+        self.db.flush()
+        self.db.expunge(news)
+        self.db.commit()
+        return news
+
+    def release_summary_claim(self, news_id: int):
+        """Снимает отметку (после ошибки) — статью сможет взять другой запуск."""
+        self.db.execute(update(News).where(News.id == news_id).values(summary_claimed_at=None))
+        self.db.commit()
     
     def save(self, news: News) -> News:
         try:
@@ -72,39 +122,210 @@ class NewsService:
         source_id: Optional[int] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
     ) -> Dict[str, Any]:
-        query = self.db.query(News)
-
-        # ✅ только те, у кого есть summary
-        query = query.filter(News.has_summary.is_(True))
-
-        if category_ids:
-            query = query.filter(
-                News.categories.any(Category.id.in_(category_ids))
-            )
-        if source_id:
-            query = query.filter(News.source_id == source_id)
-        if date_from:
-            query = query.filter(News.published_at >= date_from)
-        if date_to:
-            query = query.filter(News.published_at <= date_to)
-
-
-        total = query.count()
-        items = (
-            query.order_by(News.published_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
+        """
+        Лента статей с summary, новые сверху (published_at DESC, id DESC).
+
+        Два режима:
+        - page/per_page — классический OFFSET;
+        - cursor — keyset-пагинация: следующая страница начинается строго после
+          (published_at, id) последней статьи предыдущей, стоимость не зависит от глубины.
+          next_cursor отдаётся в обоих режимах, так что клиент может перейти на курсоры
+          со второй страницы. Статьи без published_at идут в конце ленты, курсор доходит и до них.
+        with_total=False отключает подсчёт total (в режиме cursor он и так не нужен
+        для has_next); при with_total=True total берётся из кэша на NEWS_COUNT_CACHE_TTL сек.
+        """
+        stmt = listing_stmt(category_ids, source_id, date_from, date_to)
+
+        total = None
+        if with_total:
+            key = _count_key(category_ids, source_id, date_from, date_to)
+            total = _count_cache_get(key)
+            if total is None:
+                total = self.db.execute(count_stmt(stmt)).scalar_one()
+                _count_cache_put(key, total)
+
+        rows = self.db.execute(page_stmt(stmt, page, per_page, cursor)).scalars().all()
+        return page_result(rows, page, per_page, total, cursor)
+
+
+# ======== LISTING QUERY (общий для NewsService и AsyncNewsService) ========
+def listing_stmt(
+    category_ids: Optional[List[int]] = None,
+    source_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    return select(News).where(*listing_filters(category_ids, source_id, date_from, date_to))
+
+
+def listing_filters(
+    category_ids: Optional[List[int]] = None,
+    source_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> list:
+    """Условия WHERE ленты — общие для страниц, поиска и экспорта."""
+    # ✅ только те, у кого есть summary
+    conditions = [News.has_summary == true()]
+
+    if category_ids:
+        conditions.append(
+            News.categories.any(Category.id.in_(category_ids))
         )
+    if source_id:
+        conditions.append(News.source_id == source_id)
+    if date_from:
+        conditions.append(News.published_at >= date_from)
+    if date_to:
+        conditions.append(News.published_at <= date_to)
+    return conditions
+
+
+def count_stmt(stmt):
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def page_stmt(stmt, page: int, per_page: int, cursor: Optional[str] = None):
+    if cursor:
+        cursor_published_at, cursor_id = decode_cursor(cursor)
+        if cursor_published_at is None:
+            # курсор уже в хвосте статей без даты — дальше только они, по id
+            stmt = stmt.where(News.published_at.is_(None), News.id < cursor_id)
+        else:
+            # (published_at, id) < курсора; развёрнуто в OR — так MySQL строит range по индексу.
+            # Статьи без даты идут после всех датированных (NULL в DESC у MySQL — последним)
+            stmt = stmt.where(or_(
+                News.published_at < cursor_published_at,
+                and_(News.published_at == cursor_published_at, News.id < cursor_id),
+                News.published_at.is_(None),
+            ))
+        offset = 0
+    else:
+        offset = (page - 1) * per_page
+
+    # берём на одну статью больше — так has_next известен без COUNT
+    return (
+        stmt.options(*NEWS_OUT_LOADERS)
+        .order_by(News.published_at.desc(), News.id.desc())
+        .offset(offset)
+        .limit(per_page + 1)
+    )
+
+
+def page_result(rows, page: int, per_page: int, total: Optional[int], cursor: Optional[str]) -> Dict[str, Any]:
+    has_next = len(rows) > per_page
+    items = list(rows[:per_page])
+
+    next_cursor = encode_cursor(items[-1].published_at, items[-1].id) if has_next else None
+
+    for news in items:
+        attach_placeholder_image(news)
+    return {
+        "page": None if cursor else page,
+        "per_page": per_page,
+        "total": total,
+        "items": items,
+        "has_next": has_next,
+        "next_cursor": next_cursor,
+    }
+
+
+IMAGE_FILES = [
+    "news_1759743147.png",
+    "news_1759743183.png",
+    "news_1759743285.png",
+    "news_1759743328.png",
+]
+IMAGE_PATH = "/images/news/"
+
+
+def attach_placeholder_image(news: News):
+    # временно добавляем рандомное изображение
+    setattr(news, "image_url", IMAGE_PATH + random.choice(IMAGE_FILES))
+
+
+# ======== KEYSET CURSOR ========
+_NULL_PUBLISHED_AT = "null"
+
+
+def encode_cursor(published_at: Optional[datetime], news_id: int) -> str:
+    """Непрозрачный курсор: base64url("<published_at iso | null>|<id>")."""
+    stamp = published_at.isoformat() if published_at is not None else _NULL_PUBLISHED_AT
+    raw = f"{stamp}|{news_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published_at, news_id = raw.rsplit("|", 1)
+        if published_at == _NULL_PUBLISHED_AT:
+            return None, int(news_id)
+        return datetime.fromisoformat(published_at), int(news_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# ======== COUNT CACHE ========
+# total для ленты меняется только при записи summary, поэтому точный COUNT
+# на каждый запрос не нужен: кэшируем по фильтрам на несколько десятков секунд
+_count_cache: Dict[Tuple, Tuple[float, int]] = {}
+
+
+def _count_key(category_ids, source_id, date_from, date_to) -> Tuple:
+    return ("news", tuple(sorted(category_ids or ())), source_id, date_from, date_to)
+
+
+def _count_cache_get(key: Tuple) -> Optional[int]:
+    cached = _count_cache.get(key)
+    if cached and time.monotonic() - cached[0] < Config.NEWS_COUNT_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _count_cache_put(key: Tuple, total: int):
+    if len(_count_cache) > 1024:
+        _count_cache.clear()
+    _count_cache[key] = (time.monotonic(), total)
+
+
+class AsyncNewsService:
+    """Чтение статей для async-роутов API (AsyncSession); запросы те же, что у NewsService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ======== READ ========
+    async def get(self, news_id: int) -> Optional[News]:
+        news = await self.db.get(News, news_id, options=NEWS_OUT_LOADERS)
+        if news:
+            attach_placeholder_image(news)
+        return news
+
+    async def get_paginated(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        category_ids: Optional[List[int]] = None,
+        source_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+    ) -> Dict[str, Any]:
+        """См. NewsService.get_paginated."""
+        stmt = listing_stmt(category_ids, source_id, date_from, date_to)
 
+        total = None
+        if with_total:
+            key = _count_key(category_ids, source_id, date_from, date_to)
+            total = _count_cache_get(key)
+            if total is None:
+                total = (await self.db.execute(count_stmt(stmt))).scalar_one()
+                _count_cache_put(key, total)
 
-        for news in items:
-            setattr(news, "image_url", self.image_path + random.choice(self.image_files))
-        return {
-            "page": page,
-            "per_page": per_page,
-            "total": total,
-            "items": items,
-            "has_next": (page * per_page) < total
-        }
+        rows = (await self.db.execute(page_stmt(stmt, page, per_page, cursor))).scalars().all()
+        return page_result(rows, page, per_page, total, cursor)
@@ -0,0 +1,155 @@
+# src/services/search_service.py
+import html
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.models.news import News
+from src.services.news_service import NEWS_OUT_LOADERS, attach_placeholder_image, listing_stmt
+
+# Колонки FULLTEXT-индекса ix_news_fulltext (порядок и состав должны совпадать с индексом)
+SEARCH_FIELDS = ("title_ru", "title_kz", "title_en", "summary_ru", "summary_kz", "summary_en")
+
+MIN_TERM_LENGTH = 2  # = ngram_token_size: более короткие термы индекс не находит
+MAX_TERMS = 8
+SNIPPET_CHARS = 200
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(q: str) -> List[str]:
+    """Слова запроса без операторов boolean mode (+ - " * ~ ...), без повторов."""
+    terms = []
+    for word in _WORD_RE.findall(q.lower()):
+        if len(word) >= MIN_TERM_LENGTH and word not in terms:
+            terms.append(word)
+    return terms[:MAX_TERMS]
+
+
+def search_stmt(
+    terms: List[str],
+    category_ids: Optional[List[int]] = None,
+    source_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    Статьи, содержащие все термы (+"терм" — с ngram-парсером это фраза из n-грамм),
+    отсортированные по релевантности MATCH, затем по свежести.
+    Те же фильтры и условие has_summary, что у ленты.
+    """
+    against = " ".join(f'+"{term}"' for term in terms)
+    score = match(*(getattr(News, f) for f in SEARCH_FIELDS), against=against).in_boolean_mode()
+    return (
+        listing_stmt(category_ids, source_id, date_from, date_to)
+        .add_columns(score.label("score"))
+        .where(score)
+        .options(*NEWS_OUT_LOADERS)
+        .order_by(score.desc(), News.published_at.desc(), News.id.desc())
+    )
+
+
+def highlight(text: Optional[str], terms: List[str], window: Optional[int] = None) -> Optional[str]:
+    """
+    HTML-экранированный текст с <mark> вокруг термов; None, если термов в тексте нет.
+    window — обрезать до фрагмента такой длины вокруг первого совпадения.
+    """
+    if not text or not terms:
+        return None
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    prefix = suffix = ""
+    if window and len(text) > window:
+        start = max(0, first.start() - window // 3)
+        end = min(len(text), start + window)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        text = text[start:end]
+
+    parts, pos = [], 0
+    for m in pattern.finditer(text):
+        parts.append(html.escape(text[pos:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group())}</mark>")
+        pos = m.end()
+    parts.append(html.escape(text[pos:]))
+    return prefix + "".join(parts) + suffix
+
+
+def search_result(rows, terms: List[str], page: int, per_page: int) -> Dict[str, Any]:
+    has_next = len(rows) > per_page
+    items = []
+    for news, score in rows[:per_page]:
+        attach_placeholder_image(news)
+        highlights = {}
+        for field in SEARCH_FIELDS:
+            window = SNIPPET_CHARS if field.startswith("summary") else None
+            fragment = highlight(getattr(news, field), terms, window)
+            if fragment:
+                highlights[field] = fragment
+        setattr(news, "score", float(score or 0))
+        setattr(news, "highlights", highlights)
+        items.append(news)
+    return {"page": page, "per_page": per_page, "items": items, "has_next": has_next}
+
+
+def _page(stmt, page: int, per_page: int):
+    # на одну строку больше — has_next без COUNT по всем совпадениям
+    return stmt.offset((page - 1) * per_page).limit(per_page + 1)
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        q: str,
+        page: int = 1,
+        per_page: int = 10,
+        category_ids: Optional[List[int]] = None,
+        source_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Полнотекстовый поиск по заголовкам и summary на всех языках (индекс ix_news_fulltext).
+        :raises ValueError: в запросе нет ни одного слова длиной >= MIN_TERM_LENGTH
+        """
+        terms = search_terms(q)
+        if not terms:
+            raise ValueError(f"Search query must contain a word of at least {MIN_TERM_LENGTH} characters")
+        stmt = search_stmt(terms, category_ids, source_id, date_from, date_to)
+        rows = self.db.execute(_page(stmt, page, per_page)).all()
+        return search_result(rows, terms, page, per_page)
+
+
+class AsyncSearchService:
+    """То же, что SearchService, для async-роутов API (AsyncSession)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        q: str,
+        page: int = 1,
+        per_page: int = 10,
+        category_ids: Optional[List[int]] = None,
+        source_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """См. SearchService.search."""
+        terms = search_terms(q)
+        if not terms:
+            raise ValueError(f"Search query must contain a word of at least {MIN_TERM_LENGTH} characters")
+        stmt = search_stmt(terms, category_ids, source_id, date_from, date_to)
+        rows = (await self.db.execute(_page(stmt, page, per_page))).all()
+        return search_result(rows, terms, page, per_page)
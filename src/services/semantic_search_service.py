@@ -0,0 +1,136 @@
+# src/services/semantic_search_service.py
+import base64
+import hashlib
+import logging
+import re
+from array import array
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import select, text, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from config import Config
+from src.models.news import News
+from src.services.news_service import NEWS_OUT_LOADERS, attach_placeholder_image
+from src.utils.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"  # тем же считаются news_embeddings
+
+# HNSW-индекс ix_news_embeddings_embedding_hnsw (sql/postgres/003) — оператор <=> (cosine)
+ANN_SQL = text("""
+    SELECT news_id, embedding <=> CAST(CAST(:query AS text) AS vector) AS distance
+    FROM news_embeddings
+    ORDER BY embedding <=> CAST(CAST(:query AS text) AS vector)
+    LIMIT :limit
+""")
+
+_gpt = None
+
+
+def _get_gpt():
+    # клиент OpenAI один на процесс: GPTservice() создаёт новый HTTP-клиент
+    global _gpt
+    if _gpt is None:
+        from src.services.gpt_service import GPTservice
+        _gpt = GPTservice()
+    return _gpt
+
+
+def normalize_query(q: str) -> str:
+    return re.sub(r"\s+", " ", q).strip().lower()
+
+
+def _cache_key(query: str) -> str:
+    return f"semsearch:emb:{EMBEDDING_MODEL}:{hashlib.sha1(query.encode()).hexdigest()}"
+
+
+def _pack(vector: List[float]) -> str:
+    # float32 в base64: ~8 КБ на 1536 измерений вместо ~30 КБ JSON
+    return base64.b64encode(array("f", vector).tobytes()).decode()
+
+
+def _unpack(raw: str) -> List[float]:
+    vector = array("f")
+    vector.frombytes(base64.b64decode(raw))
+    return vector.tolist()
+
+
+def to_pgvector(vector: List[float]) -> str:
+    return "[" + ",".join(f"{x:.7g}" for x in vector) + "]"
+
+
+class SemanticSearchService:
+    """
+    Поиск статей по смыслу: эмбеддинг запроса -> ANN по news_embeddings (Postgres)
+    -> статьи одним запросом к MySQL в порядке близости.
+    """
+
+    def __init__(self, mysql_db: AsyncSession, pg_db: AsyncSession):
+        self.mysql_db = mysql_db
+        self.pg_db = pg_db
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Эмбеддинг запроса; повторные запросы берутся из Redis без обращения к OpenAI."""
+        key = _cache_key(query)
+        try:
+            cached = await get_async_redis().get(key)
+        except RedisError as e:
+            logger.warning(f"Semantic search: Redis unavailable ({e})")
+            cached = None
+        if cached:
+            return _unpack(cached)
+
+        # синхронный OpenAI-клиент — в пуле потоков, event loop не блокируем
+        vector = await run_in_threadpool(_get_gpt().get_embedding, query, EMBEDDING_MODEL)
+        try:
+            await get_async_redis().set(key, _pack(vector), ex=Config.SEMANTIC_QUERY_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"Semantic search: failed to cache query embedding ({e})")
+        return vector
+
+    async def nearest(self, vector: List[float], limit: int) -> List[tuple]:
+        """[(news_id, distance), ...] по возрастанию косинусного расстояния."""
+        # ef_search >= limit, иначе HNSW вернёт меньше limit строк
+        ef_search = max(Config.SEMANTIC_EF_SEARCH, limit)
+        await self.pg_db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        rows = await self.pg_db.execute(ANN_SQL, {"query": to_pgvector(vector), "limit": limit})
+        return [(r.news_id, float(r.distance)) for r in rows]
+
+    async def search(self, q: str, limit: int = 10, min_score: Optional[float] = None) -> Dict[str, Any]:
+        """
+        :param min_score: отбросить результаты с косинусной близостью (1 - distance) ниже порога
+        :raises ValueError: пустой запрос
+        """
+        query = normalize_query(q)
+        if not query:
+            raise ValueError("Search query is empty")
+
+        vector = await self.embed_query(query)
+        neighbours = await self.nearest(vector, limit)
+        scores = {news_id: 1.0 - distance for news_id, distance in neighbours}
+        if min_score is not None:
+            scores = {news_id: score for news_id, score in scores.items() if score >= min_score}
+
+        items = []
+        if scores:
+            stmt = (
+                select(News)
+                .options(*NEWS_OUT_LOADERS)
+                .where(News.id.in_(list(scores)))
+                .where(News.has_summary == true())
+            )
+            by_id = {news.id: news for news in (await self.mysql_db.execute(stmt)).scalars()}
+            # порядок — по близости из ANN, статьи, удалённые из MySQL, пропускаются
+            for news_id, score in scores.items():
+                news = by_id.get(news_id)
+                if news is None:
+                    continue
+                attach_placeholder_image(news)
+                setattr(news, "score", score)
+                items.append(news)
+
+        return {"query": query, "items": items}
@@ -0,0 +1,199 @@
+# src/utils/metrics.py
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from src.utils.tracing import set_attributes, span
+
+logger = logging.getLogger(__name__)
+
+# Метрики Prometheus: API отдаёт их на /metrics, Celery-воркер — своим HTTP-экспортером
+# (METRICS_WORKER_PORT). Если процессов несколько (uvicorn --workers, Celery prefork),
+# задайте PROMETHEUS_MULTIPROC_DIR — каждый процесс пишет значения в файлы каталога,
+# а при сборе они суммируются (MultiProcessCollector). Каталог очищается перед стартом.
+
+_LATENCY = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_LONG = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+
+# ======== ПАРСЕРЫ ========
+FETCH_SECONDS = Histogram(
+    "ainews_parser_fetch_seconds", "HTTP request latency of parser fetches", ["source"], buckets=_LATENCY,
+)
+FETCH_TOTAL = Counter(
+    "ainews_parser_fetch_total", "Parser HTTP requests by response status ('error' - no response)", ["source", "status"],
+)
+ARTICLES_TOTAL = Counter(
+    "ainews_parser_articles_total",
+    "Listing items by outcome: saved as new / skipped as already known / unavailable (article page 4xx)",
+    ["source", "result"],
+)
+PARSER_RUN_SECONDS = Histogram(
+    "ainews_parser_run_seconds", "Duration of one parser run over a source", ["source", "outcome"], buckets=_LONG,
+)
+
+# ======== GPT ========
+GPT_SECONDS = Histogram(
+    "ainews_gpt_request_seconds", "OpenAI call latency (SDK retries included)", ["operation"], buckets=_LATENCY,
+)
+GPT_TOKENS = Counter("ainews_gpt_tokens_total", "OpenAI tokens by operation", ["operation", "model", "kind"])
+GPT_ERRORS = Counter("ainews_gpt_errors_total", "Failed OpenAI calls by exception type", ["operation", "error"])
+SUMMARIES_TOTAL = Counter("ainews_summaries_total", "Summarization attempts by result", ["result"])
+
+# ======== КЛАСТЕРИЗАЦИЯ ========
+CLUSTERING_FIT_SECONDS = Histogram(
+    "ainews_clustering_fit_seconds", "HDBSCAN fit_predict duration", buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+CLUSTERING_LAST_RUN = Gauge(
+    "ainews_clustering_last_run", "Counters of the last clustering run (articles, candidates, noise, saved_*)",
+    ["kind"], multiprocess_mode="mostrecent",
+)
+CLUSTERS_SAVED = Counter("ainews_clusters_saved_total", "GPT-validated clusters saved")
+
+# ======== API И ЗАДАЧИ ========
+HTTP_SECONDS = Histogram(
+    "ainews_http_request_seconds", "API latency by route template", ["method", "route", "status"], buckets=_LATENCY,
+)
+TASK_SECONDS = Histogram("ainews_celery_task_seconds", "Celery task duration", ["task", "state"], buckets=_LONG)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        (histogram.labels(**labels) if labels else histogram).observe(time.perf_counter() - started)
+
+
+class _GptCall:
+    def __init__(self, operation: str, model: str, trace_span=None):
+        self.operation, self.model, self.span = operation, model, trace_span
+        self.tokens: Optional[Dict[str, int]] = None  # после usage() — в журнал расходов
+
+    def usage(self, usage):
+        """usage из ответа SDK (у эмбеддингов нет completion_tokens)."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.tokens = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", None) or 0,
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        }
+        for kind in ("prompt_tokens", "completion_tokens"):
+            count = self.tokens[kind]
+            if count:
+                GPT_TOKENS.labels(self.operation, self.model, kind.split("_")[0]).inc(count)
+                set_attributes(self.span, **{f"gen_ai.usage.{kind.split('_')[0]}_tokens": count})
+
+
+@contextmanager
+def gpt_call(operation: str, model: str, **refs) -> Iterator[_GptCall]:
+    """
+    Латентность и ошибки одного обращения к OpenAI (и спан openai.<operation>, если
+    включена трассировка); токены — через call.usage(resp.usage). Вызов с usage попадает
+    в журнал расходов gpt_usage вместе с refs (news_id, source_id, cluster_label).
+    """
+    started, error = time.perf_counter(), None
+    with span(f"openai.{operation}", kind="client", **{"gen_ai.request.model": model}) as trace_span:
+        call = _GptCall(operation, model, trace_span)
+        try:
+            yield call
+        except Exception as e:
+            error = type(e).__name__
+            GPT_ERRORS.labels(operation, error).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            GPT_SECONDS.labels(operation).observe(elapsed)
+            if call.tokens is not None:
+                _record_usage(call, elapsed, error, refs)
+
+
+def _record_usage(call: _GptCall, elapsed: float, error: Optional[str], refs: Dict):
+    # журнал — в БД и Redis; импорт здесь, чтобы метрики не тянули их парсерам
+    from src.services.gpt_usage_service import ledger
+
+    try:
+        ledger.record(operation=call.operation, model=call.model, latency=elapsed, error=error, **call.tokens, **refs)
+    except Exception as e:
+        logger.warning(f"GPT usage: failed to record {call.operation} call ({e})")
+
+
+def record_clustering_run(counts: Dict[str, int]):
+    for kind, value in counts.items():
+        CLUSTERING_LAST_RUN.labels(kind).set(value)
+    CLUSTERS_SAVED.inc(counts.get("saved_clusters", 0))
+
+
+# ======== ПУЛЫ БД ========
+class PoolCollector:
+    """pool_stats() на момент сбора: занятые соединения, overflow, ожидание checkout."""
+
+    def collect(self):
+        from src.database.db import pool_stats
+
+        families = {
+            "checked_out": GaugeMetricFamily("ainews_db_pool_checked_out", "Connections in use", labels=["pool"]),
+            "overflow": GaugeMetricFamily("ainews_db_pool_overflow", "Overflow connections", labels=["pool"]),
+            "size": GaugeMetricFamily("ainews_db_pool_size", "Configured pool size", labels=["pool"]),
+            "checkouts": GaugeMetricFamily("ainews_db_pool_checkouts", "Checkouts since start", labels=["pool"]),
+            "wait_seconds_total": GaugeMetricFamily(
+                "ainews_db_pool_wait_seconds", "Total time spent waiting for a connection", labels=["pool"],
+            ),
+        }
+        for pool, stats in pool_stats().items():
+            for key, family in families.items():
+                family.add_metric([pool], stats.get(key, 0))
+        return list(families.values())
+
+
+_pool_collector = PoolCollector()
+
+
+def _multiprocess() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def registry() -> CollectorRegistry:
+    if not _multiprocess():
+        return REGISTRY
+    reg = CollectorRegistry()
+    multiprocess.MultiProcessCollector(reg)
+    reg.register(_pool_collector)  # пулы — только этого процесса
+    return reg
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def start_exporter(port: int, addr: str = "0.0.0.0"):
+    """HTTP-экспортер для процессов без своего веб-сервера (Celery-воркер)."""
+    start_http_server(port, addr=addr, registry=registry())
+    logger.info(f"Prometheus exporter listening on {addr}:{port}")
+
+
+def mark_process_dead(pid: Optional[int] = None):
+    """Для завершившегося дочернего процесса: его live-gauge больше не учитываются."""
+    if _multiprocess():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+if not _multiprocess():
+    REGISTRY.register(_pool_collector)
@@ -0,0 +1,151 @@
+# src/utils/profiling.py
+import cProfile
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import FrozenSet, Iterator, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Профилирование медленных запусков. Включается:
+#   - для задач/методов с @profiled(name): PROFILE=crawl_source,summarize_news,run_clustering (или *)
+#     либо аргументом profile=True (crawl_source.delay(source_id, profile=True));
+#   - для роутов API: PROFILE_ROUTES=/news/search,/clusters/ (шаблоны роутов или *).
+# На запуск в PROFILE_DIR пишутся <name>-<время>-<pid>.*:
+#   .pstats    — cProfile (python -m pstats, snakeviz);
+#   .collapsed — стеки сэмплера «a;b;c N» (flamegraph.pl, speedscope);
+#   .mem.txt / .tracemalloc — прирост памяти по строкам и сам снимок (PROFILE_MEMORY=0 — без него).
+# Выключенное профилирование — одна проверка множества на вызов; middleware не подключается.
+
+_active = threading.Lock()  # cProfile и tracemalloc — одни на процесс, вложенные запуски не профилируем
+
+
+@lru_cache(maxsize=None)
+def _targets(spec: str) -> FrozenSet[str]:
+    return frozenset(part.strip() for part in spec.split(",") if part.strip())
+
+
+def _selected(name: str, spec: str) -> bool:
+    targets = _targets(spec)
+    return name in targets or "*" in targets
+
+
+class StackSampler(threading.Thread):
+    """Раз в interval снимает стек потока thread_id и считает одинаковые стеки (collapsed-формат)."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id, self.interval = thread_id, interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _write_memory(path: str, start: tracemalloc.Snapshot, end: tracemalloc.Snapshot, peak: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"peak traced: {peak / 2**20:.1f} MiB\n\n")
+        for stat in end.compare_to(start, "lineno")[:50]:
+            f.write(f"{stat}\n")
+
+
+@contextmanager
+def profile_run(name: str) -> Iterator[Optional[str]]:
+    """
+    Профилирует блок: cProfile + сэмплер стеков текущего потока + tracemalloc.
+    Отдаёт префикс путей артефактов; None — если уже идёт другой профилируемый запуск.
+    """
+    if not _active.acquire(blocking=False):
+        yield None
+        return
+    try:
+        os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", name).strip("_")
+        base = os.path.join(Config.PROFILE_DIR, f"{slug}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}")
+
+        memory = Config.PROFILE_MEMORY
+        own_tracemalloc = memory and not tracemalloc.is_tracing()
+        if own_tracemalloc:
+            tracemalloc.start(25)
+        mem_start = tracemalloc.take_snapshot() if memory else None
+        if memory:
+            tracemalloc.reset_peak()
+
+        sampler = StackSampler(threading.get_ident(), Config.PROFILE_INTERVAL_MS / 1000)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        sampler.start()
+        profiler.enable()
+        try:
+            yield base
+        finally:
+            profiler.disable()
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+
+            profiler.dump_stats(f"{base}.pstats")
+            with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+                for stack, count in sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            if memory:
+                mem_end = tracemalloc.take_snapshot()
+                _write_memory(f"{base}.mem.txt", mem_start, mem_end, tracemalloc.get_traced_memory()[1])
+                mem_end.dump(f"{base}.tracemalloc")
+                if own_tracemalloc:
+                    tracemalloc.stop()
+            logger.info(f"Profile of {name} ({elapsed:.1f}s, {sum(sampler.stacks.values())} samples) written to {base}.*")
+    finally:
+        _active.release()
+
+
+def profiled(name: str):
+    """
+    Декоратор задачи/метода: профилирует вызов, если name есть в PROFILE или передан profile=True
+    (аргумент снимается и в функцию не попадает).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, profile: bool = False, **kwargs):
+            if not (profile or _selected(name, Config.PROFILE)):
+                return func(*args, **kwargs)
+            with profile_run(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def profile_request(request, call_next):
+    """
+    HTTP-middleware для роутов из PROFILE_ROUTES. Роуты async, поэтому профилируется поток
+    event loop целиком — при параллельных запросах в профиль попадут и они.
+    """
+    from starlette.routing import Match
+
+    route = next((r.path for r in request.app.router.routes if r.matches(request.scope)[0] == Match.FULL), None)
+    if route is None or not _selected(route, Config.PROFILE_ROUTES):
+        return await call_next(request)
+    with profile_run(f"{request.method}-{route}"):
+        return await call_next(request)
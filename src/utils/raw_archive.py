@@ -0,0 +1,191 @@
+# src/utils/raw_archive.py
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from config import Config
+
+# Формат сегмента (по мотивам WARC): последовательность независимых gzip-членов,
+# каждый — одна загруженная страница:
+#   <JSON-заголовок>\n<тело ответа как есть, байты>
+# Такой файл читается целиком обычным `zcat`, а отдельная запись — seek на offset
+# и распаковка length байт. Индекс offset'ов по URL — в SQLite рядом с сегментами.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    source_id INTEGER,
+    fetched_at TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_records_url ON records (url, id);
+CREATE INDEX IF NOT EXISTS ix_records_source ON records (source_id, fetched_at);
+"""
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    fetched_at: str
+    status: int
+    encoding: Optional[str]
+    content_type: Optional[str]
+    body: bytes
+
+
+@dataclass
+class ArchiveRecord:
+    """Строка индекса: где лежит страница."""
+    url: str
+    segment: str
+    offset: int
+    length: int
+
+
+class RawArchive:
+    """
+    Append-only архив сырых ответов парсеров: сжатые сегменты + индекс по URL.
+    Каждый процесс пишет в свой сегмент (в имени pid), поэтому параллельные
+    воркеры не перемешивают записи; сегмент ротируется по segment_bytes.
+    """
+
+    def __init__(self, root: str, segment_bytes: int = 256 * 1024 * 1024):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._segment: Optional[str] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    # ======== ИНДЕКС ========
+    def _index(self) -> sqlite3.Connection:
+        # после fork соединение родителя не используем
+        if self._db is None or self._pid != os.getpid():
+            os.makedirs(self.root, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            self._pid, self._segment = os.getpid(), None
+        return self._db
+
+    # ======== ЗАПИСЬ ========
+    def _segment_path(self) -> str:
+        path = self._segment and os.path.join(self.root, self._segment)
+        if path is None or not os.path.exists(path) or os.path.getsize(path) >= self.segment_bytes:
+            day = datetime.now(timezone.utc).strftime("%Y%m%d")
+            stamp = datetime.now(timezone.utc).strftime("%H%M%S%f")
+            self._segment = os.path.join(day, f"{day}-{stamp}-{os.getpid()}.seg.gz")
+            os.makedirs(os.path.join(self.root, day), exist_ok=True)
+            path = os.path.join(self.root, self._segment)
+        return path
+
+    def append(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        status: int = 200,
+        encoding: Optional[str] = None,
+        content_type: Optional[str] = None,
+        source_id: Optional[int] = None,
+    ) -> ArchiveRecord:
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        header = json.dumps({
+            "url": url, "fetched_at": fetched_at, "status": status,
+            "encoding": encoding, "content_type": content_type, "source_id": source_id,
+        }, ensure_ascii=False).encode()
+        member = gzip.compress(header + b"\n" + body, compresslevel=6)
+
+        with self._lock:
+            db = self._index()
+            path = self._segment_path()
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            with db:
+                db.execute(
+                    "INSERT INTO records (url, source_id, fetched_at, status, segment, offset, length) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, source_id, fetched_at, status, self._segment, offset, len(member)),
+                )
+        return ArchiveRecord(url=url, segment=self._segment, offset=offset, length=len(member))
+
+    # ======== ЧТЕНИЕ ========
+    @staticmethod
+    def _decode(raw: bytes) -> ArchivedPage:
+        header, _, body = raw.partition(b"\n")
+        meta = json.loads(header)
+        return ArchivedPage(
+            url=meta["url"],
+            fetched_at=meta["fetched_at"],
+            status=meta["status"],
+            encoding=meta.get("encoding"),
+            content_type=meta.get("content_type"),
+            body=body,
+        )
+
+    def read(self, record: ArchiveRecord) -> ArchivedPage:
+        with open(os.path.join(self.root, record.segment), "rb") as f:
+            f.seek(record.offset)
+            return self._decode(gzip.decompress(f.read(record.length)))
+
+    def latest(self, url: str) -> Optional[ArchivedPage]:
+        row = self._index().execute(
+            "SELECT url, segment, offset, length FROM records WHERE url = ? ORDER BY id DESC LIMIT 1", (url,)
+        ).fetchone()
+        return self.read(ArchiveRecord(*row)) if row else None
+
+    def records(self, source_id: Optional[int] = None, since: Optional[datetime] = None) -> List[ArchiveRecord]:
+        """
+        Последняя версия каждого URL (успешные ответы), в порядке расположения на диске —
+        чтение по списку идёт последовательно по сегментам.
+        """
+        sql = (
+            "SELECT url, segment, offset, length FROM records WHERE id IN ("
+            " SELECT MAX(id) FROM records WHERE status < 400"
+        )
+        params: list = []
+        if source_id is not None:
+            sql += " AND source_id = ?"
+            params.append(source_id)
+        if since is not None:
+            sql += " AND fetched_at >= ?"
+            since = since.astimezone(timezone.utc) if since.tzinfo else since.replace(tzinfo=timezone.utc)
+            params.append(since.isoformat())
+        sql += " GROUP BY url) ORDER BY segment, offset"
+        return [ArchiveRecord(*row) for row in self._index().execute(sql, params)]
+
+    def iter_pages(self, records: List[ArchiveRecord]) -> Iterator[ArchivedPage]:
+        """Страницы по списку records; файл сегмента открывается один раз на серию записей."""
+        current, f = None, None
+        try:
+            for record in records:
+                if record.segment != current:
+                    if f:
+                        f.close()
+                    current, f = record.segment, open(os.path.join(self.root, record.segment), "rb")
+                f.seek(record.offset)
+                yield self._decode(gzip.decompress(f.read(record.length)))
+        finally:
+            if f:
+                f.close()
+
+
+_archive: Optional[RawArchive] = None
+
+
+def get_raw_archive() -> Optional[RawArchive]:
+    """Архив процесса или None, если RAW_ARCHIVE_DIR не задан (архивирование выключено)."""
+    global _archive
+    if _archive is None and Config.RAW_ARCHIVE_DIR:
+        _archive = RawArchive(Config.RAW_ARCHIVE_DIR, Config.RAW_ARCHIVE_SEGMENT_MB * 1024 * 1024)
+    return _archive
@@ -0,0 +1,26 @@
+# src/utils/redis_client.py
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from config import Config
+
+_client: Optional[redis.Redis] = None
+_async_client: Optional[redis.asyncio.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Общий Redis-клиент процесса (тот же Redis, что и брокер Celery)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(Config.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """Async-клиент для кода, работающего в event loop (роуты FastAPI)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.Redis.from_url(Config.REDIS_URL, decode_responses=True)
+    return _async_client
@@ -0,0 +1,61 @@
+# src/utils/redis_lock.py
+import functools
+import logging
+from contextlib import contextmanager
+from typing import Callable, Iterator, Union
+
+from redis.exceptions import LockError
+
+from src.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def redis_lock(name: str, ttl: int = 600) -> Iterator[bool]:
+    """
+    Неблокирующая распределённая блокировка в Redis (SET NX PX + снятие по токену).
+    Отдаёт True, если блокировку удалось взять, иначе False — вызывающий код
+    сам решает, пропустить работу или упасть.
+    ttl — страховка на случай, если процесс умер, не сняв блокировку.
+    """
+    lock = get_redis().lock(f"lock:{name}", timeout=ttl, blocking=False)
+    acquired = lock.acquire()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                # TTL истёк раньше, чем закончилась работа — блокировку мог взять другой
+                logger.warning(f"Lock {name} expired before release (ttl={ttl}s)")
+
+
+def single_flight(name: Union[str, Callable[..., str], None] = None, ttl: int = 600):
+    """
+    Декоратор для Celery-задач: пока одна копия задачи выполняется, остальные
+    (например, следующий тик beat) сразу выходят, вернув None.
+
+    name — имя блокировки: строка или функция от аргументов задачи
+    (для блокировок по ключу, например по source_id). По умолчанию — имя функции.
+
+        @app.task(queue="parsers")
+        @single_flight("run_all_parsers", ttl=1800)
+        def run_all_parsers(): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if callable(name):
+                lock_name = name(*args, **kwargs)
+            else:
+                lock_name = name or f"task:{func.__module__}.{func.__name__}"
+
+            with redis_lock(lock_name, ttl=ttl) as acquired:
+                if not acquired:
+                    logger.info(f"{lock_name} is already running, skipping")
+                    return None
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
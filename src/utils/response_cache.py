@@ -0,0 +1,143 @@
+# src/utils/response_cache.py
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from config import Config
+from src.utils.redis_client import get_async_redis, get_redis
+
+if TYPE_CHECKING:  # bump_version нужен и Celery-воркерам — fastapi им не грузим
+    from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    body: str
+    etag: str
+
+
+def _etag(body: str) -> str:
+    return '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+
+
+class ResponseCache:
+    """
+    Двухуровневый кэш готовых JSON-ответов API: LRU в памяти процесса поверх Redis.
+
+    Ключ = путь + нормализованные query-параметры + версия namespace ("news", "clusters").
+    Запись в БД (summary, кластеризация) вызывает bump_version(namespace): старые ключи
+    перестают читаться и сами истекают по TTL — удалять ничего не нужно.
+    Версию процесс перечитывает из Redis не чаще раза в version_ttl секунд.
+    Если Redis недоступен — работаем только с локальным уровнем (и БД).
+    """
+
+    def __init__(self, ttl: int, local_size: int = 256, version_ttl: float = 2.0):
+        self.ttl = ttl
+        self.local_size = local_size
+        self.version_ttl = version_ttl
+        self._local: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._versions: Dict[str, Tuple[float, str]] = {}
+
+    # ======== ВЕРСИИ ========
+    async def get_version(self, namespace: str) -> str:
+        now = time.monotonic()
+        cached = self._versions.get(namespace)
+        if cached and now - cached[0] < self.version_ttl:
+            return cached[1]
+        try:
+            version = await get_async_redis().get(f"cache:version:{namespace}") or "0"
+        except RedisError as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
+            version = cached[1] if cached else "0"
+        self._versions[namespace] = (now, version)
+        return version
+
+    async def key(self, namespace: str, request: "Request") -> str:
+        params = sorted((k, v) for k, v in request.query_params.multi_items() if v != "")
+        raw = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in params)
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        return f"cache:{namespace}:{await self.get_version(namespace)}:{digest}"
+
+    # ======== ЧТЕНИЕ / ЗАПИСЬ ========
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        local = self._local.get(key)
+        if local and local[0] > now:
+            self._local.move_to_end(key)
+            return local[1]
+
+        try:
+            body = await get_async_redis().get(key)
+        except RedisError as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
+            return None
+        if body is None:
+            return None
+        entry = CachedResponse(body=body, etag=_etag(body))
+        self._remember(key, entry)
+        return entry
+
+    async def set(self, key: str, body: str) -> CachedResponse:
+        entry = CachedResponse(body=body, etag=_etag(body))
+        self._remember(key, entry)
+        try:
+            await get_async_redis().set(key, body, ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Response cache: Redis unavailable ({e})")
+        return entry
+
+    def _remember(self, key: str, entry: CachedResponse):
+        self._local[key] = (time.monotonic() + self.ttl, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+
+response_cache = ResponseCache(ttl=Config.RESPONSE_CACHE_TTL, local_size=Config.RESPONSE_CACHE_LOCAL_SIZE)
+
+
+def bump_version(namespace: str):
+    """
+    Вызывается после commit'а, меняющего данные namespace (из Celery-задач, синхронно):
+    все его закэшированные ответы устаревают.
+    """
+    try:
+        get_redis().incr(f"cache:version:{namespace}")
+    except RedisError as e:
+        logger.warning(f"Response cache: failed to bump {namespace} version ({e})")
+
+
+async def cached_json_response(
+    request: "Request",
+    namespace: str,
+    produce: Callable[[], Awaitable[str]],
+) -> "Response":
+    """
+    Отдаёт JSON из кэша, а при промахе — результат await produce() (строка JSON), сохранив его.
+    Ставит ETag / Cache-Control и отвечает 304 на совпавший If-None-Match.
+    """
+    from fastapi import Response
+
+    key = await response_cache.key(namespace, request)
+    entry = await response_cache.get(key)
+    if entry is None:
+        entry = await response_cache.set(key, await produce())
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={Config.RESPONSE_CACHE_MAX_AGE}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip() for t in if_none_match.split(",")}
+        if "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=entry.body, media_type="application/json", headers=headers)
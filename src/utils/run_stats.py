@@ -0,0 +1,61 @@
+# src/utils/run_stats.py
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+from src.utils.redis_client import get_redis
+
+
+def make_run_id(interval_minutes: int, now: Optional[datetime] = None) -> str:
+    """
+    Идемпотентный id запуска: время, округлённое вниз до интервала расписания.
+    Повторная доставка той же задачи (ретрай, перезапуск воркера) получает тот же id.
+    """
+    now = now or datetime.now(timezone.utc)
+    minute = (now.hour * 60 + now.minute) // interval_minutes * interval_minutes
+    floored = now.replace(hour=minute // 60, minute=minute % 60, second=0, microsecond=0)
+    return floored.strftime("%Y%m%d_%H%M")
+
+
+class RunStats:
+    """
+    Статистика одного запуска пайплайна в Redis-хэше runs:<pipeline>:<run_id>:
+    для каждой стадии — статус, длительность (мс) и счётчики элементов.
+    """
+
+    TTL = 7 * 24 * 3600
+
+    def __init__(self, pipeline: str, run_id: str):
+        self.run_id = run_id
+        self.key = f"runs:{pipeline}:{run_id}"
+        self.redis = get_redis()
+
+    def is_done(self, stage: str) -> bool:
+        return self.redis.hget(self.key, f"{stage}.status") == "ok"
+
+    def get(self) -> Dict[str, str]:
+        return self.redis.hgetall(self.key)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        """
+        Замеряет стадию. Внутри блока заполняйте отданный словарь счётчиков:
+            with stats.stage("embeddings") as counts:
+                counts.update(service.process_recent_news())
+        """
+        counts: Dict[str, int] = {}
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield counts
+            status = "ok"
+        finally:
+            fields = {f"{name}.{k}": v for k, v in counts.items()}
+            fields[f"{name}.status"] = status
+            fields[f"{name}.duration_ms"] = int((time.perf_counter() - started) * 1000)
+            fields[f"{name}.finished_at"] = datetime.now(timezone.utc).isoformat()
+            pipe = self.redis.pipeline()
+            pipe.hset(self.key, mapping=fields)
+            pipe.expire(self.key, self.TTL)
+            pipe.execute()
@@ -0,0 +1,207 @@
+# src/utils/tracing.py
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config import Config
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # трассировка — опциональная зависимость
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# Трассировка OpenTelemetry — включается TRACING_EXPORTER и установленными пакетами
+# opentelemetry-api / -sdk (для otlp — ещё opentelemetry-exporter-otlp-proto-http):
+#   otlp    — локальный коллектор (OTEL_EXPORTER_OTLP_ENDPOINT, по умолчанию http://localhost:4318);
+#   file    — JSON-строки в TRACING_DIR/<service>-<pid>.jsonl, без внешних сервисов;
+#   console — в stdout.
+# Без них span() и остальное — пустые обёртки. Провайдер — свой на процесс (не глобальный
+# OpenTelemetry): после fork Celery-prefork ребёнок создаёт новый, со своим файлом и потоком.
+
+_lock = threading.Lock()
+_pid: Optional[int] = None
+_provider = None
+_tracer = None
+
+
+def tracing_enabled() -> bool:
+    return bool(Config.TRACING_EXPORTER) and trace is not None
+
+
+def _exporter(service: str):
+    kind = Config.TRACING_EXPORTER
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        os.makedirs(Config.TRACING_DIR, exist_ok=True)
+        out = open(os.path.join(Config.TRACING_DIR, f"{service}-{os.getpid()}.jsonl"), "a", encoding="utf-8")
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(f"TRACING_EXPORTER must be one of otlp / file / console, got {kind!r}")
+
+
+def _get_tracer():
+    global _pid, _provider, _tracer
+    if _pid == os.getpid():
+        return _tracer
+    with _lock:
+        if _pid != os.getpid():
+            _tracer = None
+            if tracing_enabled():
+                from opentelemetry.sdk.resources import Resource
+                from opentelemetry.sdk.trace import TracerProvider
+                from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+                service = f"ainews-{Config.APP_ROLE}"
+                _provider = TracerProvider(resource=Resource.create({"service.name": service}))
+                _provider.add_span_processor(BatchSpanProcessor(_exporter(service)))
+                _tracer = _provider.get_tracer("ainews")
+            elif Config.TRACING_EXPORTER:
+                logger.warning("TRACING_EXPORTER is set but opentelemetry is not installed, tracing disabled")
+            _pid = os.getpid()
+    return _tracer
+
+
+def shutdown_tracing():
+    """Дописать буфер спанов (перед выходом процесса)."""
+    if _provider is not None and _pid == os.getpid():
+        _provider.shutdown()
+
+
+def _attributes(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in values.items() if v is not None}
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes) -> Iterator[Any]:
+    """
+    Спан вокруг блока (kind: internal / client / server / consumer); исключение записывается
+    в спан и пробрасывается. Без трассировки отдаёт None.
+    """
+    tracer = _get_tracer()
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(name, kind=SpanKind[kind.upper()], attributes=_attributes(attributes)) as s:
+        yield s
+
+
+def traced(name: str):
+    """Декоратор: спан name на каждый вызов."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_attributes(s, **attributes):
+    if s is not None:
+        s.set_attributes(_attributes(attributes))
+
+
+# ======== CELERY: контекст через заголовки сообщений ========
+_task_spans: Dict[str, Tuple[Any, Any]] = {}
+
+
+def inject_headers(headers: Optional[Dict[str, Any]]):
+    """before_task_publish: traceparent/tracestate текущего спана — в заголовки сообщения."""
+    if headers is not None and _get_tracer() is not None:
+        propagate.inject(headers)
+
+
+def start_task_span(task, task_id: str):
+    """task_prerun: спан задачи — продолжение трейса того, кто её поставил."""
+    tracer = _get_tracer()
+    if tracer is None:
+        return
+    # заголовки сообщения Celery (протокол 2) доступны атрибутами task.request
+    carrier = {k: v for k in ("traceparent", "tracestate") if (v := getattr(task.request, k, None))}
+    s = tracer.start_span(
+        f"celery {task.name}",
+        context=propagate.extract(carrier),
+        kind=SpanKind.CONSUMER,
+        attributes=_attributes({"celery.task_id": task_id, "celery.queue": (task.request.delivery_info or {}).get("routing_key")}),
+    )
+    _task_spans[task_id] = (s, otel_context.attach(trace.set_span_in_context(s)))
+
+
+def end_task_span(task_id: str, state: Optional[str]):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    s, token = entry
+    s.set_attribute("celery.state", state or "UNKNOWN")
+    if state == "FAILURE":
+        s.set_status(Status(StatusCode.ERROR))
+    s.end()
+    otel_context.detach(token)
+
+
+# ======== FASTAPI ========
+async def trace_request(request, call_next):
+    """HTTP-middleware: серверный спан на запрос, контекст — из входящего traceparent."""
+    tracer = _get_tracer()
+    if tracer is None:
+        return await call_next(request)
+    with tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=propagate.extract(dict(request.headers)),
+        kind=SpanKind.SERVER,
+        attributes={"http.request.method": request.method, "url.path": request.url.path},
+    ) as s:
+        response = await call_next(request)
+        route = getattr(request.scope.get("route"), "path", None)
+        if route:
+            s.update_name(f"{request.method} {route}")
+            s.set_attribute("http.route", route)
+        s.set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            s.set_status(Status(StatusCode.ERROR))
+        return response
+
+
+# ======== SQLALCHEMY ========
+def instrument_engine(sync_engine, name: str):
+    """Спан на каждый SQL-запрос engine'а (db.system, текст запроса). Без трассировки — ничего."""
+    if not tracing_enabled():
+        return
+    from sqlalchemy import event
+
+    system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        tracer = _get_tracer()
+        if tracer is not None and context is not None:
+            context._trace_span = tracer.start_span(
+                f"db {name}", kind=SpanKind.CLIENT,
+                attributes={"db.system": system, "db.statement": statement[:1000], "db.executemany": executemany},
+            )
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        s = getattr(context, "_trace_span", None)
+        if s is not None:
+            s.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        s = getattr(exception_context.execution_context, "_trace_span", None)
+        if s is not None:
+            s.record_exception(exception_context.original_exception)
+            s.set_status(Status(StatusCode.ERROR))
+            s.end()
@@ -1,75 +1,204 @@
 import logging
+import time
+from typing import List, Optional
+from celery import chain
 from dotenv import load_dotenv
+from config import Config
 from src.models.category import Category
-from src.models.source import SourceType
-from src.parsers.informburo_parser import InformburoParser
-from src.parsers.kazinform_parser import KazinformParser
-from src.parsers.nur_parser import NurParser
-from src.parsers.zakon_parser import ZakonParser
+from src.models.news import News
+from src.parsers.registry import get_parser
 from celery_app import app
 from src.services.source_service import SourceService
-from src.parsers.rss_parser import RSSParser
 from src.services.news_service import NewsService
-from src.services.gpt_service import GPTservice
 from src.services.category_service import CategoryService
-from src.database.db import get_db
+from src.services.crawl_schedule_service import CrawlScheduleService
+from src.services.gpt_usage_service import BudgetGuard
+from src.database.db import get_db, get_db_pg
+from src.utils.redis_lock import redis_lock, single_flight
+from src.utils.run_stats import RunStats, make_run_id
+from src.utils.response_cache import bump_version
+from src.utils.metrics import PARSER_RUN_SECONDS, SUMMARIES_TOTAL, record_clustering_run
+from src.utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
+def _parse_source(source, newsService: NewsService) -> bool:
+    """Парсит один источник; False — если для его типа нет парсера."""
+    parser_cls = get_parser(source.source_type)
+    if parser_cls is None:
+        logger.warning(f"Unknown source type: {source.source_type}")
+        return False
+
+    parser = parser_cls(
+        source,
+        newsService,
+        on_new_news=_enqueue_summaries,
+        new_news_batch=Config.SUMMARY_ENQUEUE_BATCH,
+    )
+    started, outcome = time.perf_counter(), "error"
+    try:
+        parser.parse()
+        outcome = "ok"
+    finally:
+        # остаток пачки — в очередь, даже если парсинг упал на середине
+        parser.flush_new_news()
+        PARSER_RUN_SECONDS.labels(parser.metric_source, outcome).observe(time.perf_counter() - started)
+    return True
+
+
 @app.task(queue="parsers")
+@single_flight("run_all_parsers", ttl=Config.PARSERS_LOCK_TTL)
+@profiled("run_all_parsers")
 def run_all_parsers():
+    """Обход всех источников разом (ручной запуск; по расписанию — dispatch_due_sources)."""
     db = next(get_db())
     newsService = NewsService(db)
     sourceService = SourceService(db)
 
     sources = sourceService.get_all()
     for source in sources:
-        try:
-            if source.source_type == SourceType.TENGRINEWS:
-                parser = RSSParser(source, newsService)
-            elif source.source_type == SourceType.KAZINFORM:
-                parser = KazinformParser(source, newsService)
-            elif source.source_type == SourceType.ZAKON:
-                parser = ZakonParser(source, newsService)
-            elif source.source_type == SourceType.NUR:
-                parser = NurParser(source, newsService)
-            elif source.source_type == SourceType.INFORMBURO:
-                parser = InformburoParser(source, newsService)
-            else:
-                logger.warning(f"Unknown source type: {source.source_type}")
+        # Один источник — один парсер в момент времени, даже если запусков несколько
+        with redis_lock(f"parser:source:{source.id}", ttl=Config.SOURCE_LOCK_TTL) as acquired:
+            if not acquired:
+                logger.info(f"Source {source.name} is being parsed by another worker, skipping")
                 continue
+            try:
+                if _parse_source(source, newsService):
+                    logger.info(f"Parsed successfully: {source.name}")
+            except Exception as e:
+                logger.exception(f"Error while parsing source {source.name}: {e}")
+
+
+@app.task(queue="parsers")
+@single_flight("dispatch_due_sources", ttl=60)
+def dispatch_due_sources():
+    """Тик beat: ставит обход тех источников, у которых по адаптивному расписанию наступило время."""
+    db = next(get_db())
+    try:
+        schedule = CrawlScheduleService(db)
+        for source in schedule.due_sources(SourceService(db).get_all()):
+            schedule.mark_dispatched(source.id)
+            crawl_source.apply_async(args=[source.id], queue="parsers")
+    finally:
+        db.close()
+
+
+@app.task(queue="parsers")
+@profiled("crawl_source")  # снаружи single_flight: снимает profile= до имени блокировки
+@single_flight(lambda source_id: f"parser:source:{source_id}", ttl=Config.SOURCE_LOCK_TTL)
+def crawl_source(source_id: int):
+    from src.parsers.base_parser import FetchError
 
-            parser.parse()
-            logger.info(f"Parsed successfully: {source.name}")
+    db = next(get_db())
+    try:
+        source = SourceService(db).get(source_id)
+        if source is None:
+            logger.warning(f"Source {source_id} not found")
+            return
+
+        schedule = CrawlScheduleService(db)
+        try:
+            _parse_source(source, NewsService(db))
+        except FetchError as e:
+            delay = schedule.record_failure(source_id, e.status_code, e.retry_after)
+            logger.warning(f"Fetch failed for {source.name} ({e}), next crawl in {delay:.0f}s")
         except Exception as e:
-            logger.exception(f"Error while parsing source {source.name}: {e}")
+            delay = schedule.record_failure(source_id)
+            logger.exception(f"Error while parsing source {source.name}: {e}, next crawl in {delay:.0f}s")
+        else:
+            delay = schedule.record_success(source_id)
+            logger.info(f"Parsed successfully: {source.name}, next crawl in {delay:.0f}s")
+    finally:
+        db.close()
+
+
+def _enqueue_summaries(news_ids: List[int]):
+    """Ставит суммаризацию свежесохранённых статей, не дожидаясь beat."""
+    summarize_news.apply_async(args=[news_ids], queue="summaries")
+    logger.info(f"Queued summaries for news {news_ids}")
 
 
 @app.task(queue="summaries")
-def run_summary_generation():
+@profiled("summarize_news")
+def summarize_news(news_ids: List[int]):
+    """Суммаризация конкретных статей — ставится парсерами сразу после save_to_db."""
+    _generate_summaries(max_items=len(news_ids), news_ids=news_ids)
+
+
+@app.task(queue="summaries")
+@profiled("run_summary_generation")
+def run_summary_generation(max_items: int = Config.SUMMARY_BATCH_LIMIT):
+    """
+    Догоняющий проход по расписанию: подбирает статьи, которые не были
+    суммаризированы по событию от парсера (упавшие задачи, ручные вставки и т.п.),
+    и, если бюджет OpenAI позволяет, ставит отложенные на время паузы.
+    """
+    budget = BudgetGuard()
+    if budget.state() != BudgetGuard.PAUSE:
+        deferred = budget.pop_deferred(max_items)
+        for i in range(0, len(deferred), Config.SUMMARY_ENQUEUE_BATCH):
+            _enqueue_summaries(deferred[i:i + Config.SUMMARY_ENQUEUE_BATCH])
+    _generate_summaries(max_items=max_items)
+
+
+def _generate_summaries(max_items: int, news_ids: Optional[List[int]] = None):
+    """
+    Статьи забираются по одной отметкой summary_claimed_at (claim_pending_summary),
+    поэтому несколько воркеров (или событийные задачи и догоняющий проход)
+    делят работу, а не делают её дважды; транзакция на время вызова GPT не держится.
+    """
+    from src.services.gpt_service import GPTservice  # openai / jsonschema — только воркерам суммаризации
+
     load_dotenv()
     db = next(get_db())
     newsService = NewsService(db)
     gptService = GPTservice()
     categoryService = CategoryService(db)
+    budget = BudgetGuard()
 
     try:
-        pending_news = newsService.get_pending_summaries()
         categories = categoryService.get_all()
         available_categories = [c.to_dict() for c in categories]
 
-        if not pending_news:
-            logger.info("No news items pending summary generation.")
-            return
+        processed, failed_ids, paused = 0, [], False
+        done_ids = []
+        unbumped, last_bump = 0, time.monotonic()
+        while processed + len(failed_ids) < max_items:
+            # Дневной бюджет OpenAI: у порога — медленнее, сверх бюджета — оставшиеся статьи
+            # откладываются, после паузы их поставит догоняющий проход
+            state = budget.state()
+            if state == BudgetGuard.PAUSE:
+                paused = True
+                if news_ids is not None:
+                    rest = [i for i in news_ids if i not in done_ids and i not in failed_ids]
+                else:
+                    rest = newsService.get_pending_summary_ids()
+                budget.defer(rest)
+                logger.warning(
+                    f"Daily GPT budget ${budget.budget:.2f} exhausted, summarization paused ({len(rest)} news deferred)"
+                )
+                break
+            if state == BudgetGuard.THROTTLE and (processed or failed_ids):
+                time.sleep(Config.GPT_BUDGET_THROTTLE_DELAY)
 
-        for n in pending_news:
+            claimed = newsService.claim_pending_summary(exclude_ids=failed_ids, news_ids=news_ids)
+            if claimed is None:
+                break
+
+            news_id = claimed.id
             try:
+                # вызов GPT — вне транзакции: статья лишь помечена summary_claimed_at
                 result = gptService.summarize_and_categorize(
-                    n.title,
-                    n.content,
-                    available_categories
+                    claimed.title,
+                    claimed.content,
+                    available_categories,
+                    news_id=news_id,
+                    source_id=claimed.source_id,
                 )
 
+                # результат — второй короткой транзакцией
+                n = db.get(News, news_id)
+
                 # Заголовки
                 n.title_en = result["titles"]["en"]
                 n.title_ru = result["titles"]["ru"]
@@ -86,6 +215,7 @@ def run_summary_generation():
 
                 n.categories = selected_cats
                 n.has_summary = True
+                n.summary_claimed_at = None
 
                 # try:
                 #     image_url = gptService.generate_image(
@@ -97,11 +227,138 @@ def run_summary_generation():
                 #     logger.warning(f"⚠️ Image generation failed for news {n.id}: {img_err}")
 
                 db.commit()
-                logger.info(f"Updated summary for news {n.id}: {n.title_en}")
+                processed += 1
+                done_ids.append(news_id)
+                unbumped += 1
+                SUMMARIES_TOTAL.labels("processed").inc()
+                # заголовок — из ответа: n после commit истёк, и чтение открыло бы транзакцию
+                logger.info(f"Updated summary for news {news_id}: {result['titles']['en']}")
+
+                # новые статьи в ленте — закэшированные ответы /news устарели; в длинном
+                # проходе сбрасываем по ходу, а не только в конце
+                if time.monotonic() - last_bump >= Config.SUMMARY_CACHE_BUMP_SECONDS:
+                    bump_version("news")
+                    unbumped, last_bump = 0, time.monotonic()
             except Exception as inner_e:
                 db.rollback()
-                logger.exception(f"Error processing news {n.id}: {inner_e}")
+                newsService.release_summary_claim(news_id)
+                failed_ids.append(news_id)
+                SUMMARIES_TOTAL.labels("failed").inc()
+                logger.exception(f"Error processing news {news_id}: {inner_e}")
+
+        if not processed and not failed_ids:
+            if not paused:
+                logger.info("No news items pending summary generation.")
+            return
 
-        logger.info(f"Generated summaries for {len(pending_news)} news items.")
+        if unbumped:
+            bump_version("news")
+
+        logger.info(f"Generated summaries for {processed} news items ({len(failed_ids)} failed).")
     except Exception as e:
         logger.exception(f"Error during summary generation: {e}")
+    finally:
+        db.close()
+
+
+# ============================
+#   КЛАСТЕРИЗАЦИЯ
+# ============================
+CLUSTERING_HOURS = 72
+CLUSTERING_MIN_CLUSTER_SIZE = 5
+CLUSTERING_MIN_SAMPLES = 3
+
+
+@app.task(queue="clustering")
+def run_clustering_pipeline(run_id: Optional[str] = None):
+    """Точка входа для beat: эмбеддинги -> кластеризация одной цепочкой."""
+    run_id = run_id or make_run_id(Config.CLUSTERING_INTERVAL_MINUTES)
+    chain(
+        process_recent_news.s(run_id).set(queue="clustering"),
+        run_clustering.s().set(queue="clustering"),
+    ).apply_async()
+    logger.info(f"Clustering pipeline {run_id} queued")
+    return run_id
+
+
+@app.task(queue="clustering")
+@single_flight("clustering", ttl=Config.CLUSTERING_LOCK_TTL)
+def process_recent_news(run_id: str, hours: int = CLUSTERING_HOURS) -> Optional[str]:
+    # Если блокировку держит другой запуск, single_flight вернёт None —
+    # и следующая стадия цепочки ничего не сделает (этот запуск отменён целиком).
+    load_dotenv()
+    stats = RunStats("clustering", run_id)
+    if stats.is_done("embeddings"):
+        logger.info(f"[{run_id}] Embeddings stage already done, skipping")
+        return run_id
+
+    from src.services.clustering_service import ClusteringService
+
+    mysql_db = next(get_db())
+    pg_db = next(get_db_pg())
+    try:
+        service = ClusteringService(mysql_db, pg_db)
+        with stats.stage("embeddings") as counts:
+            counts.update(service.process_recent_news(hours=hours))
+        logger.info(f"[{run_id}] Embeddings: {counts}")
+        if counts.get("embedded"):
+            bump_version("news")  # новые статьи появились в /news/semantic-search
+    finally:
+        mysql_db.close()
+        pg_db.close()
+    return run_id
+
+
+@app.task(queue="clustering", bind=True, max_retries=None)
+def run_clustering(
+    self,
+    run_id: Optional[str],
+    hours: int = CLUSTERING_HOURS,
+    min_cluster_size: int = CLUSTERING_MIN_CLUSTER_SIZE,
+    min_samples: int = CLUSTERING_MIN_SAMPLES,
+    profile: bool = False,
+):
+    if run_id is None:
+        # предыдущая стадия не взяла блокировку — запуск отменён
+        return
+    # Между стадиями блокировка свободна, и её может взять стадия эмбеддингов другого запуска.
+    # Эмбеддинги этого запуска уже посчитаны — не бросаем его, а ждём, пока блокировка освободится
+    # (не дольше её TTL: дольше держать она не может)
+    with redis_lock("clustering", ttl=Config.CLUSTERING_LOCK_TTL) as acquired:
+        if not acquired:
+            if self.request.retries * Config.CLUSTERING_LOCK_RETRY_DELAY >= Config.CLUSTERING_LOCK_TTL:
+                logger.warning(f"[{run_id}] Clustering lock still busy after {self.request.retries} retries, giving up")
+                return
+            logger.info(f"[{run_id}] Clustering lock is busy, retrying in {Config.CLUSTERING_LOCK_RETRY_DELAY}s")
+            raise self.retry(countdown=Config.CLUSTERING_LOCK_RETRY_DELAY)
+        _run_clustering(run_id, hours, min_cluster_size, min_samples, profile)
+
+
+def _run_clustering(run_id: str, hours: int, min_cluster_size: int, min_samples: int, profile: bool):
+    load_dotenv()
+    stats = RunStats("clustering", run_id)
+    if stats.is_done("clustering"):
+        logger.info(f"[{run_id}] Clustering stage already done, skipping")
+        return
+
+    from src.services.clustering_service import ClusteringService
+
+    mysql_db = next(get_db())
+    pg_db = next(get_db_pg())
+    try:
+        service = ClusteringService(mysql_db, pg_db)
+        with stats.stage("clustering") as counts:
+            counts.update(service.run_clustering(
+                hours=hours,
+                min_cluster_size=min_cluster_size,
+                min_samples=min_samples,
+                run_id=run_id,
+                profile=profile,
+            ))
+        logger.info(f"[{run_id}] Clustering: {counts}")
+        record_clustering_run(counts)
+        if counts.get("saved_clusters"):
+            bump_version("clusters")
+    finally:
+        mysql_db.close()
+        pg_db.close()